@@ -0,0 +1 @@
+"""Shared helpers for the Neoverse analysis scripts in ``src/jupyter``."""
@@ -0,0 +1,32 @@
+"""Command-line entry point of the package::
+
+    python -m neoverse run --input-dir logs --output-dir out --stages sweep,export
+
+``run`` runs stages of the analyses (``neoverse.pipeline``). ``score``,
+``serve``, ``ingest`` and ``benchmark`` are the commands of
+``neoverse.score``, ``neoverse.scoring_service``, ``neoverse.ingest`` and
+``neoverse.benchmark``. Arguments after the command go to that command.
+"""
+
+import sys
+from importlib import import_module
+
+COMMANDS = {
+    'run': 'pipeline',
+    'score': 'score',
+    'serve': 'scoring_service',
+    'ingest': 'ingest',
+    'benchmark': 'benchmark',
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in COMMANDS:
+        print(f"usage: python -m neoverse {{{','.join(COMMANDS)}}} ...", file=sys.stderr)
+        sys.exit(0 if argv and argv[0] in ('-h', '--help') else 2)
+    import_module(f'.{COMMANDS[argv[0]]}', __package__).main(argv[1:])
+
+
+if __name__ == '__main__':
+    main()
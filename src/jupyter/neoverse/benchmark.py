@@ -0,0 +1,339 @@
+"""Benchmarks of the analysis pipelines on synthetic logs.
+
+Each size runs the stages of the hacker detector and the spending analysis
+on synthetic logs of that many rows (``neoverse.synthetic``, generated once
+per size into ``--data-dir`` and reused afterwards)::
+
+    python -m neoverse.benchmark --sizes 1e4,1e5,1e6 --output bench.json
+    python -m neoverse.benchmark --sizes 1e4,1e5,1e6 --baseline bench.json
+
+The stages are:
+
+* ``load``: CSV to a typed DataFrame, including the Parquet conversion.
+* ``features``: the hacker ``FeaturePipeline``.
+* ``train``: labels, split, scaling, the logistic fit and the factor
+  thresholds.
+* ``score``: ``score_logs`` streaming the converted logs.
+* ``sweep``: the spending feature-combination sweep up to
+  ``--max-features``.
+* ``export``: ``write_results`` to ``model_results.parquet``.
+
+Stages needed by a selected stage still run, but they are not recorded.
+
+Every repeat of a size runs in a fresh worker process. Each stage is a
+``neoverse.trace`` span, which records its wall and CPU time, the rows
+processed, the change in RSS and the peak RSS during the stage. With
+``--profile DIR``, every stage is also dumped as a cProfile file. Repeats
+are reduced to the fastest run of each stage.
+
+Results are written as JSON with the commit, the library versions and the
+machine, so runs of different commits can be compared. With ``--baseline``,
+a stage is flagged as a regression when it is more than ``--tolerance``
+slower or larger than in the baseline file.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .parallel import process_pool
+from .pipeline import SPENDING_FEATURES, SPENDING_TARGET
+from .synthetic import GENERATOR_VERSION, synthetic_logs_path, write_synthetic_logs
+from .trace import Tracer, add_trace_arguments
+
+STAGES = ('load', 'features', 'train', 'score', 'sweep', 'export')
+DEPENDS = {'features': ['load'], 'train': ['features'], 'score': ['train'],
+           'sweep': ['load'], 'export': ['sweep']}
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_TOLERANCE = 0.2
+# Differences below these are noise, whatever the ratio
+MIN_WALL_DELTA = 0.05
+MIN_RSS_DELTA_MB = 16
+
+
+def required_stages(selected):
+    """``selected`` plus the stages they depend on, in ``STAGES`` order."""
+    needed = set()
+
+    def visit(stage):
+        if stage not in needed:
+            needed.add(stage)
+            for dependency in DEPENDS.get(stage, ()):
+                visit(dependency)
+
+    for stage in selected:
+        visit(stage)
+    return [stage for stage in STAGES if stage in needed]
+
+
+def run_stages(path, selected, max_features=4, chunksize=100_000, profile_dir=None):
+    """Run the stages ``selected`` (and their dependencies) on the logs at
+    ``path`` and return the ``Tracer`` records of the selected ones."""
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    from .export import write_results
+    from .features import FeaturePipeline
+    from .hacker_model import HACKER_FEATURES, HackerModel
+    from .logs import parquet_cache_path, read_logs
+    from .score import score_logs
+    from .suspicion import FactorEngine
+    from .sweep import GramSweep, PredictionStore
+
+    tracer = Tracer(f'benchmark_{Path(path).stem}', profile_dir)
+    stages = required_stages(selected)
+    with tempfile.TemporaryDirectory(prefix='neoverse-bench-') as workdir:
+        with tracer.span('load') as span:
+            data = read_logs(path, cache_dir=workdir)
+            span.rows = len(data)
+
+        if 'features' in stages:
+            with tracer.span('features') as span:
+                pipeline = FeaturePipeline(HACKER_FEATURES + ['suspicion_score'])
+                engineered = pipeline.fit_transform(data)
+                span.rows = len(engineered)
+
+        if 'train' in stages:
+            with tracer.span('train') as span:
+                n_features = len(HACKER_FEATURES)
+                score = engineered[:, n_features]
+                y = (score > np.quantile(score, 0.998)).astype(int)
+                X_train, _, y_train, _ = train_test_split(
+                    engineered[:, :n_features], y, test_size=0.3,
+                    random_state=42, stratify=y)
+                scaler = StandardScaler()
+                model = LogisticRegression(C=1.0, class_weight='balanced', max_iter=1000,
+                                           random_state=42, solver='liblinear')
+                model.fit(scaler.fit_transform(X_train), y_train)
+                hacker_model = HackerModel(
+                    model, scaler, feature_pipeline=pipeline.select(HACKER_FEATURES),
+                    factor_engine=FactorEngine().fit(data), features=HACKER_FEATURES)
+                span.rows = len(X_train)
+
+        if 'score' in stages:
+            with tracer.span('score') as span:
+                _, span.rows = score_logs(
+                    hacker_model, parquet_cache_path(path, workdir), k=10,
+                    chunksize=chunksize)
+
+        if 'sweep' in stages:
+            with tracer.span('sweep') as span:
+                data['VIP_Status_Binary'] = (data['VIP Status'] == 'Yes').astype(np.int32)
+                X = data[SPENDING_FEATURES].to_numpy()
+                sweep = GramSweep(X, data[SPENDING_TARGET], SPENDING_FEATURES)
+                predictions = PredictionStore(sweep.splits)
+                all_results = sweep.run(max_features, predictions)
+                span.rows = len(data)
+                span.fields['models'] = len(all_results)
+
+        if 'export' in stages:
+            with tracer.span('export') as span:
+                keys = sorted(range(len(all_results)),
+                              key=lambda k: all_results[k]['r2'], reverse=True)
+                writer = write_results(Path(workdir) / 'model_results.parquet',
+                                       all_results, keys, predictions, X,
+                                       SPENDING_FEATURES)
+                span.rows = writer.rows_written
+    measured = {}
+    for record in tracer.records:
+        if record['name'] in selected:
+            if record['rows']:
+                record['rows_per_s'] = record['rows'] / max(record['wall_s'], 1e-9)
+            record['peak_rss_scope'] = tracer.peak_rss_scope
+            measured[record['name']] = record
+    return measured
+
+
+def _git_commit():
+    here = Path(__file__).parent
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=here, check=True,
+                                capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               cwd=here, check=True, capture_output=True,
+                               text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, bool(dirty)
+
+
+def environment():
+    """Commit, library versions and machine the results were measured on."""
+    import pandas as pd
+    import pyarrow as pa
+    import sklearn
+
+    commit, dirty = _git_commit()
+    return {
+        'commit': commit,
+        'dirty': dirty,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'pyarrow': pa.__version__,
+        'scikit-learn': sklearn.__version__,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def _in_worker(func, *args):
+    # A fresh process per run keeps one run's memory out of the next one's peak
+    with process_pool(1) as pool:
+        return pool.submit(func, *args).result()
+
+
+def best_of(runs):
+    """Per stage, the run with the lowest wall time, plus every wall time."""
+    best = {}
+    for stage in runs[0]:
+        records = [run[stage] for run in runs]
+        best[stage] = dict(min(records, key=lambda record: record['wall_s']))
+        best[stage]['wall_s_all'] = [record['wall_s'] for record in records]
+    return best
+
+
+def benchmark(sizes, stages=STAGES, data_dir=None, seed=0, repeat=1,
+              max_features=4, chunksize=100_000, profile_dir=None, log=print):
+    """Benchmark ``stages`` at every size in ``sizes``; returns the results dict."""
+    data_dir = Path(data_dir or Path(tempfile.gettempdir()) / 'neoverse-bench')
+    results = {
+        'environment': environment(),
+        'config': {'stages': list(stages), 'seed': seed, 'repeat': repeat,
+                   'max_features': max_features, 'chunksize': chunksize,
+                   'generator_version': GENERATOR_VERSION},
+        'sizes': {},
+    }
+    for rows in sizes:
+        path = synthetic_logs_path(data_dir, rows, seed)
+        entry = {}
+        if not path.exists():
+            log(f"Generating {rows:,} rows into {path}")
+            start = time.perf_counter()
+            _in_worker(write_synthetic_logs, path, rows, seed)
+            entry['generate_s'] = time.perf_counter() - start
+        runs = []
+        for i in range(repeat):
+            log(f"Running {rows:,} rows ({i + 1}/{repeat})")
+            runs.append(_in_worker(run_stages, path, list(stages), max_features,
+                                   chunksize, profile_dir))
+        entry['stages'] = best_of(runs)
+        results['sizes'][str(rows)] = entry
+    return results
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Stages of ``results`` slower or larger than in ``baseline`` by more
+    than ``tolerance`` (a fraction), as a list of dicts."""
+    regressions = []
+    checks = [('wall_s', MIN_WALL_DELTA), ('peak_rss_mb', MIN_RSS_DELTA_MB)]
+    for rows, entry in results['sizes'].items():
+        base_entry = baseline.get('sizes', {}).get(rows)
+        if base_entry is None:
+            continue
+        for stage, record in entry['stages'].items():
+            base = base_entry['stages'].get(stage)
+            if base is None:
+                continue
+            for metric, min_delta in checks:
+                # Process-wide peaks include earlier stages, so only compare
+                # like with like
+                if metric == 'peak_rss_mb' and \
+                        record.get('peak_rss_scope') != base.get('peak_rss_scope'):
+                    continue
+                current, previous = record[metric], base[metric]
+                if current > previous * (1 + tolerance) and current - previous > min_delta:
+                    regressions.append({
+                        'rows': int(rows), 'stage': stage, 'metric': metric,
+                        'baseline': previous, 'current': current,
+                        'ratio': current / previous if previous else float('inf'),
+                    })
+    return regressions
+
+
+def format_results(results):
+    lines = [f"{'rows':>12} {'stage':<9} {'wall s':>9} {'cpu s':>9} "
+             f"{'peak MiB':>9} {'rows/s':>12}"]
+    for rows, entry in results['sizes'].items():
+        for stage, record in entry['stages'].items():
+            rate = f"{record['rows_per_s']:,.0f}" if 'rows_per_s' in record else ''
+            lines.append(f"{int(rows):>12,} {stage:<9} {record['wall_s']:>9.3f} "
+                         f"{record['cpu_s']:>9.3f} {record['peak_rss_mb']:>9.1f} {rate:>12}")
+    return '\n'.join(lines)
+
+
+def _sizes(value):
+    return [int(float(size)) for size in value.split(',') if size.strip()]
+
+
+def _stages(value):
+    selected = [stage.strip() for stage in value.split(',') if stage.strip()]
+    unknown = [stage for stage in selected if stage not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown stages {unknown}; choose from {', '.join(STAGES)}")
+    return [stage for stage in STAGES if stage in selected]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Neoverse analysis stages on synthetic logs.")
+    parser.add_argument('--sizes', type=_sizes, default=list(DEFAULT_SIZES),
+                        help="comma-separated row counts, e.g. 1e4,1e5,1e6 (up to 1e8)")
+    parser.add_argument('--stages', type=_stages, default=list(STAGES),
+                        help=f"comma-separated stages to time: {', '.join(STAGES)}")
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="runs per size; the fastest run of each stage is kept")
+    parser.add_argument('--data-dir', help="where the synthetic logs are generated and kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-features', type=int, default=4,
+                        help="largest feature combination of the sweep stage")
+    parser.add_argument('--chunksize', type=int, default=100_000,
+                        help="rows per chunk of the score stage")
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help="JSON file to write the results to")
+    parser.add_argument('--baseline', help="results JSON of an earlier run to compare with")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="slowdown or growth over the baseline flagged as a "
+                             "regression (default: 0.2, i.e. 20%%)")
+    add_trace_arguments(parser)
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="exit with status 1 when a regression is flagged")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.sizes, args.stages, args.data_dir, args.seed, args.repeat,
+                        args.max_features, args.chunksize, args.profile)
+    print(format_results(results))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        results['baseline'] = {'path': args.baseline,
+                               'commit': baseline.get('environment', {}).get('commit')}
+        results['regressions'] = compare(results, baseline, args.tolerance)
+        if results['regressions']:
+            print(f"\nRegressions against {args.baseline}:")
+            for regression in results['regressions']:
+                print(f"  {regression['rows']:,} rows {regression['stage']} "
+                      f"{regression['metric']}: {regression['baseline']:.3f} -> "
+                      f"{regression['current']:.3f} ({regression['ratio']:.2f}x)")
+        else:
+            print(f"\nNo regressions against {args.baseline}")
+
+    Path(args.output).write_text(json.dumps(results, indent=2))
+    print(f"Results saved to {args.output}")
+    if args.fail_on_regression and results.get('regressions'):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Bounded decision-boundary meshes for 2-D logistic models.
+
+The boundary plot in ``neo.py`` used to evaluate ``predict_proba`` on a
+``np.meshgrid`` with a fixed 0.02 step over the data range, so the grid (and
+the single float64 allocation holding it) grew with the spread of the data.
+``boundary_mesh`` caps the grid at ``max_cells`` points by widening the step
+when needed, and evaluates the probabilities in closed form,
+``1 / (1 + exp(-(w . x + b)))``, in float32 blocks of rows written into the
+output grid. Only the 1-D axes and the probability grid are returned.
+
+With ``refine`` the grid is split into tiles of ``tile`` cells; tiles whose
+probabilities come within ``band`` of 0.5 are evaluated again ``refine``
+times finer as separate patches, and their interior is masked (NaN) in the
+coarse grid. Detail is spent only along the decision boundary, and the
+patches together stay within ``max_cells`` as well.
+"""
+
+import numpy as np
+
+DEFAULT_MAX_CELLS = 250_000
+DEFAULT_STEP = 0.02
+
+
+class BoundaryMesh:
+    """Probability grid ``Z[len(ys), len(xs)]`` over the axes ``xs`` and
+    ``ys``, plus refined ``(xs, ys, Z)`` patches along the 0.5 contour."""
+
+    def __init__(self, xs, ys, Z, patches=()):
+        self.xs = xs
+        self.ys = ys
+        self.Z = Z
+        self.patches = list(patches)
+
+    @property
+    def cells(self):
+        return self.Z.size + sum(Z.size for _, _, Z in self.patches)
+
+
+def mesh_axes(x_range, y_range, step=DEFAULT_STEP, max_cells=DEFAULT_MAX_CELLS):
+    """Grid axes with spacing ``step``, widened so the grid has at most
+    ``max_cells`` points."""
+    xs = np.arange(x_range[0], x_range[1], step)
+    ys = np.arange(y_range[0], y_range[1], step)
+    if len(xs) * len(ys) <= max_cells:
+        return xs, ys
+    # Points spaced step apart from the start, as many as fit in the range
+    width = x_range[1] - x_range[0]
+    height = y_range[1] - y_range[0]
+    step = np.sqrt(width * height / max_cells)
+    return (x_range[0] + step * np.arange(max(1, int(width // step))),
+            y_range[0] + step * np.arange(max(1, int(height // step))))
+
+
+def logistic_grid(coef, intercept, xs, ys, block_cells=1 << 16):
+    """float32 ``P(y=1)`` of a 2-D logistic model on the grid ``xs`` x ``ys``."""
+    w0, w1 = (np.float32(w) for w in np.ravel(coef))
+    b = np.float32(np.ravel(intercept)[0])
+    xs = np.asarray(xs, dtype=np.float32)
+    ys = np.asarray(ys, dtype=np.float32)
+    Z = np.empty((len(ys), len(xs)), dtype=np.float32)
+    rows = max(1, block_cells // max(len(xs), 1))
+    wx = w0 * xs
+    for start in range(0, len(ys), rows):
+        block = Z[start:start + rows]
+        # z = w0 x + w1 y + b, then the sigmoid, all in place
+        np.add(wx[None, :], (w1 * ys[start:start + rows] + b)[:, None], out=block)
+        np.clip(block, -80, 80, out=block)
+        np.negative(block, out=block)
+        np.exp(block, out=block)
+        block += 1
+        np.reciprocal(block, out=block)
+    return Z
+
+
+def _tile_bounds(n_cells, tile):
+    starts = list(range(0, n_cells, tile))
+    return [(start, min(start + tile, n_cells)) for start in starts]
+
+
+def boundary_mesh(coef, intercept, x_range, y_range, step=DEFAULT_STEP,
+                  max_cells=DEFAULT_MAX_CELLS, refine=1, tile=32, band=0.05):
+    """Decision-boundary mesh of the 2-D logistic model ``coef``/``intercept``
+    over ``x_range`` x ``y_range``."""
+    xs, ys = mesh_axes(x_range, y_range, step, max_cells)
+    Z = logistic_grid(coef, intercept, xs, ys)
+    if refine <= 1 or len(xs) < 3 or len(ys) < 3:
+        return BoundaryMesh(xs, ys, Z)
+
+    # Cells whose corner probabilities reach into the band around 0.5
+    corners = np.stack([Z[:-1, :-1], Z[:-1, 1:], Z[1:, :-1], Z[1:, 1:]])
+    near = (corners.min(axis=0) <= 0.5 + band) & (corners.max(axis=0) >= 0.5 - band)
+    row_tiles = _tile_bounds(near.shape[0], tile)
+    col_tiles = _tile_bounds(near.shape[1], tile)
+    selected = [(r, c) for r in row_tiles for c in col_tiles
+                if r[1] - r[0] >= 2 and c[1] - c[0] >= 2
+                and near[r[0]:r[1], c[0]:c[1]].any()]
+    if not selected:
+        return BoundaryMesh(xs, ys, Z)
+
+    # Keep the refined patches within the same cell budget
+    def patch_cells(factor):
+        return sum(((r[1] - r[0]) * factor + 1) * ((c[1] - c[0]) * factor + 1)
+                   for r, c in selected)
+
+    refine = int(min(refine, np.sqrt(max_cells / patch_cells(1))))
+    while refine > 1 and patch_cells(refine) > max_cells:
+        refine -= 1
+    if refine <= 1:
+        return BoundaryMesh(xs, ys, Z)
+
+    patches = []
+    for (r0, r1), (c0, c1) in selected:
+        patch_xs = np.linspace(xs[c0], xs[c1], (c1 - c0) * refine + 1)
+        patch_ys = np.linspace(ys[r0], ys[r1], (r1 - r0) * refine + 1)
+        patches.append((patch_xs, patch_ys, logistic_grid(coef, intercept, patch_xs, patch_ys)))
+        # Masking the tile's interior points drops exactly the coarse cells
+        # the patch covers
+        Z[r0 + 1:r1, c0 + 1:c1] = np.nan
+    return BoundaryMesh(xs, ys, Z, patches)
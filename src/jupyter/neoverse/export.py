@@ -0,0 +1,185 @@
+"""Columnar builder for the sweep's ``model_results.parquet`` table.
+
+The table has one row per sampled test prediction of every model. Model-level
+columns are repeated per row with ``np.repeat`` over the per-model sample
+counts (``features`` is dictionary-encoded), and the prediction and feature
+value blocks are concatenated from NumPy slices, so no per-row Python objects
+are created.
+
+``write_results`` streams those tables into the Parquet file a batch of models
+at a time, so the Arrow tables and the Python rows stay bounded by the
+row-group size rather than the number of models in the sweep. The sampled
+predictions themselves are not streamed: the ``PredictionStore`` passed in
+holds a float32 vector of up to ``MAX_POINTS_PER_MODEL`` values for every
+model, about 4 kB per model or 130 MB for all 13 spending features on four
+splits.
+"""
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DEFAULT_ROW_GROUP_SIZE = 128_000
+DEFAULT_COMPRESSION = 'snappy'
+
+
+def results_schema(feature_names):
+    """Schema of ``model_results.parquet`` for a sweep over ``feature_names``."""
+    fields = [
+        ('model_id', pa.int64()),
+        ('features', pa.dictionary(pa.int32(), pa.string())),
+        ('num_features', pa.int64()),
+        ('train_size', pa.float64()),
+        ('test_size', pa.float64()),
+        ('mse', pa.float64()),
+        ('rmse', pa.float64()),
+        ('r2', pa.float64()),
+        ('intercept', pa.float64()),
+    ]
+    fields += [(f'coef_{name}', pa.float64()) for name in feature_names]
+    fields += [('actual', pa.float64()), ('predicted', pa.float64())]
+    fields += [(f'value_{name}', pa.float64()) for name in feature_names]
+    return pa.schema(fields)
+
+
+def results_table(all_results, keys, predictions, X, feature_names,
+                  first_model_id=0):
+    """Assemble the result rows of models ``keys`` as one Arrow table.
+
+    ``keys`` index into ``all_results`` and ``predictions`` (a
+    ``PredictionStore``); model ids are assigned consecutively from
+    ``first_model_id`` in that order. ``X`` holds the ``feature_names``
+    columns of the frame the sweep was fit on, as a 2-D array. Coefficient and
+    value columns are null for features a model does not use.
+    """
+    feature_index = {name: j for j, name in enumerate(feature_names)}
+    results = [all_results[key] for key in keys]
+    samples = [predictions.get(key) for key in keys]
+    split_of = [predictions.split_index(key) for key in keys]
+    counts = np.array([len(rows) for rows, _, _ in samples], dtype=np.int64)
+    n_models = len(results)
+
+    def repeat(values, dtype=np.float64):
+        return pa.array(np.repeat(np.asarray(values, dtype=dtype), counts))
+
+    test_sizes = np.array([float(result['train_size'].split('-')[1]) / 100
+                           for result in results])
+    combos = [','.join(result['features']) for result in results]
+    dictionary, codes = np.unique(combos, return_inverse=True)
+    features = pa.DictionaryArray.from_arrays(
+        pa.array(np.repeat(codes.astype(np.int32), counts)),
+        pa.array(dictionary.tolist(), type=pa.string()))
+
+    columns = {
+        'model_id': repeat(np.arange(first_model_id, first_model_id + n_models),
+                           np.int64),
+        'features': features,
+        'num_features': repeat([len(result['features']) for result in results],
+                               np.int64),
+        'train_size': repeat(1 - test_sizes),
+        'test_size': repeat(test_sizes),
+    }
+    for column in ('mse', 'rmse', 'r2', 'intercept'):
+        columns[column] = repeat([result[column] for result in results])
+
+    coef = np.full((n_models, len(feature_names)), np.nan)
+    used = np.zeros((n_models, len(feature_names)), dtype=bool)
+    for m, result in enumerate(results):
+        for name, value in result['coefficients'].items():
+            coef[m, feature_index[name]] = value
+            used[m, feature_index[name]] = True
+    unused_rows = np.repeat(~used, counts, axis=0)
+
+    for j, name in enumerate(feature_names):
+        columns[f'coef_{name}'] = pa.array(
+            np.repeat(coef[:, j], counts), mask=unused_rows[:, j])
+
+    columns['actual'] = pa.array(
+        np.concatenate([actual for _, actual, _ in samples]).astype(np.float64))
+    columns['predicted'] = pa.array(
+        np.concatenate([predicted for _, _, predicted in samples]).astype(np.float64))
+
+    # Every model on a split shares the split's sample rows, so gather them
+    # once per split and stitch the value columns from those blocks
+    sample_values = {}
+    for (rows, _, _), split_index in zip(samples, split_of):
+        if split_index not in sample_values:
+            sample_values[split_index] = np.asarray(X[rows], dtype=np.float64)
+    for j, name in enumerate(feature_names):
+        values = np.concatenate([sample_values[split_index][:, j]
+                                 for split_index in split_of])
+        columns[f'value_{name}'] = pa.array(values, mask=unused_rows[:, j])
+
+    return pa.Table.from_pydict(columns, schema=results_schema(feature_names))
+
+
+class ResultsWriter:
+    """Incremental writer for ``model_results.parquet``.
+
+    Tables passed to ``write`` must hold whole models in ascending
+    ``model_id`` order. They are buffered until at least ``row_group_size``
+    rows are pending and then written as one row group, so row groups never
+    split a model and their ``model_id`` statistics let readers prune by
+    model.
+    """
+
+    def __init__(self, path, feature_names,
+                 row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                 compression=DEFAULT_COMPRESSION):
+        self.row_group_size = row_group_size
+        self.rows_written = 0
+        self.row_groups = 0
+        self._pending = []
+        self._pending_rows = 0
+        self._writer = pq.ParquetWriter(
+            path, results_schema(feature_names), compression=compression,
+            sorting_columns=[pq.SortingColumn(0)])
+
+    def write(self, table):
+        self._pending.append(table)
+        self._pending_rows += table.num_rows
+        if self._pending_rows >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending_rows:
+            return
+        table = pa.concat_tables(self._pending)
+        self._writer.write_table(table, row_group_size=table.num_rows)
+        self.rows_written += table.num_rows
+        self.row_groups += 1
+        self._pending = []
+        self._pending_rows = 0
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_results(path, all_results, keys, predictions, X, feature_names,
+                  row_group_size=DEFAULT_ROW_GROUP_SIZE,
+                  compression=DEFAULT_COMPRESSION):
+    """Stream the result rows of models ``keys`` to ``path``.
+
+    Models get ids ``0..len(keys)-1`` in ``keys`` order and are built into
+    Arrow tables in batches of roughly ``row_group_size`` rows. Returns the
+    ``ResultsWriter`` so callers can report rows and row groups written.
+    """
+    with ResultsWriter(path, feature_names, row_group_size,
+                       compression) as writer:
+        start = 0
+        while start < len(keys):
+            stop, rows = start, 0
+            while stop < len(keys) and rows < row_group_size:
+                rows += len(predictions.get(keys[stop])[0])
+                stop += 1
+            writer.write(results_table(all_results, keys[start:stop], predictions,
+                                       X, feature_names, first_model_id=start))
+            start = stop
+    return writer
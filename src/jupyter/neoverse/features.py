@@ -0,0 +1,331 @@
+"""Declarative feature engineering for the hacker detector.
+
+A ``FeaturePipeline`` is built from the names of the columns it has to
+produce. Every derived column is declared once below, with the columns it
+reads and the whole-column reductions it needs (a max, a quantile, the
+category set of an encoder). The pipeline plans only the derived columns its
+outputs depend on, so ratios and encoders nobody selects are never computed,
+and it evaluates the plan in dependency order straight into one preallocated
+float32 matrix. Each reduction is computed once, however many columns read
+it.
+
+``fit`` records the reductions of the training data; ``transform`` reuses
+them, so later events are engineered exactly like the data the model was
+trained on. ``fit_chunks`` computes the same reductions from a stream of
+chunks, with quantiles taken from a ``QuantileSketch`` instead of a full sort.
+Only output names and fitted reductions are stored, which keeps a fitted
+pipeline picklable.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .sketch import QuantileSketch
+
+
+class Derived:
+    """A derived column computed as ``compute(columns, stats)``.
+
+    ``inputs`` are the raw or derived columns ``compute`` reads and
+    ``reductions`` the ``(kind, column, *args)`` statistics it looks up in
+    ``stats``.
+    """
+
+    def __init__(self, name, inputs, compute, reductions=()):
+        self.name = name
+        self.inputs = list(inputs)
+        self.compute = compute
+        self.reductions = list(reductions)
+
+
+def _per(name, numerator, denominator):
+    return Derived(name, [numerator, denominator],
+                   lambda c, s: c[numerator] / (c[denominator] + 1))
+
+
+def _encoded(column):
+    def compute(c, s):
+        return c[column].map(lambda values: _encode(s[('classes', column)], values))
+    return Derived(f"{column}_encoded", [column], compute, [('classes', column)])
+
+
+def _encode(classes, values):
+    """``LabelEncoder`` codes of ``values``; classes unseen in ``fit`` are -1."""
+    if not len(classes):
+        return np.full(len(values), -1)
+    codes = np.minimum(np.searchsorted(classes, values), len(classes) - 1)
+    return np.where(classes[codes] == values, codes, -1)
+
+
+def _suspicious_activity(c, s):
+    return ((c['crime_to_play_ratio'] > s[('quantile', 'crime_to_play_ratio', 0.95)]) &
+            (c['Quest Exploit Score'] > s[('quantile', 'Quest Exploit Score', 0.95)]))
+
+
+def _suspicion_score(c, s):
+    return (0.3 * (c['Criminal Score'] / s[('max', 'Criminal Score')]) +
+            0.2 * (c['Quest Exploit Score'] / s[('max', 'Quest Exploit Score')]) +
+            0.2 * (c['money_per_hour'] / s[('max', 'money_per_hour')]) +
+            0.3 * c['has_dark_market'])
+
+
+DERIVED = {node.name: node for node in [
+    _per('crime_to_play_ratio', 'Criminal Score', 'Hours Played'),
+    _per('money_per_hour', 'Money Spent ($)', 'Hours Played'),
+    _per('quest_efficiency', 'Quest Exploit Score', 'Hours Played'),
+    Derived('suspicious_activity', ['crime_to_play_ratio', 'Quest Exploit Score'],
+            _suspicious_activity,
+            [('quantile', 'crime_to_play_ratio', 0.95),
+             ('quantile', 'Quest Exploit Score', 0.95)]),
+    Derived('has_dark_market', ['Dark Market Transactions'],
+            lambda c, s: c['Dark Market Transactions'].map(lambda values: values != 'None')),
+    Derived('suspicion_score',
+            ['Criminal Score', 'Quest Exploit Score', 'money_per_hour', 'has_dark_market'],
+            _suspicion_score,
+            [('max', 'Criminal Score'), ('max', 'Quest Exploit Score'),
+             ('max', 'money_per_hour')]),
+]}
+
+
+def derived_column(name):
+    """The ``Derived`` definition of ``name``, or ``None`` for a raw column.
+
+    Besides the columns in ``DERIVED``, any ``<column>_encoded`` is a label
+    encoding of ``<column>`` and any ``<column>_to_criminal_ratio`` divides
+    ``<column>`` by ``Criminal Score + 1``.
+    """
+    if name in DERIVED:
+        return DERIVED[name]
+    if name.endswith('_encoded'):
+        return _encoded(name[:-len('_encoded')])
+    if name.endswith('_to_criminal_ratio'):
+        return _per(name, name[:-len('_to_criminal_ratio')], 'Criminal Score')
+    return None
+
+
+def plan(outputs):
+    """Derived columns needed for ``outputs``, in evaluation order, and the
+    raw columns they read."""
+    order, raw, seen = [], [], set()
+
+    def visit(name):
+        if name in seen:
+            return
+        seen.add(name)
+        node = derived_column(name)
+        if node is None:
+            raw.append(name)
+            return
+        for dependency in node.inputs:
+            visit(dependency)
+        order.append(node)
+
+    for name in outputs:
+        visit(name)
+    return order, raw
+
+
+class Labels:
+    """A string column as its distinct values plus one index per row.
+
+    Element-wise functions run once per distinct value (``map``), which is
+    what keeps encoders cheap on categorical columns.
+    """
+
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            inverse = series.cat.codes.to_numpy()
+            uniques = series.cat.categories.astype(str).to_numpy(dtype=object)
+        else:
+            inverse, uniques = pd.factorize(series.astype(str))
+            uniques = np.asarray(uniques, dtype=object)
+        if (inverse < 0).any():
+            # Missing values read as the string 'nan', like ``astype(str)``
+            uniques = np.append(uniques, 'nan')
+            inverse = np.where(inverse < 0, len(uniques) - 1, inverse)
+        self.uniques = uniques.astype(str)
+        self.inverse = inverse
+
+    def map(self, func):
+        return np.asarray(func(self.uniques))[self.inverse]
+
+    def classes(self):
+        return np.unique(self.uniques[np.unique(self.inverse)])
+
+
+def _reduce(reduction, values):
+    kind = reduction[0]
+    if kind == 'max':
+        return float(np.nanmax(values))
+    if kind == 'quantile':
+        return float(np.nanquantile(values, reduction[2]))
+    if kind == 'classes':
+        return values.classes()
+    raise ValueError(f"unknown reduction {kind!r}")
+
+
+def _accumulate(reduction, state, values, compression):
+    """Fold one chunk's ``values`` into the running state of ``reduction``."""
+    kind = reduction[0]
+    if kind == 'max':
+        chunk_max = float(np.nanmax(values)) if len(values) else -np.inf
+        return chunk_max if state is None else max(state, chunk_max)
+    if kind == 'quantile':
+        return (state or QuantileSketch(compression)).update(values)
+    if kind == 'classes':
+        return (state or set()) | set(values.classes().tolist())
+    raise ValueError(f"unknown reduction {kind!r}")
+
+
+class _Columns:
+    """Column lookup for one evaluation: derived columns come from the
+    matrix, raw ones from the events (read once, on first use)."""
+
+    def __init__(self, events, matrix, positions):
+        self.events = events
+        self.matrix = matrix
+        self.positions = positions
+        self._raw = {}
+
+    def __getitem__(self, name):
+        if name in self.positions:
+            return self.matrix[:, self.positions[name]]
+        if name not in self._raw:
+            series = self.events[name]
+            if pd.api.types.is_numeric_dtype(series.dtype) and \
+                    not isinstance(series.dtype, pd.CategoricalDtype):
+                self._raw[name] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                self._raw[name] = Labels(series)
+        return self._raw[name]
+
+
+class FeaturePipeline:
+    """Engineer ``outputs`` from raw log events into one float32 matrix.
+
+    ``columns`` lists the matrix columns: ``outputs`` first, in order,
+    followed by the intermediate derived columns they need.
+    """
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.stats = None
+        self.errors = {}
+
+    @property
+    def columns(self):
+        nodes, _ = plan(self.outputs)
+        return self.outputs + [node.name for node in nodes
+                               if node.name not in self.outputs]
+
+    @property
+    def inputs(self):
+        """Raw event columns the pipeline reads."""
+        return plan(self.outputs)[1]
+
+    def fit(self, events):
+        self.fit_transform(events)
+        return self
+
+    def fit_transform(self, events):
+        """Compute the reductions from ``events`` and return their matrix."""
+        self.stats = {}
+        self.errors = {}
+        return self._evaluate(events, fit=True)
+
+    def fit_chunks(self, chunks, compression=200):
+        """Compute the reductions from a stream of DataFrames.
+
+        ``chunks`` is a callable returning a fresh iterable of chunks (for
+        example ``lambda: iter_logs(path)``). Reductions that only read raw
+        columns or columns derived without other reductions are computed in
+        the first pass; ``chunks`` is called again for each further level of
+        reductions that depend on earlier ones. Quantiles come from a
+        ``QuantileSketch`` per column and their estimated rank errors are kept in
+        ``errors``.
+        """
+        self.stats = {}
+        self.errors = {}
+        nodes, _ = plan(self.outputs)
+        pending = {reduction for node in nodes for reduction in node.reductions}
+        while pending:
+            partial = {}
+            for events in chunks():
+                self._evaluate(events, fit=True, partial=partial, compression=compression)
+            if not partial:
+                raise ValueError(f"reductions {sorted(pending)} can never be computed")
+            for reduction in pending:
+                key = ('sketch', reduction[1]) if reduction[0] == 'quantile' else reduction
+                if key not in partial:
+                    continue
+                state = partial[key]
+                if reduction[0] == 'quantile':
+                    self.stats[reduction] = state.quantile(reduction[2])
+                    self.errors[reduction] = state.rank_error(reduction[2])
+                elif reduction[0] == 'classes':
+                    self.stats[reduction] = np.array(sorted(state))
+                else:
+                    self.stats[reduction] = state
+            pending -= self.stats.keys()
+        return self
+
+    def transform(self, events):
+        """Matrix of ``events`` engineered with the fitted reductions."""
+        if self.stats is None:
+            raise ValueError("FeaturePipeline is not fitted")
+        return self._evaluate(events, fit=False)
+
+    def frame(self, matrix, index=None):
+        """``matrix`` as a DataFrame labelled with ``columns``."""
+        return pd.DataFrame(matrix, columns=self.columns, index=index)
+
+    def select(self, outputs):
+        """A fitted pipeline producing only ``outputs``, with the reductions
+        they need."""
+        pipeline = FeaturePipeline(outputs)
+        nodes, _ = plan(pipeline.outputs)
+        needed = {reduction for node in nodes for reduction in node.reductions}
+        pipeline.stats = {key: value for key, value in (self.stats or {}).items()
+                          if key in needed}
+        pipeline.errors = {key: value for key, value in self.errors.items()
+                           if key in needed}
+        return pipeline
+
+    def _evaluate(self, events, fit, partial=None, compression=200):
+        # With ``partial``, missing reductions are accumulated into it instead
+        # of computed, and columns that need them are left unfilled
+        nodes, raw = plan(self.outputs)
+        columns = self.columns
+        positions = {name: i for i, name in enumerate(columns)}
+        matrix = np.empty((len(events), len(columns)), dtype=np.float32, order='F')
+        values = _Columns(events, matrix, {})
+
+        for name in raw:
+            if name in positions:
+                matrix[:, positions[name]] = values[name]
+        blocked, sketched = set(), set()
+        for node in nodes:
+            ready = not blocked.intersection(node.inputs)
+            for reduction in node.reductions:
+                if reduction in self.stats:
+                    continue
+                if not fit:
+                    raise ValueError(f"FeaturePipeline was fitted without {reduction}")
+                column = reduction[1]
+                if partial is None:
+                    self.stats[reduction] = _reduce(reduction, values[column])
+                    continue
+                ready = False
+                if column in blocked:
+                    continue
+                key = ('sketch', column) if reduction[0] == 'quantile' else reduction
+                if key not in sketched:
+                    sketched.add(key)
+                    partial[key] = _accumulate(reduction, partial.get(key),
+                                               values[column], compression)
+            if not ready:
+                blocked.add(node.name)
+                continue
+            matrix[:, positions[node.name]] = node.compute(values, self.stats)
+            values.positions[node.name] = positions[node.name]
+        return matrix
@@ -0,0 +1,223 @@
+"""Figure renderers for the analysis scripts.
+
+Each renderer draws one figure with pyplot from small, already reduced
+inputs (curves, counts, matrices, downsampled points) passed as keyword
+arguments; ``Report.render`` ships those inputs to a worker process, which
+calls the renderer, saves the PNG and closes the figure. Renderers never
+touch the full DataFrames, so a job is cheap to pickle and its inputs are
+cheap to hash for the figure cache.
+"""
+
+import numpy as np
+
+
+def downsample(max_points, *arrays, seed=0):
+    """The same random subset of at most ``max_points`` rows of every array.
+
+    Row order is kept. Arrays at or under the budget are returned unchanged.
+    """
+    n = len(arrays[0])
+    if max_points is None or n <= max_points:
+        return arrays if len(arrays) > 1 else arrays[0]
+    rows = np.sort(np.random.default_rng(seed).choice(n, max_points, replace=False))
+    sampled = tuple(np.asarray(array)[rows] for array in arrays)
+    return sampled if len(sampled) > 1 else sampled[0]
+
+
+# neo.py
+
+def truth_table(plt, cm, metrics):
+    plt.figure(figsize=(8, 7))
+
+    # Use a custom colormap for better visualization
+    plt.imshow(cm, interpolation='nearest', cmap=plt.cm.Blues)
+    plt.title('Truth Table: Hacker Detection (Logistic Regression)')
+    plt.colorbar()
+
+    # Set tick marks and labels
+    tick_marks = np.arange(2)
+    plt.xticks(tick_marks, ['Innocent', 'Hacker'])
+    plt.yticks(tick_marks, ['Innocent', 'Hacker'])
+
+    # Add text annotations in each cell
+    thresh = cm.max() / 2.
+    for i in range(cm.shape[0]):
+        for j in range(cm.shape[1]):
+            plt.text(j, i, format(cm[i, j], 'd'),
+                     ha="center", va="center",
+                     color="white" if cm[i, j] > thresh else "black",
+                     fontsize=14)
+
+    plt.xlabel('Predicted')
+    plt.ylabel('Actual')
+    plt.tight_layout()
+
+    # Add metrics to the plot
+    plt.figtext(0.5, 0.01, metrics, ha='center', fontsize=12,
+                bbox={'facecolor': 'white', 'alpha': 0.8, 'pad': 5, 'edgecolor': 'black'})
+
+    plt.tight_layout()
+    plt.subplots_adjust(bottom=0.15)
+
+
+def coefficient_importance(plt, features, importances):
+    plt.figure(figsize=(12, 6))
+    plt.barh(range(len(importances)), importances, align='center')
+    plt.yticks(range(len(importances)), features)
+    plt.xlabel('Feature Importance (absolute coefficient value)')
+    plt.title('Feature Importance for Hacker Detection (Logistic Regression)')
+    plt.tight_layout()
+
+
+def roc(plt, fpr, tpr, auc):
+    plt.figure(figsize=(8, 7))
+    plt.plot(fpr, tpr, color='blue', lw=2, label=f'ROC curve (AUC = {auc:.4f})')
+    plt.plot([0, 1], [0, 1], color='gray', lw=1, linestyle='--')
+    plt.xlim([0.0, 1.0])
+    plt.ylim([0.0, 1.05])
+    plt.xlabel('False Positive Rate')
+    plt.ylabel('True Positive Rate')
+    plt.title('Receiver Operating Characteristic (ROC) Curve')
+    plt.legend(loc="lower right")
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+
+def precision_recall(plt, precision, recall):
+    plt.figure(figsize=(8, 7))
+    plt.plot(recall, precision, color='blue', lw=2)
+    plt.xlabel('Recall')
+    plt.ylabel('Precision')
+    plt.title('Precision-Recall Curve')
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+
+
+def decision_boundary(plt, mesh, points, labels, detected):
+    """``mesh`` is a ``BoundaryMesh``; ``points``/``labels`` are the
+    (downsampled) test players in PCA space and ``detected`` the true
+    positives, always drawn in full."""
+    plt.figure(figsize=(10, 8))
+
+    # Plot the decision boundary; refined patches fill the masked tiles of
+    # the coarse grid, on the same levels
+    levels = np.linspace(0, 1, 11)
+    plt.contourf(mesh.xs, mesh.ys, mesh.Z, levels=levels, alpha=0.8, cmap=plt.cm.RdBu_r)
+    for xs, ys, Z in mesh.patches:
+        plt.contourf(xs, ys, Z, levels=levels, alpha=0.8, cmap=plt.cm.RdBu_r)
+
+    # Plot the data points with proper labels
+    scatter = plt.scatter(points[:, 0], points[:, 1], c=labels,
+                          cmap=plt.cm.RdBu_r, alpha=0.8, edgecolors='black')
+
+    # Highlight the detected hackers (true positives)
+    plt.scatter(detected[:, 0], detected[:, 1],
+                s=100, facecolors='none', edgecolors='green', linewidth=2,
+                label='Hackers Detected')
+
+    # Create a legend for the scatter plot
+    legend1 = plt.legend(*scatter.legend_elements(),
+                         loc="lower right", title="Player Type")
+    plt.gca().add_artist(legend1)
+    plt.legend(loc="upper right")
+
+    plt.title('Logistic Regression Decision Boundary (PCA-reduced features)')
+    plt.xlabel('Principal Component 1')
+    plt.ylabel('Principal Component 2')
+    plt.colorbar(label='Probability of being a Hacker')
+    plt.tight_layout()
+
+
+# neoverse_spending_analysis.py
+
+def histogram(plt, edges, counts, sample, title, xlabel):
+    """A histogram of precomputed bin ``counts`` with a KDE of ``sample``, a
+    bounded random sample of the raw values, so the full column never leaves
+    the main process.
+
+    The KDE is seaborn's (Scott's bandwidth, cut at the data range), fitted
+    on the sample and scaled to the counts of the bins.
+    """
+    import pandas as pd
+    import seaborn as sns
+    from scipy.stats import gaussian_kde
+
+    plt.figure(figsize=(10, 6))
+    binned = pd.DataFrame({'center': (edges[:-1] + edges[1:]) / 2, 'count': counts})
+    ax = sns.histplot(data=binned, x='center', weights='count', bins=list(edges))
+    sample = np.asarray(sample, dtype=np.float64)
+    if len(sample) > 1 and sample.min() < sample.max():
+        xs = np.linspace(sample.min(), sample.max(), 200)
+        density = gaussian_kde(sample, bw_method='scott')(xs)
+        ax.plot(xs, density * counts.sum() * np.diff(edges).mean(), color='C0')
+    plt.title(title)
+    plt.xlabel(xlabel)
+    plt.ylabel('Frequency')
+
+
+def correlation_heatmap(plt, matrix, labels):
+    import seaborn as sns
+
+    plt.figure(figsize=(12, 8))
+    sns.heatmap(matrix, annot=True, cmap='coolwarm',
+                xticklabels=labels, yticklabels=labels)
+    plt.title('Correlation Heatmap of Top Features')
+
+
+def scatter_grid(plt, panels, target):
+    """2x2 grid of ``(feature, x, y)`` scatter panels against ``target``."""
+    import seaborn as sns
+
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    axes = axes.flatten()
+    for ax, (feature, x, y) in zip(axes, panels):
+        sns.scatterplot(x=x, y=y, ax=ax, alpha=0.6)
+        ax.set_xlabel(feature)
+        ax.set_ylabel(target)
+        ax.set_title(f'{feature} vs Money Spent')
+    plt.tight_layout()
+
+
+def top_models_r2(plt, names, r2_scores, notes):
+    plt.figure(figsize=(14, 8))
+    bars = plt.bar(names, r2_scores, color='skyblue')
+    plt.title('R² Scores for Top 20 Models')
+    plt.xlabel('Model')
+    plt.ylabel('R² Score')
+    plt.xticks(rotation=45)
+    plt.ylim(min(r2_scores) - 0.05, 1.0)
+
+    # Add feature information as annotations
+    for bar, note in zip(bars, notes):
+        plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.01,
+                 note, ha='center', va='bottom', fontsize=8)
+    plt.tight_layout()
+
+
+def feature_frequency(plt, features, frequency):
+    plt.figure(figsize=(12, 8))
+    plt.barh(features, frequency, color='lightgreen')
+    plt.title('Feature Frequency in Top 50 Models')
+    plt.xlabel('Frequency')
+    plt.ylabel('Feature')
+    plt.tight_layout()
+
+
+def actual_vs_predicted(plt, actual, predicted, low, high):
+    plt.figure(figsize=(10, 6))
+    plt.scatter(actual, predicted, alpha=0.5)
+    plt.plot([low, high], [low, high], 'r--')
+    plt.xlabel('Actual Money Spent ($)')
+    plt.ylabel('Predicted Money Spent ($)')
+    plt.title('Actual vs Predicted Money Spent')
+    plt.tight_layout()
+
+
+def residuals(plt, predicted, residuals):
+    plt.figure(figsize=(10, 6))
+    plt.scatter(predicted, residuals, alpha=0.5)
+    plt.axhline(y=0, color='r', linestyle='--')
+    plt.xlabel('Predicted Money Spent ($)')
+    plt.ylabel('Residuals')
+    plt.title('Residual Plot')
+    plt.tight_layout()
@@ -0,0 +1,104 @@
+"""Persisted hacker-detection model from ``neo.py``.
+
+``HackerModel`` bundles the fitted ``StandardScaler`` and
+``LogisticRegression`` with everything else scoring needs from training time:
+the fitted ``FeaturePipeline`` (label encodings and the quantile thresholds
+behind ``suspicious_activity``) and the fitted ``FactorEngine`` that produces
+``Suspicion_Factors``.
+New player events can then be scored without the training data.
+"""
+
+import math
+
+import joblib
+import pandas as pd
+
+HACKER_FEATURES = [
+    "Hours Played", "Criminal Score", "Quest Exploit Score",
+    "Cash on Hand ($)", "Sync Stability (%)", "Neural Link Stability (%)",
+    "money_per_hour", "crime_to_play_ratio", "quest_efficiency",
+    "Dark Market Transactions_encoded", "has_dark_market",
+    "suspicious_activity"
+]
+
+# Raw log fields a player event must carry to be scored
+EVENT_FIELDS = [
+    "Player ID", "Hours Played", "Money Spent ($)", "Criminal Score",
+    "Quest Exploit Score", "Cash on Hand ($)", "Sync Stability (%)",
+    "Neural Link Stability (%)", "Dark Market Transactions"
+]
+
+
+def check_events(events):
+    """Raise ``ValueError`` unless ``events`` has every field scoring reads."""
+    missing = [field for field in EVENT_FIELDS if field not in events.columns]
+    if missing:
+        raise ValueError(f"events are missing required fields: {missing}")
+
+
+def check_event_records(events):
+    """Raise ``ValueError`` unless every event dict in ``events`` has a value
+    for every field scoring reads.
+
+    Events are checked one by one because a field missing from one record
+    becomes a NaN column, not a missing one, once records share a DataFrame.
+    """
+    for i, event in enumerate(events):
+        if not isinstance(event, dict):
+            raise ValueError(f"event {i} is not an object")
+        missing = [field for field in EVENT_FIELDS
+                   if event.get(field) is None
+                   or (isinstance(event[field], float) and math.isnan(event[field]))]
+        if missing:
+            raise ValueError(f"event {i} is missing required fields: {missing}")
+
+
+class HackerModel:
+    """Scaler, logistic model and training-time statistics for scoring.
+
+    ``feature_pipeline`` is a ``FeaturePipeline`` fitted on the training data
+    whose leading outputs are ``features``; ``factor_engine`` is a
+    ``FactorEngine`` fitted on the same data.
+    """
+
+    def __init__(self, model, scaler, feature_pipeline, factor_engine,
+                 features=HACKER_FEATURES):
+        self.model = model
+        self.scaler = scaler
+        self.feature_pipeline = feature_pipeline
+        self.factor_engine = factor_engine
+        self.features = list(features)
+
+    def save(self, path):
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path):
+        return joblib.load(path)
+
+    def engineer(self, events):
+        """Derive the model's input matrix (columns in ``features`` order)
+        from raw player events."""
+        check_events(events)
+        return self.feature_pipeline.transform(events)[:, :len(self.features)]
+
+    def predict_proba(self, events):
+        """Hacker probability of every event, as a 1-D array."""
+        # The scaler and model were fit on plain arrays, so no feature-name
+        # checks run here
+        X = self.scaler.transform(self.engineer(events))
+        return self.model.predict_proba(X)[:, 1]
+
+    def suspicion_factors(self, events):
+        """Comma-separated suspicion factors of every event."""
+        return self.factor_engine.factors(events)
+
+    def score(self, events):
+        """Score raw events into ``Player ID``, ``Hacker_Probability`` and
+        ``Suspicion_Factors`` columns."""
+        check_events(events)
+        return pd.DataFrame({
+            'Player ID': events['Player ID'].to_numpy(),
+            'Hacker_Probability': self.predict_proba(events),
+            'Suspicion_Factors': self.suspicion_factors(events),
+        })
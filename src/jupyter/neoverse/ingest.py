@@ -0,0 +1,405 @@
+"""Asyncio ingestion of live Neoverse event streams.
+
+Events arrive as newline-delimited JSON or CSV, one event per line (a CSV
+stream starts with its header line). They come from local socket
+connections (TCP or a Unix socket) or from a log file that is tailed as it
+grows. One event loop serves every source. Per stream:
+
+* bytes are read in blocks and split into lines; no per-event work is done
+  in Python;
+* the lines are grouped into micro-batches of up to ``batch_rows`` events,
+  flushed early once the oldest line has waited ``max_wait`` seconds;
+* every batch is parsed in one ``pyarrow.json``/``pyarrow.csv`` call against
+  the log schema into an Arrow record batch, in a worker thread so the loop
+  keeps reading. When a batch does not parse, its lines are parsed one by one
+  and only the malformed ones are dropped. Events missing a field scoring
+  needs are dropped too, and both are counted;
+* record batches go through a bounded queue to the consumer, which runs the
+  ``HackerModel`` feature pipeline and scoring on whole batches and keeps
+  the top suspects in a ``TopK``.
+
+A full queue suspends the readers. A socket then stops being read, which
+pushes back on its producer through TCP flow control, and a tailed file
+simply stays behind. Memory stays bounded however fast events arrive.
+
+A stand-in producer writes synthetic events for testing::
+
+    python -m neoverse.ingest serve hacker_model.joblib --port 8766
+    python -m neoverse.ingest produce --port 8766 --rows 1000000 --rate 100000
+"""
+
+import argparse
+import asyncio
+import functools
+import io
+import time
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+
+from .hacker_model import EVENT_FIELDS, HackerModel
+from .logs import LOG_SCHEMA
+from .ranking import TopK
+from .score import print_ranked, score_chunk
+from .synthetic import synthetic_logs
+from .windows import PlayerWindows
+
+FORMATS = ('ndjson', 'csv')
+BLOCK_SIZE = 1 << 16
+
+# The log schema with categories read as strings; the JSON reader cannot
+# build dictionaries
+EVENT_SCHEMA = pa.schema([
+    pa.field(name, pa.string() if pa.types.is_dictionary(type_) else type_)
+    for name, type_ in LOG_SCHEMA.items()])
+
+
+class IngestStats:
+    """Counters of one ingestion run."""
+
+    def __init__(self):
+        self.started = None
+        self.events = 0
+        self.invalid = 0
+        self.batches = 0
+        self.scored = 0
+        self.queue_high_water = 0
+
+    def rate(self):
+        """Events scored per second since the first event arrived."""
+        if self.started is None:
+            return 0.0
+        return self.scored / max(time.perf_counter() - self.started, 1e-9)
+
+    def summary(self):
+        return (f"{self.events} events in {self.batches} batches, {self.invalid} invalid, "
+                f"{self.scored} scored ({self.rate():,.0f} events/s), "
+                f"queue high water {self.queue_high_water}")
+
+
+class EventDecoder:
+    """Parses the lines of one stream into validated Arrow tables.
+
+    ``required`` fields must be present and non-null for an event to be kept.
+    """
+
+    def __init__(self, fmt='ndjson', required=EVENT_FIELDS):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown event format {fmt!r}; expected one of {FORMATS}")
+        self.fmt = fmt
+        self.required = list(required)
+        self.header = None
+
+    def _parse(self, data):
+        if self.fmt == 'ndjson':
+            return pa_json.read_json(io.BytesIO(data), parse_options=pa_json.ParseOptions(
+                explicit_schema=EVENT_SCHEMA, unexpected_field_behavior='ignore'))
+        return pa_csv.read_csv(
+            io.BytesIO(self.header + data),
+            read_options=pa_csv.ReadOptions(use_threads=False),
+            convert_options=pa_csv.ConvertOptions(
+                column_types=EVENT_SCHEMA, null_values=[''], strings_can_be_null=True))
+
+    def decode(self, lines):
+        """``(table, invalid)``: the valid events of ``lines`` (bytes without
+        their newlines) and the number of events dropped."""
+        lines = [line for line in lines if line.strip()]
+        if self.fmt == 'csv' and self.header is None and lines:
+            self.header, lines = lines[0] + b'\n', lines[1:]
+        if not lines:
+            return None, 0
+
+        invalid = 0
+        try:
+            table = self._parse(b'\n'.join(lines) + b'\n')
+        except pa.ArrowInvalid:
+            # Find the malformed lines; only this slow path is per event
+            tables = []
+            for line in lines:
+                try:
+                    tables.append(self._parse(line + b'\n'))
+                except pa.ArrowInvalid:
+                    invalid += 1
+            if not tables:
+                return None, invalid
+            table = pa.concat_tables(tables, promote_options='permissive')
+
+        if any(field not in table.column_names for field in self.required):
+            return None, invalid + table.num_rows
+        valid = functools.reduce(pc.and_, [pc.is_valid(table[field])
+                                           for field in self.required])
+        kept = table.filter(valid)
+        return kept, invalid + table.num_rows - kept.num_rows
+
+
+async def feed(read, decoder, queue, stats, batch_rows=5000, max_wait=0.05):
+    """Read one stream with ``read`` (a coroutine returning the next bytes,
+    ``b''`` at the end) and put its record batches on ``queue``."""
+    loop = asyncio.get_running_loop()
+    pending = b''
+    lines = []
+    deadline = None
+
+    async def emit(batch_lines):
+        table, invalid = await asyncio.to_thread(decoder.decode, batch_lines)
+        stats.invalid += invalid
+        if table is not None and table.num_rows:
+            if stats.started is None:
+                stats.started = time.perf_counter()
+            stats.events += table.num_rows
+            stats.batches += 1
+            for batch in table.combine_chunks().to_batches():
+                await queue.put(batch)
+                stats.queue_high_water = max(stats.queue_high_water, queue.qsize())
+
+    while True:
+        timeout = None if deadline is None else max(deadline - loop.time(), 0)
+        try:
+            block = await asyncio.wait_for(read(), timeout)
+        except asyncio.TimeoutError:
+            block = None
+        if block:
+            *complete, pending = (pending + block).split(b'\n')
+            lines.extend(complete)
+        end = block == b''
+        if end and pending:
+            lines.append(pending)
+            pending = b''
+        if lines and deadline is None:
+            deadline = loop.time() + max_wait
+
+        while len(lines) >= batch_rows:
+            await emit(lines[:batch_rows])
+            lines = lines[batch_rows:]
+        if lines and (end or block is None):
+            await emit(lines)
+            lines = []
+        if not lines:
+            deadline = None
+        if end:
+            return
+
+
+class FileTail:
+    """Reads a growing file block by block, like ``tail -f`` from its start.
+
+    Without ``follow``, reading ends at the current end of the file.
+    """
+
+    def __init__(self, path, follow=True, poll=0.05):
+        self.path = Path(path)
+        self.follow = follow
+        self.poll = poll
+
+    async def stream(self, decoder, queue, stats, **batching):
+        with open(self.path, 'rb') as f:
+            async def read():
+                while True:
+                    block = f.read(BLOCK_SIZE)
+                    if block or not self.follow:
+                        return block
+                    await asyncio.sleep(self.poll)
+
+            await feed(read, decoder, queue, stats, **batching)
+
+
+async def start_socket_server(fmt, queue, stats, host='127.0.0.1', port=8766,
+                              unix_path=None, **batching):
+    """Accept producer connections, each an independent event stream."""
+    async def handle(reader, writer):
+        try:
+            await feed(lambda: reader.read(BLOCK_SIZE), EventDecoder(fmt), queue, stats,
+                       **batching)
+        finally:
+            writer.close()
+
+    if unix_path:
+        return await asyncio.start_unix_server(handle, unix_path)
+    return await asyncio.start_server(handle, host, port)
+
+
+async def consume(queue, model, top, stats, windows=None, max_events=None):
+    """Score record batches from ``queue`` until ``None`` arrives or
+    ``max_events`` events are scored."""
+    while True:
+        batch = await queue.get()
+        if batch is None:
+            return
+        events = batch.to_pandas()
+        # Feature engineering and scoring are vectorized over the batch and
+        # run off the loop, so the readers keep going meanwhile
+        await asyncio.to_thread(score_chunk, model, events, top, windows)
+        stats.scored += len(events)
+        if max_events is not None and stats.scored >= max_events:
+            return
+
+
+async def report_every(stats, seconds):
+    while True:
+        await asyncio.sleep(seconds)
+        print(stats.summary(), flush=True)
+
+
+async def run(model, source, top, stats, fmt='ndjson', windows=None, queue_size=8,
+              max_events=None, report_seconds=None, batch_rows=5000, max_wait=0.05,
+              host='127.0.0.1', port=8766, unix_path=None):
+    """Ingest and score events from ``source`` (``'socket'`` or a ``FileTail``)
+    into the ``TopK`` ``top``, counting in ``stats``.
+
+    The caller owns both, so they survive the run being interrupted.
+    """
+    queue = asyncio.Queue(queue_size)
+    batching = {'batch_rows': batch_rows, 'max_wait': max_wait}
+    consumer = asyncio.create_task(consume(queue, model, top, stats, windows, max_events))
+    reporter = (asyncio.create_task(report_every(stats, report_seconds))
+                if report_seconds else None)
+
+    server = producer = None
+    try:
+        if source == 'socket':
+            server = await start_socket_server(fmt, queue, stats, host, port, unix_path,
+                                               **batching)
+            where = unix_path or f"{host}:{port}"
+            print(f"Ingesting {fmt} events on {where}", flush=True)
+            await consumer
+        else:
+            producer = asyncio.create_task(
+                source.stream(EventDecoder(fmt), queue, stats, **batching))
+            await asyncio.wait([producer, consumer], return_when=asyncio.FIRST_COMPLETED)
+            if producer.done():
+                producer.result()
+                await queue.put(None)
+                await consumer
+    finally:
+        for task in (producer, reporter, consumer):
+            if task is not None:
+                task.cancel()
+        if server is not None:
+            server.close()
+
+
+def _serialize(chunk, fmt, header):
+    if fmt == 'ndjson':
+        return chunk.to_json(orient='records', lines=True, date_format='iso',
+                             date_unit='s').encode()
+    return chunk.to_csv(index=False, header=header).encode()
+
+
+class _FileWriter:
+    """A file with the ``write``/``drain`` interface of a stream writer."""
+
+    def __init__(self, path):
+        self._file = open(path, 'ab')
+
+    def write(self, data):
+        self._file.write(data)
+
+    async def drain(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+async def produce(writer, rows, rate=None, fmt='ndjson', seed=0, batch_rows=1000):
+    """Stand-in producer: write ``rows`` synthetic events to ``writer`` at up
+    to ``rate`` events per second (as fast as possible without one).
+
+    ``drain`` blocks while the consumer is behind, which is the backpressure
+    a real telemetry producer would feel.
+    """
+    start = time.perf_counter()
+    sent = 0
+    for chunk in synthetic_logs(rows, seed, chunk_rows=batch_rows):
+        writer.write(_serialize(chunk, fmt, header=sent == 0))
+        await writer.drain()
+        sent += len(chunk)
+        if rate:
+            ahead = sent / rate - (time.perf_counter() - start)
+            if ahead > 0:
+                await asyncio.sleep(ahead)
+    return sent, time.perf_counter() - start
+
+
+async def _produce_to(args):
+    if args.file:
+        writer = _FileWriter(args.file)
+    elif args.unix:
+        _, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        _, writer = await asyncio.open_connection(args.host, args.port)
+    try:
+        sent, elapsed = await produce(writer, args.rows, args.rate, args.format, args.seed,
+                                      args.batch_rows)
+    finally:
+        writer.close()
+    print(f"Produced {sent} events in {elapsed:.2f} s ({sent / max(elapsed, 1e-9):,.0f} events/s)")
+
+
+def _add_source_arguments(parser):
+    parser.add_argument('--format', choices=FORMATS, default='ndjson')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--unix', metavar='PATH', help="use a Unix socket instead of TCP")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ingest live Neoverse events and score them as they arrive.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser('serve', help="ingest from a socket or a tailed file")
+    serve.add_argument('model', help="path to the hacker_model.joblib written by neo.py")
+    _add_source_arguments(serve)
+    serve.add_argument('--tail', metavar='PATH', help="read events from this file")
+    serve.add_argument('--follow', action='store_true',
+                       help="keep waiting for new lines at the end of the tailed file")
+    serve.add_argument('--batch-rows', type=int, default=5000)
+    serve.add_argument('--max-wait-ms', type=float, default=50.0)
+    serve.add_argument('--queue', type=int, default=8, help="record batches in flight")
+    serve.add_argument('--top', type=int, default=10, help="number of players to keep")
+    serve.add_argument('--max-events', type=int, help="stop after scoring this many events")
+    serve.add_argument('--report-every', type=float, metavar='SECONDS')
+    serve.add_argument('--windows-state', metavar='PATH',
+                       help="per-player time window state (.npz) to update and keep")
+    serve.add_argument('--window', default='24h')
+
+    producer = commands.add_parser('produce', help="send synthetic events")
+    _add_source_arguments(producer)
+    producer.add_argument('--file', metavar='PATH', help="append to this file instead")
+    producer.add_argument('--rows', type=int, default=100_000)
+    producer.add_argument('--rate', type=float, help="events per second (default: unthrottled)")
+    producer.add_argument('--seed', type=int, default=0)
+    producer.add_argument('--batch-rows', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    if args.command == 'produce':
+        asyncio.run(_produce_to(args))
+        return
+
+    model = HackerModel.load(args.model)
+    windows = None
+    if args.windows_state:
+        state_path = Path(args.windows_state)
+        windows = (PlayerWindows.load(state_path) if state_path.exists()
+                   else PlayerWindows(args.window))
+    source = FileTail(args.tail, follow=args.follow) if args.tail else 'socket'
+    top, stats = TopK(args.top), IngestStats()
+    try:
+        asyncio.run(run(
+            model, source, top, stats, args.format, windows, args.queue, args.max_events,
+            args.report_every, args.batch_rows, args.max_wait_ms / 1000,
+            args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    print(stats.summary())
+    if windows is not None:
+        windows.save(state_path)
+    print_ranked(top.frame())
+
+
+if __name__ == '__main__':
+    main()
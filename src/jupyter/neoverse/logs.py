@@ -0,0 +1,209 @@
+"""Typed loading of Neoverse player logs.
+
+``pd.read_csv`` with default dtypes turns every string column into Python
+objects and every number into a 64-bit value. The loader reads with an
+explicit schema instead: categoricals for the string columns, int32/float32
+numerics and a parsed ``Timestamps`` column. The CSV is converted once into a
+Parquet file next to it (streamed through ``pyarrow.csv``, so the conversion
+runs in bounded memory) and later runs read that file directly. The cache is
+rebuilt whenever the CSV's size or modification time changes.
+
+The cache keeps the float columns at the CSV's precision (float64) and the
+loaders cast them to float32 as they read. ``read_rows``, which fetches the
+full records that get exported, does not cast them, so exported values match
+the source file.
+
+The literal string ``None`` in ``Dark Market Transactions`` means "no
+transactions" and is kept as a category rather than parsed as missing.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+_CATEGORY = pa.dictionary(pa.int32(), pa.string())
+
+LOG_SCHEMA = {
+    'Player ID': _CATEGORY,
+    'Timestamps': pa.timestamp('s'),
+    'Timestamp': pa.timestamp('s'),
+    'Hours Played': pa.int32(),
+    'Money Spent ($)': pa.float32(),
+    'Criminal Score': pa.int32(),
+    'Missions Completed': pa.int32(),
+    'Player Rank': _CATEGORY,
+    'Team Affiliation': _CATEGORY,
+    'VIP Status': _CATEGORY,
+    'Cash on Hand ($)': pa.int32(),
+    'Sync Stability (%)': pa.float32(),
+    'Quest Exploit Score': pa.float32(),
+    'Player Level': _CATEGORY,
+    'Dark Market Transactions': _CATEGORY,
+    'Transaction Amount ($)': pa.int32(),
+    'Neural Link Stability (%)': pa.float32(),
+    # Pre-encoded columns of the spending analysis logs
+    'Player Level_encoded': pa.int32(),
+    'Player Rank_encoded': pa.int32(),
+    'Dark Market Transactions_encoded': pa.int32(),
+    'Team Affiliation_encoded': pa.int32(),
+}
+
+# Types of the Parquet cache: LOG_SCHEMA with float columns at source precision
+_CACHE_SCHEMA = {name: pa.float64() if type_ == pa.float32() else type_
+                 for name, type_ in LOG_SCHEMA.items()}
+
+_SOURCE_KEY = b'neoverse.source'
+# Bumped whenever the cache layout changes, so older caches are rebuilt
+_CACHE_VERSION = 2
+
+
+def _csv_options(columns=None, block_size=1 << 24, schema=LOG_SCHEMA):
+    read_options = pa_csv.ReadOptions(block_size=block_size)
+    convert_options = pa_csv.ConvertOptions(
+        column_types=schema, include_columns=columns,
+        null_values=[''], strings_can_be_null=True)
+    return read_options, convert_options
+
+
+def _source_stamp(path):
+    stat = Path(path).stat()
+    return json.dumps({'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                       'version': _CACHE_VERSION})
+
+
+def parquet_cache_path(path, cache_dir=None):
+    """Where the Parquet conversion of the log CSV at ``path`` is kept."""
+    path = Path(path)
+    return Path(cache_dir or path.parent) / f"{path.stem}.parquet"
+
+
+def logs_to_parquet(path, parquet_path=None):
+    """Convert the log CSV at ``path`` to typed Parquet, one block at a time.
+
+    Float columns keep the CSV's precision.
+    """
+    parquet_path = Path(parquet_path or parquet_cache_path(path))
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    read_options, convert_options = _csv_options(schema=_CACHE_SCHEMA)
+    reader = pa_csv.open_csv(path, read_options=read_options,
+                             convert_options=convert_options)
+    schema = reader.schema.with_metadata({_SOURCE_KEY: _source_stamp(path)})
+    tmp_path = parquet_path.with_suffix('.tmp.parquet')
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for batch in reader:
+            writer.write_table(pa.Table.from_batches([batch], schema=schema))
+    tmp_path.replace(parquet_path)
+    return parquet_path
+
+
+def _fresh_cache(path, cache_dir):
+    """Path of an up-to-date Parquet cache for ``path``, converting if needed."""
+    parquet_path = parquet_cache_path(path, cache_dir)
+    if parquet_path.exists():
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        if metadata.get(_SOURCE_KEY) == _source_stamp(path).encode():
+            return parquet_path
+    return logs_to_parquet(path, parquet_path)
+
+
+def _is_parquet(path):
+    return Path(path).suffix == '.parquet'
+
+
+def _working_types(table):
+    """``table`` with the float64 columns of the cache cast to the float32 of
+    ``LOG_SCHEMA``."""
+    fields = [pa.field(field.name, pa.float32())
+              if field.type == pa.float64() and LOG_SCHEMA.get(field.name) == pa.float32()
+              else field for field in table.schema]
+    return table.cast(pa.schema(fields, metadata=table.schema.metadata))
+
+
+def _to_pandas(table):
+    # Arrow buffers are released column by column as they are converted, and
+    # the memory pool hands freed memory back, so a load peaks near the size
+    # of the DataFrame instead of twice it
+    frame = table.to_pandas(split_blocks=True, self_destruct=True)
+    pa.default_memory_pool().release_unused()
+    return frame
+
+
+def read_logs(path, columns=None, cache=True, cache_dir=None):
+    """Load a Neoverse log file (CSV or Parquet) as a typed DataFrame.
+
+    With ``cache`` a CSV is read through its Parquet conversion, which is
+    created or refreshed as needed. ``columns`` limits the load to the
+    columns a caller reads.
+    """
+    if _is_parquet(path):
+        return _to_pandas(_working_types(pq.read_table(path, columns=columns)))
+    if cache:
+        return _to_pandas(_working_types(
+            pq.read_table(_fresh_cache(path, cache_dir), columns=columns)))
+    read_options, convert_options = _csv_options(columns)
+    return _to_pandas(pa_csv.read_csv(path, read_options=read_options,
+                                      convert_options=convert_options))
+
+
+def read_rows(path, positions, columns=None, cache_dir=None):
+    """Rows at ``positions`` (0-based row numbers) of a log file, in the
+    given order.
+
+    Only the Parquet row groups holding those rows are read, one at a time,
+    so a few full records can be fetched at the end of a run without keeping
+    every column of every player in memory. A CSV is read through its
+    Parquet conversion. Float columns keep the precision they are stored at,
+    which for a CSV is the source's.
+    """
+    parquet_path = path if _is_parquet(path) else _fresh_cache(path, cache_dir)
+    parquet_file = pq.ParquetFile(parquet_path)
+    metadata = parquet_file.metadata
+    starts = np.cumsum([0] + [metadata.row_group(i).num_rows
+                              for i in range(metadata.num_row_groups)])
+    positions = np.asarray(positions, dtype=np.int64)
+    group_of = np.searchsorted(starts, positions, side='right') - 1
+
+    empty = parquet_file.schema_arrow.empty_table()
+    pieces = [empty.select(columns) if columns is not None else empty]
+    for group in np.unique(group_of):
+        local = positions[group_of == group] - starts[group]
+        pieces.append(parquet_file.read_row_group(group, columns=columns)
+                      .take(pa.array(local)))
+    table = pa.concat_tables(pieces)
+
+    # The pieces are in row group order; put the rows back in the given order
+    order = np.argsort(group_of, kind='stable')
+    return table.take(pa.array(np.argsort(order))).to_pandas()
+
+
+def iter_logs(path, chunksize=100_000, columns=None, cache=True, cache_dir=None):
+    """Stream a Neoverse log file as typed DataFrames of at most ``chunksize`` rows.
+
+    Categories are per chunk; only one chunk is in memory at a time.
+    """
+    if _is_parquet(path) or cache:
+        parquet_path = path if _is_parquet(path) else _fresh_cache(path, cache_dir)
+        for batch in pq.ParquetFile(parquet_path).iter_batches(
+                batch_size=chunksize, columns=columns):
+            yield _working_types(pa.Table.from_batches([batch])).to_pandas()
+        return
+
+    # Straight from the CSV: parse in blocks and re-slice them to chunksize
+    read_options, convert_options = _csv_options(columns)
+    reader = pa_csv.open_csv(path, read_options=read_options,
+                             convert_options=convert_options)
+    pending, pending_rows = [], 0
+    for batch in reader:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunksize:
+            table = pa.Table.from_batches(pending)
+            yield table.slice(0, chunksize).to_pandas()
+            rest = table.slice(chunksize)
+            pending, pending_rows = rest.to_batches(), rest.num_rows
+    if pending_rows:
+        yield pa.Table.from_batches(pending).to_pandas()
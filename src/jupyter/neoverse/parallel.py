@@ -0,0 +1,130 @@
+"""Process-pool execution of the spending sweep.
+
+The sweep has two expensive parts: the per-split moments, which scan every
+row of the feature matrix, and the batched subset solves, which grow with the
+number of feature combinations. ``ParallelGramSweep`` runs the first one split
+per worker against a feature matrix placed in shared memory (workers map it
+rather than receiving a pickled copy) and shards the second across the pool in
+fixed chunks of the combination space. Chunks are merged back in submission
+order, so results are identical to the serial ``GramSweep``.
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .sweep import GramSweep, SplitMoments
+
+# Per-worker state set up by the pool initializers
+_worker = {}
+
+
+def process_pool(workers, initializer=None, initargs=()):
+    # The analysis scripts run top to bottom at module level, so spawn-style
+    # workers (which re-import __main__) would rerun the whole script. Fork
+    # wherever the platform offers it.
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=initializer, initargs=initargs)
+
+
+def _share(array):
+    shm = SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm
+
+
+def _attach(name, shape):
+    shm = SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+
+
+def _init_moments_worker(x_name, x_shape, y_name, y_shape, split_cache):
+    _worker['X_shm'], _worker['X'] = _attach(x_name, x_shape)
+    _worker['y_shm'], _worker['y'] = _attach(y_name, y_shape)
+    _worker['split_cache'] = split_cache
+
+
+def _moments_task(test_size, random_state, max_points):
+    split = SplitMoments(_worker['X'], _worker['y'], test_size,
+                         random_state, max_points, _worker['split_cache'])
+    # The solve stage only needs the moments and the sampled rows
+    split.train_idx = split.test_idx = None
+    return split
+
+
+def _init_solve_worker(sweep):
+    _worker['sweep'] = sweep
+
+
+def _solve_task(subsets):
+    return _worker['sweep'].evaluate(subsets)
+
+
+class ParallelGramSweep(GramSweep):
+    """``GramSweep`` whose moments and solves run in a process pool.
+
+    Call ``close`` (or use it as a context manager) to shut the pool down.
+    """
+
+    def __init__(self, X, y, feature_names, workers, **kwargs):
+        self.workers = workers
+        self._pool = None
+        super().__init__(X, y, feature_names, **kwargs)
+
+    def _split_moments(self, X, y, random_state, max_points):
+        # Fill the split cache here so every worker inherits the same indices
+        for test_size in self.test_sizes:
+            self.split_cache.get(len(y), test_size, random_state)
+        X_shm, y_shm = _share(X), _share(y)
+        try:
+            with process_pool(min(self.workers, len(self.test_sizes)),
+                              _init_moments_worker,
+                              (X_shm.name, X.shape, y_shm.name, y.shape,
+                               self.split_cache)) as pool:
+                splits = list(pool.map(_moments_task, self.test_sizes,
+                                       [random_state] * len(self.test_sizes),
+                                       [max_points] * len(self.test_sizes)))
+        finally:
+            for shm in (X_shm, y_shm):
+                shm.close()
+                shm.unlink()
+        return splits
+
+    def evaluate(self, subsets, chunk_size=None):
+        """Solve ``subsets`` on every split, sharded across the pool."""
+        if self._pool is None:
+            # Workers receive the moments once, not with every chunk
+            self._pool = process_pool(self.workers, _init_solve_worker,
+                                      (_solver(self),))
+        if chunk_size is None:
+            chunk_size = max(64, -(-len(subsets) // (4 * self.workers)))
+        chunks = [subsets[start:start + chunk_size]
+                  for start in range(0, len(subsets), chunk_size)]
+        solved = list(self._pool.map(_solve_task, chunks))
+        return [{key: np.concatenate([chunk[i][key] for chunk in solved])
+                 for key in solved[0][i]}
+                for i in range(len(self.splits))]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _solver(sweep):
+    """A plain ``GramSweep`` sharing ``sweep``'s moments, for the workers."""
+    solver = GramSweep.__new__(GramSweep)
+    solver.feature_names = sweep.feature_names
+    solver.test_sizes = sweep.test_sizes
+    solver.splits = sweep.splits
+    return solver
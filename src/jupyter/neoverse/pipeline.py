@@ -0,0 +1,1129 @@
+"""The Neoverse analyses as a DAG of cached stages.
+
+The hacker detector and the spending analysis are split into stages that
+pass their results through files, so any selection of them runs on logs from
+any input directory into any output directory::
+
+    python -m neoverse run --input-dir logs --output-dir out --stages load,features,sweep,export
+
+``neo.py`` and ``neoverse_spending_analysis.py`` run the stages of one
+analysis each on the logs next to them, with the same options. The hacker
+detector reads ``perfect_prediction_neoverse_logs.csv`` and the spending
+analysis ``neoverse_logs_with_edge_cases.csv`` (``--hacker-logs`` and
+``--spending-logs``).
+
+The hacker detector, written to ``<output-dir>/hacker``:
+
+* ``load``: the typed Parquet conversion of the hacker logs.
+* ``features``: the engineered float32 matrix and its fitted
+  ``FeaturePipeline``, with exact or sketched (``--quantiles sketch``)
+  thresholds.
+* ``train``: labels, the stratified split, the logistic fit (C chosen by
+  ``CPathSearch`` with ``--select-c``) and the suspicion factor thresholds,
+  saved as ``hacker_model.joblib``.
+* ``evaluate``: test-split probabilities, the top 10 and ``hacker_metrics.json``.
+* ``hackers``: ``true_positive_hackers_logistic_regression.csv``.
+* ``hacker_plots``: the hacker figures selected by ``--plots``.
+
+The spending analysis, written to ``<output-dir>/spending``:
+
+* ``load_spending``: the typed Parquet conversion of the spending logs.
+* ``explore``: ``describe.csv`` and ``correlations.csv`` (with Money Spent).
+* ``sweep``: the feature-combination sweep up to ``--max-features``, reusing
+  the models in ``--result-cache-dir`` when given.
+* ``export``: ``model_results.parquet``, ``model_metadata.parquet`` and
+  ``top_models.json``.
+* ``refit``: the best model refitted on its split.
+* ``spending_plots``: the spending figures selected by ``--plots``.
+
+A selected stage pulls in the stages it depends on. Intermediate artifacts
+are kept in ``--cache-dir`` (default ``<output-dir>/.cache``) together with
+``stages.json``, which records the key of every stage's last successful run.
+A key hashes the options the stage reads, the keys of its dependencies and
+its code (``stage_code``): the stage function, the helpers and constants of
+this module it uses and every ``neoverse`` module those import, directly or
+not, so editing e.g. ``neoverse.sweep`` reruns the sweep. The keys of the
+load stages also hash the path, size and mtime of their logs. A stage whose
+key is unchanged and whose outputs all still exist is skipped; ``--force``
+runs it anyway. Stages run in ``--jobs`` worker processes as soon as their
+dependencies are done, so independent branches, e.g. the spending plots and
+the export, run concurrently. Every stage run saves its ``neoverse.trace``
+spans, one per step with the rows it processed, as ``<stage>_trace.json``
+next to the outputs of its analysis.
+"""
+
+import argparse
+import ast
+import hashlib
+import inspect
+import json
+import os
+import textwrap
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from .boundary import DEFAULT_MAX_CELLS
+from .export import DEFAULT_COMPRESSION, DEFAULT_ROW_GROUP_SIZE
+from .model_selection import add_model_selection_arguments
+from .parallel import process_pool
+from .projection import METHODS as PROJECTION_METHODS
+from .report import Report, add_plots_argument
+from .trace import Tracer, add_trace_arguments
+
+STAGES = ('load', 'features', 'train', 'evaluate', 'hackers', 'hacker_plots',
+          'load_spending', 'explore', 'sweep', 'export', 'refit', 'spending_plots')
+DEPENDS = {
+    'features': ['load'], 'train': ['load', 'features'],
+    'evaluate': ['features', 'train'], 'hackers': ['load', 'evaluate'],
+    'hacker_plots': ['load', 'evaluate'],
+    'explore': ['load_spending'], 'sweep': ['load_spending'],
+    'export': ['load_spending', 'sweep'], 'refit': ['load_spending', 'sweep'],
+    'spending_plots': ['explore', 'refit'],
+}
+# The logs each load stage converts
+SOURCES = {'load': 'hacker', 'load_spending': 'spending'}
+# The analysis whose output directory holds a stage's outputs and trace
+ANALYSES = {
+    **dict.fromkeys(('load', 'features', 'train', 'evaluate', 'hackers', 'hacker_plots'),
+                    'hacker'),
+    **dict.fromkeys(('load_spending', 'explore', 'sweep', 'export', 'refit',
+                     'spending_plots'), 'spending'),
+}
+# Options whose values a stage's outputs depend on
+OPTIONS = {
+    'features': ('quantiles', 'chunksize'),
+    'train': ('label_quantile', 'quantiles', 'chunksize', 'select_c', 'c_range',
+              'c_points', 'folds'),
+    'hacker_plots': ('plots', 'max_plot_points', 'projection', 'boundary_max_cells',
+                     'boundary_refine'),
+    'sweep': ('max_features',),
+    'export': ('row_group_size', 'compression'),
+    'spending_plots': ('plots', 'max_plot_points'),
+}
+PLOT_STAGES = ('hacker_plots', 'spending_plots')
+MANIFEST_NAME = 'stages.json'
+
+HACKER_FIGURES = ['hacker_truth_table', 'feature_importance', 'roc_curve',
+                  'precision_recall_curve', 'logistic_regression_boundary']
+SPENDING_FIGURES = ['money_spent_distribution', 'correlation_heatmap',
+                    'feature_scatter_plots', 'top_models_r2', 'feature_importance',
+                    'actual_vs_predicted', 'residual_plot']
+
+SPENDING_TARGET = 'Money Spent ($)'
+SPENDING_FEATURES = [
+    'Hours Played', 'Criminal Score', 'Missions Completed', 'Quest Exploit Score',
+    'Player Level_encoded', 'Player Rank_encoded', 'Dark Market Transactions_encoded',
+    'Team Affiliation_encoded', 'Cash on Hand ($)', 'Sync Stability (%)',
+    'Transaction Amount ($)', 'Neural Link Stability (%)', 'VIP_Status_Binary'
+]
+
+
+def parse_stages(value):
+    """Stage names selected by a ``--stages`` value: ``all`` or a
+    comma-separated list."""
+    value = value.strip()
+    if value == 'all':
+        return list(STAGES)
+    selected = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in STAGES]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown stages {unknown}; choose from {', '.join(STAGES)}")
+    return selected
+
+
+def required_stages(selected):
+    """``selected`` plus the stages they depend on, in ``STAGES`` order."""
+    needed = set()
+
+    def visit(stage):
+        if stage not in needed:
+            needed.add(stage)
+            for dependency in DEPENDS.get(stage, ()):
+                visit(dependency)
+
+    for stage in selected:
+        visit(stage)
+    return [stage for stage in STAGES if stage in needed]
+
+
+def _package_imports(node):
+    """Names of the ``neoverse`` modules imported anywhere in ``node``."""
+    modules = set()
+    for child in ast.walk(node):
+        if isinstance(child, ast.ImportFrom) and child.level == 1:
+            if child.module:
+                modules.add(child.module.split('.')[0])
+            else:
+                modules.update(alias.name for alias in child.names)
+    return modules
+
+
+def stage_code(stage):
+    """Code ``stage``'s outputs depend on, as one string.
+
+    That is the stage function, the functions and constants of this module
+    it uses, directly or through those functions, and every ``neoverse``
+    module they import, directly or through other modules. Code is compared
+    by its syntax tree, so comments and formatting do not count.
+    """
+    package_dir = Path(__file__).parent
+    namespace = globals()
+    functions, constants, modules = {}, {}, set()
+    pending = [RUNNERS[stage]]
+    while pending:
+        function = pending.pop()
+        if function.__name__ in functions:
+            continue
+        tree = ast.parse(textwrap.dedent(inspect.getsource(function)))
+        functions[function.__name__] = ast.dump(tree)
+        modules |= _package_imports(tree)
+        for name in {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}:
+            value = namespace.get(name)
+            if inspect.isfunction(value) and value.__module__ == __name__:
+                pending.append(value)
+            elif inspect.isclass(value) or inspect.ismodule(value):
+                owner = value.__name__ if inspect.ismodule(value) else value.__module__
+                if owner.startswith(f"{__package__}."):
+                    modules.add(owner.split('.')[1])
+            elif isinstance(value, (str, int, float, tuple, list, dict)):
+                constants[name] = repr(value)
+
+    trees, pending = {}, list(modules)
+    while pending:
+        name = pending.pop()
+        if name not in trees:
+            tree = ast.parse((package_dir / f"{name}.py").read_text())
+            trees[name] = ast.dump(tree)
+            pending.extend(_package_imports(tree))
+    return '\n'.join(
+        [functions[name] for name in sorted(functions)]
+        + [f"{name} = {constants[name]}" for name in sorted(constants)]
+        + [trees[name] for name in sorted(trees)])
+
+
+def _option_value(value):
+    # --plots is a frozenset, whose order is not stable across runs
+    return sorted(value) if isinstance(value, (set, frozenset)) else value
+
+
+class Pipeline:
+    """The stages of one pair of log files, output directory and set of
+    options.
+
+    ``args`` is the parsed ``run`` command line; stages read their options
+    from it.
+    """
+
+    def __init__(self, hacker_logs, spending_logs, output_dir, args, cache_dir=None,
+                 jobs=1):
+        self.inputs = {'hacker': Path(hacker_logs), 'spending': Path(spending_logs)}
+        self.output_dir = Path(output_dir)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.output_dir / '.cache'
+        self.args = args
+        self.jobs = jobs
+        self._manifest_path = self.cache_dir / MANIFEST_NAME
+
+    @classmethod
+    def from_args(cls, args):
+        input_dir = Path(args.input_dir)
+        return cls(input_dir / args.hacker_logs, input_dir / args.spending_logs,
+                   args.output_dir, args, cache_dir=args.cache_dir, jobs=args.jobs)
+
+    def logs(self, analysis):
+        """The Parquet logs of ``analysis``, as converted by its load stage."""
+        stage = 'load' if analysis == 'hacker' else 'load_spending'
+        return self.artifact(stage, 'logs.parquet')
+
+    def artifact(self, stage, name):
+        """Path of the intermediate file ``name`` of ``stage``."""
+        directory = self.cache_dir / stage
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / name
+
+    def output(self, analysis, name):
+        """Path of the output file ``name`` of ``analysis`` (``hacker`` or
+        ``spending``)."""
+        directory = self.output_dir / analysis
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory / name
+
+    def keys(self, stages):
+        """Key of every stage in ``stages``, which must include their
+        dependencies."""
+        keys = {}
+        for stage in stages:
+            source = None
+            if stage in SOURCES:
+                path = self.inputs[SOURCES[stage]]
+                stat = path.stat()
+                source = {'path': str(path.resolve()), 'size': stat.st_size,
+                          'mtime_ns': stat.st_mtime_ns}
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(stage_code(stage).encode())
+            digest.update(json.dumps({
+                'stage': stage,
+                'source': source,
+                'options': {name: _option_value(getattr(self.args, name))
+                            for name in OPTIONS.get(stage, ())},
+                'depends': [keys[dependency] for dependency in DEPENDS.get(stage, ())],
+            }, sort_keys=True, default=str).encode())
+            keys[stage] = digest.hexdigest()
+        return keys
+
+    def _load_manifest(self):
+        try:
+            return json.loads(self._manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        self._manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._manifest_path.with_suffix('.tmp.json')
+        tmp_path.write_text(json.dumps(manifest, indent=2))
+        tmp_path.replace(self._manifest_path)
+
+    def plan(self, selected, force=()):
+        """``(stages, keys, to_run)``: the selected stages with their
+        dependencies, their keys and the ones that have to run.
+
+        A stage runs when it is forced or out of date and either selected or
+        needed by a stage that runs.
+        """
+        stages = required_stages(selected)
+        keys = self.keys(stages)
+        manifest = self._load_manifest()
+
+        def fresh(stage):
+            entry = manifest.get(stage)
+            return (entry is not None and entry['key'] == keys[stage]
+                    and all(Path(path).exists() for path in entry['outputs']))
+
+        to_run = set()
+        for stage in reversed(stages):
+            needed = stage in selected or any(
+                stage in DEPENDS.get(other, ()) for other in to_run)
+            if needed and (stage in force or not fresh(stage)):
+                to_run.add(stage)
+        return stages, keys, to_run
+
+    def run(self, selected, force=()):
+        """Run the out-of-date stages needed for ``selected``; returns the
+        stages that ran."""
+        stages, keys, to_run = self.plan(selected, force)
+        manifest = self._load_manifest()
+        for stage in stages:
+            if stage not in to_run:
+                print(f"{stage}: up to date")
+            else:
+                # A stage interrupted halfway must not look complete
+                manifest.pop(stage, None)
+        self._save_manifest(manifest)
+
+        done = set(stages) - to_run
+        ran = [stage for stage in stages if stage in to_run]
+        pending = list(ran)
+
+        def finish(stage, outputs, wall_s):
+            manifest[stage] = {'key': keys[stage], 'outputs': outputs, 'wall_s': wall_s}
+            self._save_manifest(manifest)
+            done.add(stage)
+            print(f"{stage}: done in {wall_s:.2f}s")
+
+        if self.jobs <= 1:
+            for stage in pending:
+                print(f"{stage}: running")
+                finish(stage, *_run_stage(self, stage))
+            return ran
+
+        # Forked workers; every stage reads its inputs from files, so any
+        # worker can run any stage
+        failed = None
+        with process_pool(self.jobs) as pool:
+            running = {}
+            while pending or running:
+                if failed is None:
+                    for stage in [stage for stage in pending
+                                  if done.issuperset(DEPENDS.get(stage, ()))]:
+                        pending.remove(stage)
+                        print(f"{stage}: running")
+                        running[pool.submit(_run_stage, self, stage)] = stage
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage = running.pop(future)
+                    try:
+                        finish(stage, *future.result())
+                    except Exception as exc:
+                        print(f"{stage}: failed")
+                        failed = failed or exc
+        if failed is not None:
+            raise failed
+        return ran
+
+
+def _run_stage(pipeline, stage):
+    """Run ``stage``; returns its output paths and wall time.
+
+    The stage's trace is saved next to the outputs of its analysis, as
+    ``<stage>_trace.json``, with the most rows any of its steps processed.
+    """
+    tracer = Tracer.from_args(pipeline.args, stage)
+    with tracer.span(stage) as span:
+        outputs = RUNNERS[stage](pipeline, tracer)
+        span.rows = max((record['rows'] for record in tracer.records[1:]
+                         if record.get('rows') is not None), default=None)
+    tracer.save(pipeline.output(ANALYSES[stage], f"{stage}_trace.json"), rows=span.rows)
+    return [str(path) for path in outputs], tracer.records[0]['wall_s']
+
+
+# Hacker detection
+
+def _convert(pipeline, tracer, analysis):
+    import pyarrow.parquet as pq
+
+    from .logs import logs_to_parquet
+
+    with tracer.span('read_csv') as span:
+        path = logs_to_parquet(pipeline.inputs[analysis], pipeline.logs(analysis))
+        span.rows = pq.read_metadata(path).num_rows
+    print(f"{analysis} logs: {span.rows} rows from {pipeline.inputs[analysis]}")
+    return [path]
+
+
+def load(pipeline, tracer):
+    return _convert(pipeline, tracer, 'hacker')
+
+
+def features(pipeline, tracer):
+    from .features import FeaturePipeline
+    from .hacker_model import HACKER_FEATURES
+    from .logs import iter_logs, read_logs
+
+    args = pipeline.args
+    feature_pipeline = FeaturePipeline(HACKER_FEATURES + ['suspicion_score'])
+    with tracer.span('read_logs') as span:
+        data = read_logs(pipeline.logs('hacker'), columns=feature_pipeline.inputs)
+        span.rows = len(data)
+
+    with tracer.span('features') as span:
+        if args.quantiles == 'sketch':
+            # Thresholds from one streaming pass over the logs instead of full sorts
+            feature_pipeline.fit_chunks(lambda: iter_logs(
+                pipeline.logs('hacker'), args.chunksize, columns=feature_pipeline.inputs))
+            engineered = feature_pipeline.transform(data)
+            print("Sketched feature thresholds (estimated rank error):")
+            for (_, column, q), error in feature_pipeline.errors.items():
+                print(f"  {column} q{q:g}: "
+                      f"{feature_pipeline.stats[('quantile', column, q)]:.4f} (±{error:.2e})")
+        else:
+            engineered = feature_pipeline.fit_transform(data)
+        span.rows = len(engineered)
+
+    with tracer.span('save') as span:
+        engineered_path = pipeline.artifact('features', 'engineered.npy')
+        np.save(engineered_path, engineered)
+        pipeline_path = pipeline.artifact('features', 'feature_pipeline.joblib')
+        joblib.dump(feature_pipeline, pipeline_path)
+        span.rows = len(engineered)
+    return [engineered_path, pipeline_path]
+
+
+def _engineered(pipeline):
+    return np.load(pipeline.artifact('features', 'engineered.npy'), mmap_mode='r')
+
+
+def train(pipeline, tracer):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    from .hacker_model import HACKER_FEATURES, HackerModel
+    from .logs import iter_logs, read_logs
+    from .model_selection import CPathSearch
+    from .sketch import QuantileSketch
+    from .suspicion import FactorEngine
+
+    args = pipeline.args
+    n_features = len(HACKER_FEATURES)
+    engineered = _engineered(pipeline)
+    with tracer.span('labels') as span:
+        suspicion_score = np.asarray(engineered[:, n_features])
+        if args.quantiles == 'sketch':
+            score_sketch = QuantileSketch()
+            for start in range(0, len(suspicion_score), args.chunksize):
+                score_sketch.update(suspicion_score[start:start + args.chunksize])
+            threshold = score_sketch.quantile(args.label_quantile)
+            print("Sketched label threshold (estimated rank error):")
+            print(f"  suspicion_score q{args.label_quantile:g}: {threshold:.4f} "
+                  f"(±{score_sketch.rank_error(args.label_quantile):.2e})")
+        else:
+            threshold = np.quantile(suspicion_score, args.label_quantile)
+        y = (suspicion_score > threshold).astype(int)
+        span.rows = len(y)
+    print(f"Class distribution in full dataset: {np.bincount(y)}")
+
+    # The stratified split depends only on the labels, so the row numbers are
+    # split instead of the features
+    with tracer.span('split') as span:
+        train_idx, test_idx = train_test_split(
+            np.arange(len(y)), test_size=0.3, random_state=42, stratify=y)
+        X_train = engineered[train_idx, :n_features]
+        span.rows = len(y)
+
+    with tracer.span('scale') as span:
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        span.rows = len(X_train)
+
+    outputs = []
+    if args.select_c:
+        # C is cross-validated on the training rows; the test split stays held
+        # out for the metrics
+        with tracer.span('select_c', folds=args.folds, c_points=args.c_points) as span:
+            selection = CPathSearch.from_args(args).fit(X_train, y[train_idx])
+            outputs.append(selection.save(
+                pipeline.output('hacker', 'hacker_model_selection.json')))
+            span.rows = len(X_train)
+        print(f"C search ({args.folds}-fold, {args.c_points} values):")
+        print(selection.format_summary())
+        print(f"Best C: {selection.best_C:.4g}")
+
+    with tracer.span('fit') as span:
+        if args.select_c:
+            model = selection.best_estimator()
+        else:
+            model = LogisticRegression(C=1.0, class_weight='balanced', max_iter=1000,
+                                       random_state=42, solver='liblinear')
+        model.fit(X_train_scaled, y[train_idx])
+        span.rows = len(X_train)
+
+    # Suspicion factor thresholds (quantiles of the full dataset)
+    with tracer.span('fit_factors') as span:
+        factor_engine = FactorEngine()
+        if args.quantiles == 'sketch':
+            factor_engine.fit_chunks(iter_logs(pipeline.logs('hacker'), args.chunksize,
+                                               columns=factor_engine.columns))
+            print("Sketched suspicion factor thresholds (estimated rank error):")
+            for label, error in factor_engine.errors.items():
+                print(f"  {label}: {factor_engine.thresholds[label]:.4f} (±{error:.2e})")
+        else:
+            factor_engine.fit(read_logs(pipeline.logs('hacker'),
+                                        columns=factor_engine.columns))
+        span.rows = len(y)
+
+    # Persisted with its training-time statistics, so new player events can
+    # be scored without rerunning the stages
+    with tracer.span('save_model'):
+        feature_pipeline = joblib.load(pipeline.artifact('features', 'feature_pipeline.joblib'))
+        model_path = pipeline.output('hacker', 'hacker_model.joblib')
+        HackerModel(model, scaler, feature_pipeline=feature_pipeline.select(HACKER_FEATURES),
+                    factor_engine=factor_engine, features=HACKER_FEATURES).save(model_path)
+        split_path = pipeline.artifact('train', 'split.npz')
+        np.savez(split_path, train_idx=train_idx, test_idx=test_idx, y=y)
+    return outputs + [model_path, split_path]
+
+
+def _test_split(pipeline):
+    """``(model, test_idx, X_test_scaled, y_test)`` of the trained detector."""
+    from .hacker_model import HackerModel
+
+    hacker_model = HackerModel.load(pipeline.output('hacker', 'hacker_model.joblib'))
+    with np.load(pipeline.artifact('train', 'split.npz')) as split:
+        test_idx, y = split['test_idx'], split['y']
+    X_test = _engineered(pipeline)[test_idx, :len(hacker_model.features)]
+    return hacker_model, test_idx, hacker_model.scaler.transform(X_test), y[test_idx]
+
+
+def evaluate(pipeline, tracer):
+    from sklearn.metrics import (accuracy_score, classification_report, f1_score,
+                                 precision_score, recall_score, roc_auc_score)
+
+    from .ranking import top_k
+
+    with tracer.span('scale') as span:
+        hacker_model, _, X_test_scaled, y_test = _test_split(pipeline)
+        span.rows = len(y_test)
+
+    with tracer.span('predict') as span:
+        y_prob = hacker_model.model.predict_proba(X_test_scaled)[:, 1]
+
+        # The top 10 by probability are the predicted hackers
+        top_10_indices = top_k(y_prob, 10)
+        y_pred = np.zeros_like(y_test)
+        y_pred[top_10_indices] = 1
+
+        metrics = {
+            'accuracy': accuracy_score(y_test, y_pred),
+            'precision': precision_score(y_test, y_pred, zero_division=0),
+            'recall': recall_score(y_test, y_pred, zero_division=0),
+            'f1': f1_score(y_test, y_pred, zero_division=0),
+            'auc': roc_auc_score(y_test, y_prob),
+        }
+        span.rows = len(y_test)
+    print("Model Metrics:")
+    print(f"Accuracy: {metrics['accuracy']:.4f}")
+    print(f"Precision: {metrics['precision']:.4f}")
+    print(f"Recall: {metrics['recall']:.4f}")
+    print(f"F1 Score: {metrics['f1']:.4f}")
+    print(f"AUC: {metrics['auc']:.4f}")
+    print("\nDetailed Classification Report:")
+    print(classification_report(y_test, y_pred, target_names=["Innocent", "Hacker"],
+                                zero_division=0))
+    metrics['classification_report'] = classification_report(
+        y_test, y_pred, target_names=["Innocent", "Hacker"], zero_division=0,
+        output_dict=True)
+    metrics_path = pipeline.output('hacker', 'hacker_metrics.json')
+    metrics_path.write_text(json.dumps(metrics, indent=2))
+
+    evaluation_path = pipeline.artifact('evaluate', 'evaluation.npz')
+    np.savez(evaluation_path, y_prob=y_prob, y_pred=y_pred, top=top_10_indices)
+    return [metrics_path, evaluation_path]
+
+
+def _evaluation(pipeline):
+    with np.load(pipeline.artifact('evaluate', 'evaluation.npz')) as evaluation:
+        return evaluation['y_prob'], evaluation['y_pred'], evaluation['top']
+
+
+def hackers(pipeline, tracer):
+    from .logs import read_rows
+
+    hacker_model, test_idx, _, y_test = _test_split(pipeline)
+    y_prob, _, top_10_indices = _evaluation(pipeline)
+
+    # True positives among the top 10, still ranked by probability, with their
+    # full records read back from the logs
+    with tracer.span('export') as span:
+        true_positive_indices = top_10_indices[y_test[top_10_indices] == 1]
+        original_indices = test_idx[true_positive_indices]
+        hackers_data = read_rows(pipeline.logs('hacker'), original_indices)
+        hackers_data['Hacker_Probability'] = y_prob[true_positive_indices]
+        hackers_data['Actual_Label'] = y_test[true_positive_indices]
+        hackers_data['Suspicion_Score'] = _engineered(pipeline)[
+            original_indices, len(hacker_model.features)]
+        hackers_data['Hacker_Rank'] = range(1, len(hackers_data) + 1)
+        hackers_data['Suspicion_Factors'] = hacker_model.suspicion_factors(hackers_data)
+
+        path = pipeline.output('hacker', 'true_positive_hackers_logistic_regression.csv')
+        hackers_data.to_csv(path, index=False)
+        span.rows = len(hackers_data)
+
+    print(f"\nTrue Positive Hackers Detected -> ({len(hackers_data)}):")
+    print("--------------------------------------------------")
+    for row in hackers_data.to_dict('records'):
+        print(f"#{row['Hacker_Rank']}: Player {row['Player ID']} - "
+              f"Probability: {row['Hacker_Probability']:.3f}")
+        print(f"   Factors: {row['Suspicion_Factors']}")
+        print("   -----------------------------")
+    return [path]
+
+
+def hacker_plots(pipeline, tracer):
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import confusion_matrix, precision_recall_curve, roc_curve
+
+    from . import figures
+    from .boundary import boundary_mesh
+    from .logs import read_rows
+    from .projection import cached_projection
+
+    args = pipeline.args
+    report = Report.from_args(args, pipeline.output_dir / 'hacker')
+    hacker_model, test_idx, X_test_scaled, y_test = _test_split(pipeline)
+    y_prob, y_pred, _ = _evaluation(pipeline)
+    metrics = json.loads(pipeline.output('hacker', 'hacker_metrics.json').read_text())
+    outputs = [report.output_dir / f"{name}.png" for name in HACKER_FIGURES
+               if name in report]
+
+    with tracer.span('plot') as span:
+        if 'hacker_truth_table' in report:
+            report.render(
+                'hacker_truth_table', figures.truth_table,
+                cm=confusion_matrix(y_test, y_pred),
+                metrics=f"Accuracy: {metrics['accuracy']:.4f} | "
+                        f"Precision: {metrics['precision']:.4f} | "
+                        f"Recall: {metrics['recall']:.4f} | F1-Score: {metrics['f1']:.4f}")
+
+        if 'feature_importance' in report:
+            feature_importances = np.abs(hacker_model.model.coef_[0])
+            sorted_idx = np.argsort(feature_importances)[::-1]
+            report.render('feature_importance', figures.coefficient_importance,
+                          features=[hacker_model.features[i] for i in sorted_idx],
+                          importances=feature_importances[sorted_idx])
+
+        if 'roc_curve' in report:
+            fpr, tpr, _ = roc_curve(y_test, y_prob)
+            report.render('roc_curve', figures.roc, fpr=fpr, tpr=tpr, auc=metrics['auc'])
+
+        if 'precision_recall_curve' in report:
+            precision_curve, recall_curve, _ = precision_recall_curve(y_test, y_prob)
+            report.render('precision_recall_curve', figures.precision_recall,
+                          precision=precision_curve, recall=recall_curve)
+
+        if 'logistic_regression_boundary' in report:
+            # 2-D projection of the test split, kept next to the model for the
+            # dashboards, with the boundary of a logistic model fitted on it
+            projection_path = pipeline.output('hacker', 'hacker_model.projection.npz')
+            player_ids = read_rows(pipeline.logs('hacker'), test_idx,
+                                   columns=['Player ID'])['Player ID']
+            X_test_pca = cached_projection(
+                projection_path, X_test_scaled, method=args.projection,
+                extras={'labels': y_test, 'player_ids': player_ids.to_numpy(dtype=str)})
+            pca_model = LogisticRegression(class_weight='balanced', random_state=42)
+            pca_model.fit(X_test_pca, y_test)
+            mesh = boundary_mesh(
+                pca_model.coef_, pca_model.intercept_,
+                (X_test_pca[:, 0].min() - 1, X_test_pca[:, 0].max() + 1),
+                (X_test_pca[:, 1].min() - 1, X_test_pca[:, 1].max() + 1),
+                max_cells=args.boundary_max_cells, refine=args.boundary_refine)
+            # Only the background points are downsampled
+            points, labels = report.downsample(X_test_pca, y_test)
+            report.render(
+                'logistic_regression_boundary', figures.decision_boundary,
+                mesh=mesh, points=points, labels=labels,
+                detected=X_test_pca[np.where((y_pred == 1) & (y_test == 1))[0]])
+            outputs.append(projection_path)
+        span.rows = len(y_test)
+
+    # Wait for the figure workers
+    with tracer.span('plot_wait'):
+        report.close()
+    print(f"hacker_plots: rendered {len(report.rendered)}, unchanged {len(report.skipped)}")
+    return outputs
+
+
+# Spending analysis
+
+def load_spending(pipeline, tracer):
+    return _convert(pipeline, tracer, 'spending')
+
+
+def _spending_frame(pipeline, columns=None):
+    """The logs with ``VIP_Status_Binary``; ``columns`` limits the raw
+    columns read."""
+    from .logs import read_logs
+
+    df = read_logs(pipeline.logs('spending'), columns=columns)
+    df['VIP_Status_Binary'] = (df['VIP Status'] == 'Yes').astype(np.int32)
+    return df
+
+
+def _model_frame(pipeline, tracer):
+    with tracer.span('read_logs') as span:
+        raw = [feature for feature in SPENDING_FEATURES if feature != 'VIP_Status_Binary']
+        model_df = _spending_frame(pipeline, raw + ['VIP Status', SPENDING_TARGET])
+        span.rows = len(model_df)
+    return model_df
+
+
+def explore(pipeline, tracer):
+    from .logs import read_logs
+
+    with tracer.span('read_logs') as span:
+        df = read_logs(pipeline.logs('spending'))
+        span.rows = len(df)
+
+    with tracer.span('explore') as span:
+        print(f"\nDataset shape: {df.shape}")
+        print("\nFirst few rows of the dataset:")
+        print(df.head())
+        missing_values = df.isnull().sum()
+        print("\nMissing values in each column:")
+        print(missing_values[missing_values > 0] if any(
+            missing_values > 0) else "No missing values")
+        print("\nBasic statistics:")
+        print(df.describe())
+        describe_path = pipeline.output('spending', 'describe.csv')
+        df.describe().to_csv(describe_path)
+        span.rows = len(df)
+
+    with tracer.span('encode') as span:
+        df['VIP_Status_Binary'] = (df['VIP Status'] == 'Yes').astype(np.int32)
+        print(f"Number of players with zero spending: "
+              f"{int((df[SPENDING_TARGET] == 0).sum())}")
+        span.rows = len(df)
+
+    with tracer.span('correlate') as span:
+        numeric_cols = df.select_dtypes(include='number').columns
+        correlations = df[numeric_cols].corr()[SPENDING_TARGET].sort_values(ascending=False)
+        print("\nCorrelations with Money Spent:")
+        print(correlations)
+        correlations_path = pipeline.output('spending', 'correlations.csv')
+        correlations.to_csv(correlations_path)
+        span.rows = len(df)
+    return [describe_path, correlations_path]
+
+
+def _split_cache(pipeline, model_df):
+    from .splits import SplitCache, dataset_fingerprint
+
+    # On disk, so the refit of the best model gets the indices of its sweep
+    cache_dir = pipeline.args.split_cache_dir or pipeline.cache_dir / 'splits'
+    return SplitCache(cache_dir, fingerprint=dataset_fingerprint(model_df))
+
+
+def sweep(pipeline, tracer):
+    from .parallel import ParallelGramSweep
+    from .result_cache import ResultCache, evaluate_cached
+    from .sweep import GramSweep, MAX_POINTS_PER_MODEL, PredictionStore, feature_subsets
+
+    args = pipeline.args
+    model_df = _model_frame(pipeline, tracer)
+    with tracer.span('sweep_setup') as span:
+        X, y = model_df[SPENDING_FEATURES], model_df[SPENDING_TARGET]
+        split_cache = _split_cache(pipeline, model_df)
+        if args.workers > 1:
+            gram_sweep = ParallelGramSweep(X, y, SPENDING_FEATURES, workers=args.workers,
+                                           split_cache=split_cache)
+        else:
+            gram_sweep = GramSweep(X, y, SPENDING_FEATURES, split_cache=split_cache)
+        predictions = PredictionStore(gram_sweep.splits)
+
+        # Reruns only solve models whose feature columns, target, split or
+        # estimator setup changed since the cached run
+        result_cache = None
+        if args.result_cache_dir:
+            result_cache = ResultCache(args.result_cache_dir, model_df, SPENDING_FEATURES,
+                                       SPENDING_TARGET, max_points=MAX_POINTS_PER_MODEL,
+                                       max_entries=args.result_cache_max_entries)
+        span.rows = len(model_df)
+
+    max_features = min(args.max_features, len(SPENDING_FEATURES))
+    print(f"Generating combinations of 1 to {max_features} features...")
+    with tracer.span('evaluate_subsets') as span:
+        all_results = []
+        for size in range(1, max_features + 1):
+            subsets = feature_subsets(len(SPENDING_FEATURES), size)
+            if result_cache is not None:
+                per_split = evaluate_cached(gram_sweep, subsets, result_cache)
+            else:
+                per_split = gram_sweep.evaluate(subsets)
+            size_results = gram_sweep.results(subsets, per_split, predictions)
+            all_results.extend(size_results)
+            best_result = max(size_results, key=lambda x: x['r2'])
+            print(f"Evaluated {len(subsets)} combinations of {size} features")
+            print(f"Best R² for {size} features: {best_result['r2']:.4f} using "
+                  f"{best_result['features']} with {best_result['train_size']} split\n")
+        if args.workers > 1:
+            gram_sweep.close()
+        if result_cache is not None:
+            result_cache.save()
+            print(f"Result cache: reused {result_cache.hits} models, "
+                  f"solved {result_cache.misses}")
+        span.rows = len(model_df)
+        span.fields['models'] = len(all_results)
+
+    # Each model keeps its position in all_results, where the stored
+    # predictions are keyed
+    with tracer.span('rank') as span:
+        sorted_keys = sorted(range(len(all_results)),
+                             key=lambda k: all_results[k]['r2'], reverse=True)
+        span.rows = len(all_results)
+    print("\nTop 10 Models by R² Score:")
+    for i, k in enumerate(sorted_keys[:10]):
+        result = all_results[k]
+        print(f"{i+1}. Features: {result['features']}")
+        print(f"   Train-Test Split: {result['train_size']}")
+        print(f"   R²: {result['r2']:.4f}, RMSE: {result['rmse']:.2f}")
+        print()
+    path = pipeline.artifact('sweep', 'sweep.joblib')
+    joblib.dump({'results': all_results, 'keys': sorted_keys,
+                 'predictions': predictions}, path)
+    return [path]
+
+
+def _sweep(pipeline):
+    return joblib.load(pipeline.artifact('sweep', 'sweep.joblib'))
+
+
+def export(pipeline, tracer):
+    from .export import write_results
+    from .sweep import MAX_POINTS_PER_MODEL
+
+    args = pipeline.args
+    swept = _sweep(pipeline)
+    all_results, sorted_keys = swept['results'], swept['keys']
+    best = all_results[sorted_keys[0]]
+    generated_date = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+    model_df = _model_frame(pipeline, tracer)
+
+    with tracer.span('write_results') as span:
+        # One row per sampled test prediction of every model, streamed in
+        # model_id order a row group at a time
+        results_path = pipeline.output('spending', 'model_results.parquet')
+        writer = write_results(
+            results_path, all_results, sorted_keys, swept['predictions'],
+            model_df[SPENDING_FEATURES].to_numpy(), SPENDING_FEATURES,
+            row_group_size=args.row_group_size, compression=args.compression)
+
+        metadata_path = pipeline.output('spending', 'model_metadata.parquet')
+        pd.DataFrame([{
+            'target': SPENDING_TARGET,
+            'total_models': len(all_results),
+            'best_r2': best['r2'],
+            'best_features': ','.join(best['features']),
+            'best_split': best['train_size'],
+            'generated_date': generated_date,
+            'max_points_per_model': MAX_POINTS_PER_MODEL
+        }]).to_parquet(metadata_path, index=False)
+
+        # The top 10 models alone, for quick access
+        top_models_path = pipeline.output('spending', 'top_models.json')
+        top_models_path.write_text(json.dumps({
+            "target": SPENDING_TARGET,
+            "top_models": [all_results[k] for k in sorted_keys[:10]],
+            "metadata": {
+                "total_models": len(all_results),
+                "best_r2": best['r2'],
+                "best_features": best['features'],
+                "best_split": best['train_size'],
+                "generated_date": generated_date
+            }
+        }, indent=2))
+        span.rows = writer.rows_written
+    print(f"Wrote {writer.rows_written} prediction rows for {len(all_results)} models "
+          f"in {writer.row_groups} row groups")
+    print(f"Results saved to {results_path}")
+    print(f"Metadata saved to {metadata_path}")
+    print(f"Top 10 models saved to {top_models_path}")
+    return [results_path, metadata_path, top_models_path]
+
+
+def refit(pipeline, tracer):
+    from sklearn.linear_model import LinearRegression
+    from sklearn.preprocessing import StandardScaler
+
+    swept = _sweep(pipeline)
+    best = swept['results'][swept['keys'][0]]
+    print("Best Model Details:")
+    print(f"Features: {best['features']}")
+    print(f"Train-Test Split: {best['train_size']}")
+    print(f"R²: {best['r2']:.4f}")
+    print(f"RMSE: {best['rmse']:.2f}")
+    print("\nCoefficients:")
+    for feature, coef in best['coefficients'].items():
+        print(f"{feature}: {coef:.4f}")
+    print(f"Intercept: {best['intercept']:.4f}")
+
+    # The same cached indices the sweep used
+    model_df = _model_frame(pipeline, tracer)
+    X, y = model_df[best['features']], model_df[SPENDING_TARGET]
+    with tracer.span('split') as span:
+        test_size = float(best['train_size'].split('-')[1]) / 100
+        train_idx, test_idx = _split_cache(pipeline, model_df).get(len(model_df), test_size)
+        X_train, X_test = X.iloc[train_idx], X.iloc[test_idx]
+        span.rows = len(X)
+
+    with tracer.span('scale') as span:
+        scaler = StandardScaler()
+        X_train_scaled = scaler.fit_transform(X_train)
+        X_test_scaled = scaler.transform(X_test)
+        span.rows = len(X)
+
+    with tracer.span('fit') as span:
+        model = LinearRegression()
+        model.fit(X_train_scaled, y.iloc[train_idx])
+        span.rows = len(X_train)
+
+    with tracer.span('predict') as span:
+        y_pred = model.predict(X_test_scaled)
+        span.rows = len(X_test)
+
+    path = pipeline.artifact('refit', 'refit.npz')
+    np.savez(path, actual=y.iloc[test_idx].to_numpy(), predicted=y_pred)
+    return [path]
+
+
+def spending_plots(pipeline, tracer):
+    from . import figures
+
+    report = Report.from_args(pipeline.args, pipeline.output_dir / 'spending',
+                              style='ggplot', seaborn_style='whitegrid')
+    key_features = ['Hours Played', 'Quest Exploit Score', 'Criminal Score',
+                    'Missions Completed']
+    correlations = pd.read_csv(pipeline.output('spending', 'correlations.csv'),
+                               index_col=0).iloc[:, 0]
+    top_corr_features = list(correlations.index[:10])
+    with tracer.span('read_logs') as span:
+        df = _spending_frame(pipeline, [
+            column for column in dict.fromkeys(
+                key_features + top_corr_features + [SPENDING_TARGET, 'VIP Status'])
+            if column != 'VIP_Status_Binary'])
+        span.rows = len(df)
+    spent = df[SPENDING_TARGET].to_numpy(dtype=np.float64)
+    swept = _sweep(pipeline)
+    sorted_results = [swept['results'][k] for k in swept['keys']]
+    with np.load(pipeline.artifact('refit', 'refit.npz')) as refitted:
+        y_test, y_pred = refitted['actual'], refitted['predicted']
+
+    with tracer.span('plot') as span:
+        if 'money_spent_distribution' in report:
+            # Binned here so only the counts are sent to the figure worker
+            counts, edges = np.histogram(spent,
+                                         bins=np.histogram_bin_edges(spent, bins='auto'))
+            # The KDE is fitted on a sample of at most --max-plot-points values
+            report.render('money_spent_distribution', figures.histogram,
+                          edges=edges, counts=counts, sample=report.downsample(spent),
+                          title='Distribution of Money Spent', xlabel='Money Spent ($)')
+
+        if 'correlation_heatmap' in report:
+            correlation_matrix = df[top_corr_features].corr()
+            report.render('correlation_heatmap', figures.correlation_heatmap,
+                          matrix=correlation_matrix.to_numpy(),
+                          labels=list(correlation_matrix.columns))
+
+        if 'feature_scatter_plots' in report:
+            panels = [(feature, *report.downsample(df[feature].to_numpy(), spent))
+                      for feature in key_features]
+            report.render('feature_scatter_plots', figures.scatter_grid,
+                          panels=panels, target=SPENDING_TARGET)
+
+        if 'top_models_r2' in report:
+            top_20 = sorted_results[:20]
+            report.render(
+                'top_models_r2', figures.top_models_r2,
+                names=[f"Model {i+1}" for i in range(len(top_20))],
+                r2_scores=[model['r2'] for model in top_20],
+                notes=[f"{model['train_size']} split\n{len(model['features'])} features"
+                       for model in top_20])
+
+        if 'feature_importance' in report:
+            # How often each feature appears among the top 50 models
+            feature_counts = {}
+            for result in sorted_results[:50]:
+                for feature in result['features']:
+                    feature_counts[feature] = feature_counts.get(feature, 0) + 1
+            sorted_features = sorted(feature_counts.items(), key=lambda x: x[1],
+                                     reverse=True)
+            report.render('feature_importance', figures.feature_frequency,
+                          features=[item[0] for item in sorted_features],
+                          frequency=[item[1] for item in sorted_features])
+
+        if 'actual_vs_predicted' in report:
+            actual, predicted = report.downsample(y_test, y_pred)
+            report.render('actual_vs_predicted', figures.actual_vs_predicted,
+                          actual=actual, predicted=predicted,
+                          low=y_test.min(), high=y_test.max())
+        if 'residual_plot' in report:
+            predicted, residuals = report.downsample(y_pred, y_test - y_pred)
+            report.render('residual_plot', figures.residuals,
+                          predicted=predicted, residuals=residuals)
+        span.rows = len(df)
+
+    # Wait for the figure workers
+    with tracer.span('plot_wait'):
+        report.close()
+    print(f"spending_plots: rendered {len(report.rendered)}, unchanged {len(report.skipped)}")
+    return [report.output_dir / f"{name}.png" for name in SPENDING_FIGURES if name in report]
+
+
+RUNNERS = {
+    'load': load, 'features': features, 'train': train, 'evaluate': evaluate,
+    'hackers': hackers, 'hacker_plots': hacker_plots,
+    'load_spending': load_spending, 'explore': explore,
+    'sweep': sweep, 'export': export, 'refit': refit, 'spending_plots': spending_plots,
+}
+
+
+def add_hacker_arguments(parser):
+    """Add the options of the hacker detection stages to ``parser``."""
+    parser.add_argument('--quantiles', choices=['exact', 'sketch'], default='exact',
+                        help="compute the quantile thresholds exactly or from streamed "
+                             "quantile sketches")
+    parser.add_argument('--chunksize', type=int, default=100_000,
+                        help="rows per chunk when streaming the logs for the sketches")
+    parser.add_argument('--label-quantile', type=float, default=0.998,
+                        help="suspicion score quantile above which a player is "
+                             "labelled a hacker (default: 0.998)")
+    add_model_selection_arguments(parser)
+    parser.add_argument('--projection', choices=PROJECTION_METHODS, default='auto',
+                        help="PCA path for the boundary plot: exact SVD, randomized SVD "
+                             "on a sample or incremental PCA ('auto' picks by size)")
+    parser.add_argument('--boundary-max-cells', type=int, default=DEFAULT_MAX_CELLS,
+                        help="most grid points of the decision-boundary mesh")
+    parser.add_argument('--boundary-refine', type=int, default=1,
+                        help="evaluate the mesh this many times finer near the 0.5 contour")
+
+
+def add_spending_arguments(parser):
+    """Add the options of the spending analysis stages to ``parser``."""
+    parser.add_argument('--max-features', type=int, default=4,
+                        help="largest feature combination to evaluate (default: 4)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="worker processes for the feature sweep (default: 1, serial)")
+    parser.add_argument('--split-cache-dir',
+                        help="directory to persist train/test split indices in "
+                             "(default: <cache-dir>/splits)")
+    parser.add_argument('--result-cache-dir',
+                        help="directory of cached model results to reuse across runs")
+    parser.add_argument('--result-cache-max-entries', type=int,
+                        help="models kept in --result-cache-dir, this run's first "
+                             "(default: no limit)")
+    parser.add_argument('--row-group-size', type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help="target rows per row group in model_results.parquet")
+    parser.add_argument('--compression', default=DEFAULT_COMPRESSION,
+                        choices=['snappy', 'gzip', 'brotli', 'zstd', 'lz4', 'none'],
+                        help="Parquet compression codec for model_results.parquet")
+
+
+def main(argv=None, **defaults):
+    """``python -m neoverse run``; ``defaults`` replace the defaults of its
+    options, e.g. ``stages`` or ``input_dir``."""
+    parser = argparse.ArgumentParser(
+        prog='python -m neoverse run',
+        description="Run selected stages of the Neoverse analyses, skipping "
+                    "stages whose cached outputs are up to date.")
+    parser.add_argument('--input-dir', default='.',
+                        help="directory of the log CSVs (default: %(default)s)")
+    parser.add_argument('--hacker-logs', default='perfect_prediction_neoverse_logs.csv',
+                        help="log CSV of the hacker detector, relative to --input-dir")
+    parser.add_argument('--spending-logs', default='neoverse_logs_with_edge_cases.csv',
+                        help="log CSV of the spending analysis, relative to --input-dir")
+    parser.add_argument('--output-dir', default='.',
+                        help="where the results go (default: %(default)s)")
+    parser.add_argument('--cache-dir',
+                        help="intermediate artifacts (default: <output-dir>/.cache)")
+    parser.add_argument('--stages', type=parse_stages, default=list(STAGES),
+                        help=f"'all' or a comma-separated list of {', '.join(STAGES)}; "
+                             f"dependencies are added (default: "
+                             f"{','.join(defaults.get('stages', ['all']))})")
+    parser.add_argument('--force', type=parse_stages, nargs='?', const=list(STAGES),
+                        default=[], metavar='STAGES',
+                        help="rerun these stages (default: all) even if up to date")
+    parser.add_argument('--jobs', type=int, default=min(4, os.cpu_count() or 1),
+                        help="stages run concurrently; 1 runs them in this process")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="print which stages would run and exit")
+    add_trace_arguments(parser)
+    add_hacker_arguments(parser.add_argument_group('hacker detection'))
+    add_spending_arguments(parser.add_argument_group('spending analysis'))
+    # Both analyses draw a feature_importance figure; the name selects both
+    add_plots_argument(parser.add_argument_group('figures'),
+                       dict.fromkeys(HACKER_FIGURES + SPENDING_FIGURES))
+    parser.set_defaults(**defaults)
+    args = parser.parse_args(argv)
+
+    pipeline = Pipeline.from_args(args)
+    force = set(args.force)
+    if args.no_plot_cache:
+        force.update(PLOT_STAGES)
+    if args.dry_run:
+        stages, _, to_run = pipeline.plan(args.stages, force)
+        for stage in stages:
+            print(f"{stage}: {'run' if stage in to_run else 'up to date'}")
+        return
+    start = time.perf_counter()
+    ran = pipeline.run(args.stages, force)
+    print(f"Ran {len(ran)} of {len(required_stages(args.stages))} stages "
+          f"in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""2-D projection of the scaled hacker features for the boundary plot.
+
+``PCA.fit_transform`` on the whole test set runs a full SVD and holds every
+intermediate in float64, which is the largest memory spike of ``neo.py`` on
+production-size data. ``fit_projection`` keeps that path for small inputs
+and switches on large ones to either a randomized SVD fitted on a bounded
+random sample or an ``IncrementalPCA`` fed chunk by chunk; ``project`` then
+transforms in chunks into a preallocated float32 array.
+
+``cached_projection`` stores the coordinates in an ``.npz`` next to the model
+artifact, together with the fitted components and any per-row extras (labels,
+player IDs), keyed by a hash of the input matrix. Dashboards can read the
+file directly, and reruns with an unchanged test set skip the projection.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+from sklearn.decomposition import PCA, IncrementalPCA
+
+EXACT_MAX_ROWS = 50_000
+DEFAULT_SAMPLE_ROWS = 50_000
+DEFAULT_CHUNK_ROWS = 65_536
+METHODS = ('auto', 'exact', 'randomized', 'incremental')
+
+
+def fit_projection(X, n_components=2, method='auto', sample_rows=DEFAULT_SAMPLE_ROWS,
+                   chunk_rows=DEFAULT_CHUNK_ROWS, random_state=42):
+    """Fit a PCA-style projection of ``X``.
+
+    ``auto`` is ``exact`` up to ``EXACT_MAX_ROWS`` rows and ``randomized``
+    above. ``randomized`` fits on at most ``sample_rows`` random rows;
+    ``incremental`` sees every row, ``chunk_rows`` at a time.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown projection method {method!r}; choose from {METHODS}")
+    if method == 'auto':
+        method = 'exact' if len(X) <= EXACT_MAX_ROWS else 'randomized'
+
+    if method == 'exact':
+        return PCA(n_components=n_components).fit(X)
+    if method == 'randomized':
+        if len(X) > sample_rows:
+            rows = np.sort(np.random.default_rng(random_state).choice(
+                len(X), sample_rows, replace=False))
+            X = X[rows]
+        return PCA(n_components=n_components, svd_solver='randomized',
+                   random_state=random_state).fit(X)
+    pca = IncrementalPCA(n_components=n_components)
+    for start in range(0, len(X), chunk_rows):
+        chunk = X[start:start + chunk_rows]
+        # partial_fit needs at least n_components rows per call
+        if len(chunk) >= n_components:
+            pca.partial_fit(chunk)
+    return pca
+
+
+def project(pca, X, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """``pca.transform(X)`` computed in chunks, as float32."""
+    out = np.empty((len(X), pca.n_components_), dtype=np.float32)
+    for start in range(0, len(X), chunk_rows):
+        out[start:start + chunk_rows] = pca.transform(X[start:start + chunk_rows])
+    return out
+
+
+def projection_key(X, n_components, method, sample_rows):
+    digest = hashlib.blake2b(digest_size=16)
+    X = np.ascontiguousarray(X)
+    digest.update(f"{X.dtype}{X.shape}|{n_components}|{method}|{sample_rows}".encode())
+    digest.update(X.tobytes())
+    return digest.hexdigest()
+
+
+def cached_projection(path, X, n_components=2, method='auto',
+                      sample_rows=DEFAULT_SAMPLE_ROWS, extras=None):
+    """2-D coordinates of ``X``, read from ``path`` when it was written for
+    the same input, otherwise computed and saved there with ``extras``."""
+    path = Path(path)
+    key = projection_key(X, n_components, method, sample_rows)
+    if path.exists():
+        with np.load(path, allow_pickle=False) as cached:
+            if str(cached['key']) == key:
+                return cached['coordinates']
+
+    pca = fit_projection(X, n_components, method, sample_rows)
+    coordinates = project(pca, X)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp.npz')
+    np.savez(tmp_path, key=np.array(key), coordinates=coordinates,
+             components=pca.components_, mean=pca.mean_,
+             explained_variance_ratio=pca.explained_variance_ratio_,
+             **(extras or {}))
+    tmp_path.replace(path)
+    return coordinates
@@ -0,0 +1,128 @@
+"""Top-K selection of suspected hackers.
+
+``top_k`` returns the positions of the ``k`` highest scores, best first. It
+finds them with a partition instead of sorting every score, so it costs
+O(n + k log k) rather than O(n log n). Ties go to the smaller key, which is
+the position unless keys are given, so the result does not depend on how the
+rows are ordered or split.
+
+``TopK`` keeps the running top ``k`` of a stream of scored chunks, keyed by
+Player ID. Each player counts once, with their best score. Two ``TopK``
+objects, for example from workers scoring different shards of an archive,
+``merge`` into the top ``k`` of their union. Shards can therefore be
+reduced in any order and give the same players as one pass over everything.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _take(values, positions):
+    # Works for arrays and Series (including categoricals) alike
+    return np.asarray(values.take(positions) if hasattr(values, 'take')
+                      else np.take(values, positions))
+
+
+def _ranked(scores, keys):
+    """Indices ordering rows by descending score, then ascending key."""
+    return np.lexsort((keys, -scores))
+
+
+def _cut(scores, k):
+    """Positions of every score tied with or above the ``k``-th highest."""
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if len(scores) <= k:
+        return np.arange(len(scores))
+    kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+    return np.flatnonzero(scores >= kth)
+
+
+def top_k(scores, k, keys=None):
+    """Positions of the ``k`` highest ``scores``, highest first."""
+    scores = np.asarray(scores)
+    positions = _cut(scores, k)
+    keys = positions if keys is None else _take(keys, positions)
+    return positions[_ranked(scores[positions], keys)][:k]
+
+
+def _best_distinct(scores, keys, k):
+    """Indices of the ``k`` best distinct keys, best first."""
+    def distinct(pool):
+        order = pool[_ranked(scores[pool], keys[pool])]
+        _, first = np.unique(keys[order], return_index=True)
+        return order[np.sort(first)]
+
+    pool = _cut(scores, k)
+    best = distinct(pool)
+    if len(best) < k and len(pool) < len(scores):
+        # Keys repeat among the best rows, so players further down count too
+        best = distinct(np.arange(len(scores)))
+    return best[:k]
+
+
+class TopK:
+    """The ``k`` highest-scoring distinct keys seen so far, best first.
+
+    ``scores`` and ``keys`` are arrays; ``rows``, when rows are added with the
+    scores, is a DataFrame aligned with them.
+    """
+
+    def __init__(self, k):
+        self.k = k
+        self.scores = np.empty(0)
+        self.keys = np.empty(0, dtype=object)
+        self.rows = None
+
+    def __len__(self):
+        return len(self.scores)
+
+    @property
+    def threshold(self):
+        """Score a new row has to reach, or ``-inf`` while filling."""
+        return self.scores[-1] if len(self.scores) >= self.k else -np.inf
+
+    def candidates(self, scores, keys):
+        """Positions in ``scores`` that can still enter the top ``k``.
+
+        ``keys`` holds the key of every row (an array or a Series).
+        """
+        scores = np.asarray(scores)
+        positions = np.flatnonzero(scores >= self.threshold)
+        chosen = _best_distinct(scores[positions], _take(keys, positions), self.k)
+        return positions[chosen]
+
+    def add(self, scores, keys, rows=None):
+        """Fold rows into the top ``k``, usually the ``candidates`` of a chunk."""
+        scores = np.concatenate([self.scores, np.asarray(scores, dtype=float)])
+        keys = np.concatenate([self.keys, np.asarray(keys, dtype=object)])
+        keep = _best_distinct(scores, keys, self.k)
+        self.scores, self.keys = scores[keep], keys[keep]
+        if rows is not None or self.rows is not None:
+            rows = pd.concat([frame for frame in (self.rows, rows) if frame is not None],
+                             ignore_index=True)
+            self.rows = rows.iloc[keep].reset_index(drop=True)
+        return self
+
+    def update(self, scores, keys, rows=None):
+        """Fold a whole chunk in; returns the positions that were candidates."""
+        positions = self.candidates(scores, keys)
+        self.add(np.asarray(scores)[positions], _take(keys, positions),
+                 None if rows is None else rows.iloc[positions])
+        return positions
+
+    def merge(self, other):
+        """Fold in another ``TopK``, e.g. one from another shard."""
+        return self.add(other.scores, other.keys, other.rows)
+
+    def frame(self, key='Player ID', score='Hacker_Probability', rank='Hacker_Rank'):
+        """The kept rows as a DataFrame, with a 1-based ``rank`` column.
+
+        Without rows, the frame has the ``key`` and ``score`` columns only.
+        """
+        if self.rows is not None:
+            frame = self.rows.copy()
+        else:
+            frame = pd.DataFrame({key: self.keys, score: self.scores})
+        frame[rank] = range(1, len(frame) + 1)
+        return frame
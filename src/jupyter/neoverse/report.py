@@ -0,0 +1,189 @@
+"""On-demand, out-of-process figures for the analysis scripts.
+
+Both scripts take a ``--plots`` selection: ``all`` (the default), ``none`` or
+a comma-separated list of figure names. Each figure block checks
+``name in report`` before doing any plotting work, reduces its data to what
+the figure shows (``downsample`` caps scatter inputs at ``--max-plot-points``)
+and hands it to ``Report.render`` together with a renderer from
+``neoverse.figures``.
+
+Rendering happens in a pool of ``--plot-workers`` processes, so figures are
+drawn concurrently with each other and with the rest of the script; only the
+workers import matplotlib and seaborn, and every figure is closed once saved.
+A figure whose renderer, style and inputs hash to the same key as in the last
+run, and whose PNG still exists, is not rendered again. Keys are kept in
+``figure_cache.json`` next to the PNGs. ``close`` waits for the pending
+figures and raises the first rendering error.
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import pickle
+from pathlib import Path
+
+import numpy as np
+
+from . import figures
+from .parallel import process_pool
+
+DEFAULT_MAX_POINTS = 20_000
+MANIFEST_NAME = 'figure_cache.json'
+
+
+def parse_plots(value, names):
+    """Figure names selected by a ``--plots`` value."""
+    value = value.strip()
+    if value == 'all':
+        return frozenset(names)
+    if value in ('none', ''):
+        return frozenset()
+    selected = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in selected if name not in names]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown plots {unknown}; choose from {', '.join(names)}")
+    return frozenset(selected)
+
+
+def add_plots_argument(parser, names):
+    """Add ``--plots`` and the rendering options to ``parser`` for the
+    figures in ``names``."""
+    names = list(names)
+    parser.add_argument(
+        '--plots', default=frozenset(names), type=lambda value: parse_plots(value, names),
+        help=f"figures to render: 'all' (default), 'none' or a comma-separated "
+             f"list of {', '.join(names)}")
+    parser.add_argument('--plot-workers', type=int, default=min(4, os.cpu_count() or 1),
+                        help="processes rendering figures; 0 renders in this process")
+    parser.add_argument('--max-plot-points', type=int, default=DEFAULT_MAX_POINTS,
+                        help="most points drawn by a scatter plot")
+    parser.add_argument('--no-plot-cache', action='store_true',
+                        help="render selected figures even if their inputs are unchanged")
+
+
+def figure_key(renderer, style, seaborn_style, data):
+    """Hash of everything a rendered figure depends on."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        digest.update(inspect.getsource(renderer).encode())
+    except (OSError, TypeError):
+        digest.update(renderer.__qualname__.encode())
+    digest.update(pickle.dumps((style, seaborn_style)))
+    for name in sorted(data):
+        digest.update(name.encode())
+        _hash_value(digest, data[name])
+    return digest.hexdigest()
+
+
+def _hash_value(digest, value):
+    if isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _hash_value(digest, item)
+    else:
+        digest.update(pickle.dumps(value))
+
+
+def _render(renderer, path, style, seaborn_style, data):
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    with matplotlib.rc_context():
+        if style:
+            plt.style.use(style)
+        if seaborn_style:
+            import seaborn as sns
+            sns.set(style=seaborn_style)
+        try:
+            renderer(plt, **data)
+            plt.savefig(path)
+        finally:
+            plt.close('all')
+    return str(path)
+
+
+class Report:
+    """The selected figures and the jobs rendering them into ``output_dir``.
+
+    ``style`` is a matplotlib style and ``seaborn_style`` a seaborn theme,
+    applied to every figure.
+    """
+
+    def __init__(self, selected, output_dir, style=None, seaborn_style=None,
+                 workers=0, max_points=DEFAULT_MAX_POINTS, cache=True):
+        self.selected = frozenset(selected)
+        self.output_dir = Path(output_dir)
+        self.style = style
+        self.seaborn_style = seaborn_style
+        self.workers = workers
+        self.max_points = max_points
+        self.cache = cache
+        self.rendered = []
+        self.skipped = []
+        self._manifest_path = self.output_dir / MANIFEST_NAME
+        self._manifest = self._load_manifest()
+        self._pending = []
+        self._pool = None
+
+    @classmethod
+    def from_args(cls, args, output_dir, style=None, seaborn_style=None):
+        return cls(args.plots, output_dir, style, seaborn_style,
+                   workers=args.plot_workers, max_points=args.max_plot_points,
+                   cache=not args.no_plot_cache)
+
+    def __contains__(self, name):
+        return name in self.selected
+
+    def __bool__(self):
+        return bool(self.selected)
+
+    def _load_manifest(self):
+        try:
+            return json.loads(self._manifest_path.read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def downsample(self, *arrays, seed=0):
+        """``figures.downsample`` with this report's point budget."""
+        return figures.downsample(self.max_points, *arrays, seed=seed)
+
+    def render(self, name, renderer, **data):
+        """Render ``renderer(plt, **data)`` to ``<output_dir>/<name>.png``
+        unless an identical figure is already there."""
+        path = self.output_dir / f"{name}.png"
+        key = figure_key(renderer, self.style, self.seaborn_style, data)
+        if self.cache and self._manifest.get(path.name) == key and path.exists():
+            self.skipped.append(name)
+            return
+        job = (renderer, path, self.style, self.seaborn_style, data)
+        if self.workers > 0:
+            if self._pool is None:
+                self._pool = process_pool(self.workers)
+            future = self._pool.submit(_render, *job)
+        else:
+            _render(*job)
+            future = None
+        self._pending.append((name, path, key, future))
+
+    def close(self):
+        """Wait for every pending figure and record it in the cache."""
+        try:
+            for name, path, key, future in self._pending:
+                if future is not None:
+                    future.result()
+                self._manifest[path.name] = key
+                self.rendered.append(name)
+        finally:
+            self._pending = []
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+            if self.rendered:
+                self._manifest_path.write_text(json.dumps(self._manifest, indent=2))
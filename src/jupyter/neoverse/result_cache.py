@@ -0,0 +1,169 @@
+"""Content-addressed cache of spending sweep results.
+
+A subset model is determined by the values of its feature columns, the target
+column, the train/test split and the estimator setup, so its key is a hash of
+exactly those: per-column content digests of the subset's features and the
+target, the row count, test size and seed of the split, and the estimator
+config. A rerun after a feature is added to ``potential_features`` therefore
+reuses every model that does not use the new feature, while changing a
+column's values only invalidates the models that use it. Appending rows
+changes every column digest and the split permutation itself, so it
+recomputes everything.
+
+Cached entries keep the model's coefficients, metrics and sampled test
+predictions, which is everything the export stage reads. They are stored as
+``index.parquet`` (one row per model) next to ``predictions.npy`` (the
+concatenated float32 prediction vectors).
+"""
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ESTIMATOR_CONFIG = 'StandardScaler+LinearRegression'
+
+
+def column_digest(series):
+    """Content digest of one column's values (the index is ignored)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(series.dtype).encode())
+    digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Sweep results keyed by the content of the inputs they depend on.
+
+    ``get`` returns a cached entry or ``None``; ``put`` records a freshly
+    solved one. ``save`` merges the entries solved by this run into the stored
+    ones, so models of another feature set or option survive a run without
+    them. Entries used by the run are written first; with ``max_entries``
+    the rest are kept in their stored order up to that many entries in total.
+    """
+
+    def __init__(self, cache_dir, df, feature_names, target, random_state=42,
+                 max_points=None, estimator=ESTIMATOR_CONFIG, max_entries=None):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max_entries
+        self.feature_names = list(feature_names)
+        self._digests = {name: column_digest(df[name]) for name in self.feature_names}
+        self._prefix = '|'.join([estimator, column_digest(df[target]),
+                                 str(len(df)), str(random_state), str(max_points)])
+        self.hits = 0
+        self.misses = 0
+        self._stored = self._load()
+        self._used = {}
+
+    def _load(self):
+        index_path = self.cache_dir / 'index.parquet'
+        predictions_path = self.cache_dir / 'predictions.npy'
+        if not (index_path.exists() and predictions_path.exists()):
+            return {}
+        index = pq.read_table(index_path).to_pydict()
+        predicted = np.load(predictions_path, mmap_mode='r')
+        stored = {}
+        for row, key in enumerate(index['key']):
+            start, length = index['offset'][row], index['length'][row]
+            stored[key] = {
+                'coef': np.array(index['coef'][row]),
+                'intercept': index['intercept'][row],
+                'mse': index['mse'][row],
+                'rmse': index['rmse'][row],
+                'r2': index['r2'][row],
+                'predicted': predicted[start:start + length],
+            }
+        return stored
+
+    def key(self, subset, test_size):
+        """Cache key of the model on feature indices ``subset`` and a split."""
+        parts = [self._prefix, f"{test_size:g}"]
+        parts += [self._digests[self.feature_names[i]] for i in subset]
+        return hashlib.blake2b('|'.join(parts).encode(), digest_size=16).hexdigest()
+
+    def get(self, key):
+        entry = self._stored.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._used[key] = entry
+        return entry
+
+    def put(self, key, entry):
+        self._used[key] = entry
+
+    def save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        merged = {**self._used, **{key: entry for key, entry in self._stored.items()
+                                   if key not in self._used}}
+        keys = list(merged)[:self.max_entries]
+        entries = [merged[key] for key in keys]
+        lengths = np.array([len(entry['predicted']) for entry in entries], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+        index = pa.table({
+            'key': keys,
+            'coef': [np.asarray(entry['coef'], dtype=np.float64).tolist() for entry in entries],
+            'intercept': [float(entry['intercept']) for entry in entries],
+            'mse': [float(entry['mse']) for entry in entries],
+            'rmse': [float(entry['rmse']) for entry in entries],
+            'r2': [float(entry['r2']) for entry in entries],
+            'offset': offsets,
+            'length': lengths,
+        })
+        if entries:
+            predicted = np.concatenate([entry['predicted'] for entry in entries])
+        else:
+            predicted = np.empty(0, dtype=np.float32)
+
+        # Write beside the old files and swap them in, since cached entries
+        # may still be views into the old predictions.npy
+        tmp_predictions = self.cache_dir / 'predictions.tmp.npy'
+        tmp_index = self.cache_dir / 'index.tmp.parquet'
+        np.save(tmp_predictions, predicted.astype(np.float32))
+        pq.write_table(index, tmp_index)
+        os.replace(tmp_predictions, self.cache_dir / 'predictions.npy')
+        os.replace(tmp_index, self.cache_dir / 'index.parquet')
+
+
+def evaluate_cached(sweep, subsets, cache):
+    """``sweep.evaluate(subsets)``, reusing cached models where possible.
+
+    Only subsets missing from the cache on at least one split are solved;
+    those results are added to the cache. Returns the same per-split arrays
+    as ``GramSweep.evaluate``.
+    """
+    keys = [[cache.key(subset, split.test_size) for subset in subsets]
+            for split in sweep.splits]
+    entries = [[cache.get(key) for key in split_keys] for split_keys in keys]
+    is_missing = np.array([any(split_entries[row] is None for split_entries in entries)
+                           for row in range(len(subsets))], dtype=bool)
+    missing = np.flatnonzero(is_missing)
+    solved = sweep.evaluate(subsets[missing]) if len(missing) else None
+
+    per_split = []
+    for j, split in enumerate(sweep.splits):
+        n_sample = len(split.sample_rows)
+        arrays = {
+            'coef': np.empty(subsets.shape),
+            'intercept': np.empty(len(subsets)),
+            'mse': np.empty(len(subsets)),
+            'rmse': np.empty(len(subsets)),
+            'r2': np.empty(len(subsets)),
+            'predicted': np.empty((len(subsets), n_sample), dtype=np.float32),
+        }
+        if solved is not None:
+            for name, values in solved[j].items():
+                arrays[name][missing] = values
+            for pos, row in enumerate(missing):
+                cache.put(keys[j][row], {name: solved[j][name][pos] for name in arrays})
+        for row, entry in enumerate(entries[j]):
+            if not is_missing[row]:
+                for name in arrays:
+                    arrays[name][row] = entry[name]
+        per_split.append(arrays)
+    return per_split
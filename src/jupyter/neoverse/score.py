@@ -0,0 +1,109 @@
+"""Batch scoring of large log archives with the persisted hacker model.
+
+The archive (CSV or Parquet) is streamed in fixed-size chunks through
+``iter_logs``. Every chunk is engineered with the training-time statistics
+stored in the model's ``FeaturePipeline``, so no quantile or max is
+recomputed per chunk. Only the running top-K players by
+``Hacker_Probability`` are kept, in a ``TopK``, which keeps memory constant
+however many rows the archive holds::
+
+    python -m neoverse.score hacker_model.joblib logs.parquet --top 10 --output top.csv
+
+With ``--windows-state PATH`` every chunk also updates the per-player time
+windows of ``neoverse.windows``, kept in PATH across runs, and the top
+players carry those behavior-over-time features.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from .hacker_model import HackerModel
+from .logs import iter_logs
+from .ranking import TopK
+from .windows import FEATURES as WINDOW_FEATURES, PlayerWindows
+
+
+def score_logs(model, path, k=10, chunksize=100_000, cache=False, cache_dir=None,
+               windows=None):
+    """Stream the log archive at ``path`` through ``model``.
+
+    Returns the top ``k`` players by ``Hacker_Probability`` as a DataFrame
+    (every raw field of their best-scoring event plus ``Hacker_Probability``,
+    ``Suspicion_Factors`` and ``Hacker_Rank``) and the number of rows scored.
+    Float fields are the float32 values that were scored, so they can differ
+    from a CSV archive in the last digits.
+    ``cache`` converts a CSV archive to Parquet first, like ``read_logs``.
+    ``windows``, a ``PlayerWindows``, is updated with every chunk and adds its
+    features to the top players' rows.
+    """
+    top = TopK(k)
+    rows = 0
+    for chunk in iter_logs(path, chunksize=chunksize, cache=cache, cache_dir=cache_dir):
+        score_chunk(model, chunk, top, windows)
+        rows += len(chunk)
+
+    return top.frame(), rows
+
+
+def score_chunk(model, chunk, top, windows=None):
+    """Score the events of ``chunk`` into the ``TopK`` ``top``, updating
+    ``windows`` (a ``PlayerWindows``) when given."""
+    probability = model.predict_proba(chunk)
+    temporal = windows.update(chunk) if windows is not None else None
+    positions = top.candidates(probability, chunk['Player ID'])
+    if len(positions):
+        # Factors are only worked out for the rows that can enter
+        picked = chunk.iloc[positions].reset_index(drop=True)
+        if temporal is not None:
+            picked[WINDOW_FEATURES] = temporal.to_numpy()[positions]
+        picked['Hacker_Probability'] = probability[positions]
+        picked['Suspicion_Factors'] = model.suspicion_factors(picked)
+        top.add(probability[positions], picked['Player ID'], picked)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Score a Neoverse log archive and keep the top suspected hackers.")
+    parser.add_argument('model', help="path to the hacker_model.joblib written by neo.py")
+    parser.add_argument('logs', help="CSV or Parquet log archive")
+    parser.add_argument('--top', type=int, default=10, help="number of players to keep")
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--cache', action='store_true',
+                        help="convert a CSV archive to Parquet before scoring")
+    parser.add_argument('--output', help="write the top players to this CSV file")
+    parser.add_argument('--windows-state', metavar='PATH',
+                        help="per-player time window state (.npz) to update and keep")
+    parser.add_argument('--window', default='24h',
+                        help="time constant of a new window state (default: 24h)")
+    args = parser.parse_args(argv)
+
+    model = HackerModel.load(args.model)
+    windows = None
+    if args.windows_state:
+        state_path = Path(args.windows_state)
+        windows = (PlayerWindows.load(state_path) if state_path.exists()
+                   else PlayerWindows(args.window))
+    start = time.perf_counter()
+    ranked, rows = score_logs(model, args.logs, args.top, args.chunksize, args.cache,
+                              windows=windows)
+    elapsed = time.perf_counter() - start
+    print(f"Scored {rows} rows in {elapsed:.2f} s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+    if windows is not None:
+        windows.save(state_path)
+        print(f"Window state of {len(windows)} players saved to {state_path}")
+
+    if args.output:
+        ranked.to_csv(args.output, index=False)
+    print_ranked(ranked)
+
+
+def print_ranked(ranked):
+    for row in ranked.to_dict('records'):
+        print(f"#{row['Hacker_Rank']}: Player {row['Player ID']} - "
+              f"Probability: {row['Hacker_Probability']:.3f}")
+        print(f"   Factors: {row['Suspicion_Factors']}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,224 @@
+"""Local scoring service for the persisted hacker model.
+
+Requests are queued and coalesced by a ``MicroBatcher`` thread: it waits at
+most ``max_wait`` seconds for further requests (or until ``max_batch_size``
+events are pending), builds one DataFrame and makes a single vectorized
+``predict_proba`` call for the whole batch. The service can be used in
+process (``HackerScoringService.score``) or over HTTP::
+
+    python -m neoverse.scoring_service hacker_model.joblib --port 8765
+
+``POST /score`` takes ``{"events": [...]}`` (raw log fields per player) and
+returns ``{"results": [...]}`` with ``Player ID``, ``Hacker_Probability`` and
+``Suspicion_Factors``. Events missing a required field are rejected with a
+400 before they are queued, and a batch that still fails is rescored request
+by request, so one bad request never fails the others. ``GET /stats``
+reports request latency percentiles against the p99 target.
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .hacker_model import HackerModel, check_event_records
+
+
+class LatencyTracker:
+    """Rolling window of request latencies, in seconds."""
+
+    def __init__(self, window=10_000):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def percentile(self, q):
+        with self._lock:
+            if not self._samples:
+                return None
+            return float(np.percentile(np.fromiter(self._samples, float), q))
+
+
+class MicroBatcher:
+    """Coalesce event lists from many callers into batched scoring calls.
+
+    ``score_batch`` receives one DataFrame per batch and must return a
+    DataFrame with one row per input event, in order.
+    """
+
+    def __init__(self, score_batch, max_batch_size=512, max_wait=0.002):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.latency = LatencyTracker()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, events):
+        """Queue a list of event dicts; returns a Future of their scores."""
+        future = Future()
+        self._queue.put((list(events), future, time.perf_counter()))
+        return future
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch, size = [first], len(first[0])
+        deadline = time.perf_counter() + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                self._score(batch)
+            except Exception as exc:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(exc)
+                    continue
+                # One bad request fails the whole batch; rescore the requests
+                # one by one so only the bad ones fail
+                for item in batch:
+                    try:
+                        self._score([item])
+                    except Exception as exc:
+                        item[1].set_exception(exc)
+
+    def _score(self, batch):
+        records = [event for events, _, _ in batch for event in events]
+        scored = self.score_batch(pd.DataFrame.from_records(records))
+        start = 0
+        for events, future, submitted in batch:
+            stop = start + len(events)
+            future.set_result(scored.iloc[start:stop].reset_index(drop=True))
+            self.latency.record(time.perf_counter() - submitted)
+            start = stop
+
+
+class HackerScoringService:
+    """Micro-batched scoring of player events with a ``HackerModel``."""
+
+    def __init__(self, model, max_batch_size=512, max_wait=0.002,
+                 target_p99_ms=50.0):
+        self.model = model
+        self.target_p99_ms = target_p99_ms
+        self.batcher = MicroBatcher(model.score, max_batch_size, max_wait)
+
+    def score(self, events, timeout=None):
+        """Score a list of event dicts, blocking until its batch is done.
+
+        Raises ``ValueError`` before queueing if an event lacks a required
+        field, so a bad request never joins a batch.
+        """
+        events = list(events)
+        check_event_records(events)
+        return self.batcher.submit(events).result(timeout)
+
+    def stats(self):
+        latency = self.batcher.latency
+        p50, p99 = latency.percentile(50), latency.percentile(99)
+        return {
+            'requests': latency.count,
+            'p50_ms': None if p50 is None else p50 * 1000,
+            'p99_ms': None if p99 is None else p99 * 1000,
+            'target_p99_ms': self.target_p99_ms,
+            'within_target': None if p99 is None else p99 * 1000 <= self.target_p99_ms,
+        }
+
+    def close(self):
+        self.batcher.close()
+
+
+def make_handler(service):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        def _send(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == '/stats':
+                self._send(200, service.stats())
+            else:
+                self._send(404, {'error': f"unknown path {self.path}"})
+
+        def do_POST(self):
+            if self.path != '/score':
+                self._send(404, {'error': f"unknown path {self.path}"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+                events = body['events'] if isinstance(body, dict) else body
+                scored = service.score(events)
+            except (ValueError, KeyError, TypeError) as exc:
+                self._send(400, {'error': str(exc)})
+                return
+            self._send(200, {'results': scored.to_dict(orient='records')})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ScoringHandler
+
+
+def serve(service, host='127.0.0.1', port=8765):
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Scoring hacker events on http://{host}:{port}/score")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the hacker detector over HTTP.")
+    parser.add_argument('model', help="path to the hacker_model.joblib written by neo.py")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch-size', type=int, default=512)
+    parser.add_argument('--max-wait-ms', type=float, default=2.0)
+    parser.add_argument('--target-p99-ms', type=float, default=50.0)
+    args = parser.parse_args(argv)
+
+    service = HackerScoringService(HackerModel.load(args.model), args.max_batch_size,
+                                   args.max_wait_ms / 1000, args.target_p99_ms)
+    serve(service, args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Cache of train/test index splits.
+
+``train_test_split(..., random_state=42)`` draws its permutation from the
+number of rows, the test size and the seed alone; which columns are being
+split makes no difference. The cache computes the train/test index arrays
+once per ``(n_rows, test_size, seed)`` and hands the same arrays to every
+caller, which then gathers rows instead of reshuffling.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+
+def dataset_fingerprint(df):
+    """Short content hash of a DataFrame, used to scope on-disk caches."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(','.join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+class SplitCache:
+    """Train/test index arrays keyed by ``(n_rows, test_size, seed)``.
+
+    With a ``cache_dir`` the arrays are also persisted as ``.npz`` files,
+    prefixed with ``fingerprint`` when one is given so each dataset keeps its
+    own files.
+    """
+
+    def __init__(self, cache_dir=None, fingerprint=None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.fingerprint = fingerprint
+        self._splits = {}
+
+    def _path(self, key):
+        n_rows, test_size, seed = key
+        prefix = f"{self.fingerprint}_" if self.fingerprint else ''
+        return self.cache_dir / f"split_{prefix}{n_rows}_{test_size:g}_{seed}.npz"
+
+    def get(self, n_rows, test_size, random_state=42):
+        """Return ``(train_idx, test_idx)`` positional index arrays."""
+        key = (n_rows, round(test_size, 6), random_state)
+        if key in self._splits:
+            return self._splits[key]
+
+        path = self._path(key) if self.cache_dir is not None else None
+        if path is not None and path.exists():
+            with np.load(path) as stored:
+                split = stored['train'], stored['test']
+        else:
+            split = tuple(train_test_split(
+                np.arange(n_rows), test_size=test_size, random_state=random_state))
+            if path is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                np.savez(path, train=split[0], test=split[1])
+
+        for idx in split:
+            idx.flags.writeable = False
+        self._splits[key] = split
+        return split
+
+
+# Shared by every caller that does not bring its own cache
+default_cache = SplitCache()
@@ -0,0 +1,145 @@
+"""Vectorized ``Suspicion_Factors`` for scored players.
+
+Each factor is a rule that turns a column into a boolean mask. Quantile
+rules take their cut-off from the reference data once, in ``fit``. The
+engine stacks the rule masks into a per-player bitmask, and the factor
+strings are then built once per distinct bitmask and broadcast back. Cost
+grows with the number of rules, not with the number of players times rules.
+
+``fit_chunks`` takes the thresholds from ``QuantileSketch``es built in one
+streaming pass instead, for logs too large to sort.
+
+New factors are added by passing extra rules to ``FactorEngine``::
+
+    FactorEngine(DEFAULT_RULES + [QuantileRule("Unstable sync", 'Sync Stability (%)', 0.99)])
+"""
+
+import copy
+
+import numpy as np
+
+from .sketch import sketch_columns
+
+
+class QuantileRule:
+    """Flag players whose ``column`` is above its ``quantile`` in the reference data."""
+
+    def __init__(self, label, column, quantile):
+        self.label = label
+        self.column = column
+        self.quantile = quantile
+        self.threshold = None
+
+    def mask(self, events):
+        return events[self.column].to_numpy() > self.threshold
+
+
+class PresenceRule:
+    """Flag players whose ``column`` holds anything other than ``absent``."""
+
+    quantile = None
+
+    def __init__(self, label, column, absent='None'):
+        self.label = label
+        self.column = column
+        self.absent = absent
+
+    def mask(self, events):
+        return (events[self.column] != self.absent).to_numpy()
+
+
+DEFAULT_RULES = [
+    QuantileRule("High criminal score", 'Criminal Score', 0.9),
+    QuantileRule("Unusual quest patterns", 'Quest Exploit Score', 0.9),
+    PresenceRule("Dark market activity", 'Dark Market Transactions'),
+    QuantileRule("Excessive spending", 'Money Spent ($)', 0.95),
+    QuantileRule("Excessive playtime", 'Hours Played', 0.95),
+]
+
+
+class FactorEngine:
+    """Evaluate suspicion rules column-wise over any number of players."""
+
+    def __init__(self, rules=None):
+        # Rules carry their fitted thresholds, so every engine gets its own
+        self.rules = [copy.copy(rule) for rule in (rules or DEFAULT_RULES)]
+        if len(self.rules) > 32:
+            raise ValueError("at most 32 suspicion rules fit in the bitmask")
+        self.errors = {}
+
+    def fit(self, data):
+        """Compute every quantile threshold from ``data``.
+
+        Rules that share a quantile level are answered by one
+        ``DataFrame.quantile`` call.
+        """
+        self.errors = {}
+        by_level = {}
+        for rule in self.rules:
+            if rule.quantile is not None:
+                by_level.setdefault(rule.quantile, []).append(rule)
+        for level, rules in by_level.items():
+            columns = list(dict.fromkeys(rule.column for rule in rules))
+            thresholds = data[columns].quantile(level)
+            for rule in rules:
+                rule.threshold = float(thresholds[rule.column])
+        return self
+
+    def fit_chunks(self, chunks, compression=200):
+        """Compute the quantile thresholds from an iterable of DataFrames.
+
+        Each column gets one ``QuantileSketch``; the estimated rank error of
+        every threshold is kept in ``errors``, keyed by rule label.
+        """
+        quantile_rules = [rule for rule in self.rules if rule.quantile is not None]
+        columns = list(dict.fromkeys(rule.column for rule in quantile_rules))
+        sketches = sketch_columns(chunks, columns, compression)
+        return self.fit_sketches(sketches)
+
+    def fit_sketches(self, sketches):
+        """Compute the quantile thresholds from per-column sketches, such as
+        ones merged from several workers."""
+        for rule in self.rules:
+            if rule.quantile is not None:
+                sketch = sketches[rule.column]
+                rule.threshold = sketch.quantile(rule.quantile)
+                self.errors[rule.label] = sketch.rank_error(rule.quantile)
+        return self
+
+    @property
+    def columns(self):
+        """Event columns the rules read."""
+        return list(dict.fromkeys(rule.column for rule in self.rules))
+
+    @property
+    def thresholds(self):
+        return {rule.label: rule.threshold for rule in self.rules
+                if rule.quantile is not None}
+
+    def bitmask(self, events):
+        """uint32 per player; bit ``i`` is set when rule ``i`` applies."""
+        bits = np.zeros(len(events), dtype=np.uint32)
+        for i, rule in enumerate(self.rules):
+            bits |= rule.mask(events).astype(np.uint32) << np.uint32(i)
+        return bits
+
+    def labels(self, bits):
+        """Comma-separated factor labels for each bitmask value."""
+        if len(self.rules) <= 16:
+            # Few rules: index a table over every possible bitmask directly
+            codes = np.flatnonzero(np.bincount(bits, minlength=1 << len(self.rules)))
+            table = np.empty(1 << len(self.rules), dtype=object)
+            table[codes] = [self._join(code) for code in codes.tolist()]
+            return table[bits]
+        codes, inverse = np.unique(bits, return_inverse=True)
+        table = np.array([self._join(code) for code in codes.tolist()], dtype=object)
+        return table[inverse.reshape(-1)]
+
+    def _join(self, code):
+        return ", ".join(rule.label for i, rule in enumerate(self.rules)
+                         if code >> i & 1)
+
+    def factors(self, events):
+        """``Suspicion_Factors`` strings for every player in ``events``."""
+        return self.labels(self.bitmask(events))
+
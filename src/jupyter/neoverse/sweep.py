@@ -0,0 +1,242 @@
+"""Gram-matrix engine for the spending feature-combination sweep.
+
+Every model in the sweep is an ordinary least-squares fit on standardized
+features, so it is fully determined by the first and second moments of its
+train and test partitions. The engine computes those moments once per split
+over all candidate features and then solves each subset's normal equations
+from sub-blocks of them, batched in NumPy, instead of re-slicing, re-scaling
+and re-fitting the DataFrame for every combination.
+"""
+
+from itertools import combinations
+
+import numpy as np
+
+from .splits import default_cache
+
+DEFAULT_TEST_SIZES = (0.4, 0.3, 0.2, 0.1)
+MAX_POINTS_PER_MODEL = 1000
+
+
+def split_label(test_size):
+    """Format a test size the way the sweep reports splits, e.g. ``60-40``."""
+    train_size = 1 - test_size
+    return f"{train_size*100:.0f}-{test_size*100:.0f}"
+
+
+def feature_subsets(n_features, size):
+    """All ``size``-combinations of ``range(n_features)`` as an int array."""
+    subsets = np.fromiter(
+        (i for combo in combinations(range(n_features), size) for i in combo),
+        dtype=np.intp)
+    return subsets.reshape(-1, size)
+
+
+def _solve_one(A, b):
+    try:
+        return np.linalg.solve(A, b)
+    except np.linalg.LinAlgError:
+        # Collinear subset: take the minimum-norm solution, which is what
+        # LinearRegression's lstsq returns
+        return np.linalg.pinv(A, hermitian=True) @ b
+
+
+class SplitMoments:
+    """Sufficient statistics of one train/test split over all features.
+
+    Features are standardized with the train mean and (population) standard
+    deviation, matching ``StandardScaler``, so the solved coefficients are the
+    same ones ``LinearRegression`` reports on the scaled features.
+
+    At most ``max_points`` test rows are sampled once per split; every model
+    on the split is scored on that same sample for the exported predictions.
+    Split indices come from ``split_cache`` (the shared ``SplitCache`` by
+    default).
+    """
+
+    def __init__(self, X, y, test_size, random_state=42,
+                 max_points=MAX_POINTS_PER_MODEL, split_cache=None):
+        self.test_size = test_size
+        self.label = split_label(test_size)
+        split_cache = split_cache or default_cache
+        self.train_idx, self.test_idx = split_cache.get(
+            len(y), test_size, random_state)
+
+        X_train, y_train = X[self.train_idx], y[self.train_idx]
+        X_test, y_test = X[self.test_idx], y[self.test_idx]
+
+        self.mean = X_train.mean(axis=0)
+        scale = X_train.std(axis=0)
+        # StandardScaler leaves constant columns unscaled
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+        self.scale = scale
+        self.y_mean = float(y_train.mean())
+
+        Z_train = (X_train - self.mean) / self.scale
+        self.gram = Z_train.T @ Z_train
+        self.xty = Z_train.T @ (y_train - self.y_mean)
+
+        # Test moments are taken around the train statistics so that the
+        # residuals of any subset model follow from its coefficients alone
+        Z_test = (X_test - self.mean) / self.scale
+        e_test = y_test - self.y_mean
+        self.test_gram = Z_test.T @ Z_test
+        self.test_xty = Z_test.T @ e_test
+        self.test_yy = float(e_test @ e_test)
+        self.test_sst = float(((y_test - y_test.mean()) ** 2).sum())
+        self.n_test = len(self.test_idx)
+
+        if self.n_test > max_points:
+            rng = np.random.default_rng(random_state)
+            sample = np.sort(rng.choice(self.n_test, max_points, replace=False))
+        else:
+            sample = np.arange(self.n_test)
+        self.sample_rows = self.test_idx[sample]
+        self.sample_actual = y_test[sample]
+        self.sample_Z = Z_test[sample]
+
+    def solve(self, subsets):
+        """Fit every row of ``subsets`` (an ``(m, k)`` index array) at once.
+
+        Returns a dict of arrays: ``coef`` ``(m, k)``, ``predicted``
+        ``(m, n_sample)`` for the sampled test rows, plus ``intercept``,
+        ``mse``, ``rmse`` and ``r2`` of shape ``(m,)``.
+        """
+        A = self.gram[subsets[:, :, None], subsets[:, None, :]]
+        b = self.xty[subsets][:, :, None]
+        try:
+            coef = np.linalg.solve(A, b)[:, :, 0]
+        except np.linalg.LinAlgError:
+            coef = np.stack([_solve_one(A_m, b_m[:, 0]) for A_m, b_m in zip(A, b)])
+
+        G = self.test_gram[subsets[:, :, None], subsets[:, None, :]]
+        g = self.test_xty[subsets]
+        sse = (self.test_yy - 2 * np.einsum('mk,mk->m', coef, g)
+               + np.einsum('mk,mkl,ml->m', coef, G, coef))
+        sse = np.maximum(sse, 0.0)
+        mse = sse / self.n_test
+        if self.test_sst > 0:
+            r2 = 1 - sse / self.test_sst
+        else:
+            r2 = np.where(sse == 0, 1.0, 0.0)
+
+        # One column of the subset at a time keeps this at (m, n_sample)
+        predicted = np.full((len(subsets), len(self.sample_rows)), self.y_mean)
+        for j in range(subsets.shape[1]):
+            predicted += coef[:, j, None] * self.sample_Z[:, subsets[:, j]].T
+
+        return {
+            'coef': coef,
+            'intercept': np.full(len(subsets), self.y_mean),
+            'mse': mse,
+            'rmse': np.sqrt(mse),
+            'r2': r2,
+            'predicted': predicted.astype(np.float32),
+        }
+
+
+class PredictionStore:
+    """Sampled test predictions of every model a sweep evaluated.
+
+    Sample rows and actual values are kept once per split; each model only
+    adds a float32 prediction vector. Models are keyed by their position in
+    the sweep's result list. The store stays in memory, so it grows with the
+    number of models: ``4 * max_points`` bytes each.
+    """
+
+    def __init__(self, splits):
+        self.rows = [split.sample_rows for split in splits]
+        self.actual = [split.sample_actual for split in splits]
+        self._split = []
+        self._predicted = []
+
+    def __len__(self):
+        return len(self._predicted)
+
+    def append(self, split_index, predicted):
+        self._split.append(split_index)
+        self._predicted.append(predicted)
+
+    def split_index(self, key):
+        """Index of the split model ``key`` was evaluated on."""
+        return self._split[key]
+
+    def get(self, key):
+        """Return ``(rows, actual, predicted)`` for model ``key``.
+
+        ``rows`` are positional indices into the frame the sweep was fit on.
+        """
+        split_index = self._split[key]
+        return self.rows[split_index], self.actual[split_index], self._predicted[key]
+
+
+class GramSweep:
+    """Evaluate linear models over every feature subset and train-test split."""
+
+    def __init__(self, X, y, feature_names, test_sizes=DEFAULT_TEST_SIZES,
+                 random_state=42, max_points=MAX_POINTS_PER_MODEL,
+                 split_cache=None):
+        self.feature_names = list(feature_names)
+        self.test_sizes = tuple(test_sizes)
+        self.split_cache = split_cache or default_cache
+        # A fixed memory layout keeps the moment reductions bit-for-bit
+        # reproducible however the matrix reaches them
+        X = np.ascontiguousarray(X, dtype=np.float64)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        self.splits = self._split_moments(X, y, random_state, max_points)
+
+    def _split_moments(self, X, y, random_state, max_points):
+        return [SplitMoments(X, y, test_size, random_state, max_points,
+                             self.split_cache)
+                for test_size in self.test_sizes]
+
+    def evaluate(self, subsets, chunk_size=4096):
+        """Solve ``subsets`` on every split.
+
+        Returns one dict of arrays per split, in ``test_sizes`` order.
+        """
+        per_split = []
+        for split in self.splits:
+            chunks = [split.solve(subsets[start:start + chunk_size])
+                      for start in range(0, len(subsets), chunk_size)]
+            per_split.append({key: np.concatenate([c[key] for c in chunks])
+                              for key in chunks[0]})
+        return per_split
+
+    def results(self, subsets, per_split, store=None):
+        """Expand solved arrays into the sweep's result dicts.
+
+        Results are ordered combination by combination and, within each
+        combination, split by split, like the original per-model loop. If a
+        ``PredictionStore`` is given, each model's sampled predictions are
+        appended to it in the same order.
+        """
+        names = [[self.feature_names[i] for i in subset] for subset in subsets]
+        columns = [{key: values.tolist() for key, values in solved.items()
+                    if key != 'predicted'}
+                   for solved in per_split]
+        results = []
+        for row, feature_list in enumerate(names):
+            for split_index, (split, solved) in enumerate(zip(self.splits, columns)):
+                if store is not None:
+                    store.append(split_index, per_split[split_index]['predicted'][row])
+                results.append({
+                    'features': feature_list,
+                    'train_size': split.label,
+                    'mse': solved['mse'][row],
+                    'rmse': solved['rmse'][row],
+                    'r2': solved['r2'][row],
+                    'coefficients': dict(zip(feature_list, solved['coef'][row])),
+                    'intercept': solved['intercept'][row]
+                })
+        return results
+
+    def run(self, max_features, store=None):
+        """Evaluate all combinations of 1 to ``max_features`` features."""
+        all_results = []
+        max_features = min(max_features, len(self.feature_names))
+        for size in range(1, max_features + 1):
+            subsets = feature_subsets(len(self.feature_names), size)
+            all_results.extend(
+                self.results(subsets, self.evaluate(subsets), store))
+        return all_results
@@ -0,0 +1,124 @@
+"""Synthetic Neoverse player logs for benchmarks and load tests.
+
+``synthetic_logs`` generates logs with the schema of
+``neoverse_logs_with_edge_cases.csv`` (the hacker-detection logs are the
+same columns without the ``*_encoded`` ones): one row per player with
+IDs ``P0001``, ``P0002``, ..., timestamps over three days and the same
+categories, value ranges and correlations as the reference file. For
+example, money spent and quest exploit score grow with hours played, and
+``Dark Market Transactions`` has its 10 evenly used values. Rows are
+generated in chunks from a seeded generator per chunk, so any number of rows
+is produced in bounded memory and the same ``rows``/``seed`` always give
+the same logs.
+
+``write_synthetic_logs`` streams them to a CSV or Parquet file.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Bumped whenever the generated values change, so cached files are rebuilt
+GENERATOR_VERSION = 1
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+PLAYER_RANKS = ['Cosmic Ensign', 'Galactic Commander', 'Interstellar Agent', 'Nebula Novice',
+                'Solar Admiral', 'Stellar Scout', 'Universal Archon']
+TEAM_AFFILIATIONS = ['Cyber Sentinels', 'Lone Wolf', 'Shadow Collective']
+PLAYER_LEVELS = ['Celestial Vanguard', 'Cosmic Initiate', 'Galactic Cadet',
+                 'Quantum Sovereign', 'Starborne Operative']
+DARK_MARKET_TRANSACTIONS = ['ByteBandit', 'CyberWraith', 'DataDrifter', 'Error404',
+                            'GhostCoder', 'GlitchChip', 'NeonShifter', 'PixelPirate',
+                            'QuantumBreaker', 'RealityBender']
+
+_START = np.datetime64('2025-02-15T00:00:00', 's')
+_SPAN_SECONDS = 3 * 24 * 3600
+
+
+def _categorical(rng, categories, n, p=None):
+    codes = rng.choice(len(categories), n, p=p).astype(np.int32)
+    return codes, pd.Categorical.from_codes(codes, categories)
+
+
+def synthetic_chunk(start, rows, seed=0):
+    """Rows ``start`` to ``start + rows`` of the synthetic logs of ``seed``."""
+    rng = np.random.default_rng([seed, start])
+    hours = rng.integers(50, 301, rows)
+    missions = np.maximum(np.rint(hours * rng.uniform(0.5, 1.5, rows)), 25).astype(np.int64)
+    money = np.round(hours * 76.0 + rng.gamma(1.0, 900.0, rows), 2)
+    quest = np.round(np.clip(2.0 * hours + rng.normal(45.0, 52.0, rows), 80.0, 801.0), 1)
+
+    level_codes, levels = _categorical(rng, PLAYER_LEVELS, rows)
+    rank_codes, ranks = _categorical(rng, PLAYER_RANKS, rows)
+    dark_codes, dark = _categorical(rng, DARK_MARKET_TRANSACTIONS, rows)
+    team_codes, teams = _categorical(rng, TEAM_AFFILIATIONS, rows)
+    _, vip = _categorical(rng, ['No', 'Yes'], rows, p=[0.9, 0.1])
+
+    ids = np.char.add('P', np.char.zfill(np.arange(start + 1, start + rows + 1).astype(str), 4))
+    return pd.DataFrame({
+        'Player ID': ids,
+        'Timestamps': _START + rng.integers(0, _SPAN_SECONDS, rows).astype('timedelta64[s]'),
+        'Hours Played': hours,
+        'Money Spent ($)': money,
+        'Criminal Score': rng.integers(0, 10, rows),
+        'Missions Completed': missions,
+        'Player Rank': ranks,
+        'Team Affiliation': teams,
+        'VIP Status': vip,
+        'Cash on Hand ($)': rng.integers(500, 15001, rows),
+        'Sync Stability (%)': np.round(rng.uniform(70.0, 100.0, rows), 1),
+        'Quest Exploit Score': quest,
+        'Player Level': levels,
+        'Dark Market Transactions': dark,
+        'Transaction Amount ($)': rng.integers(100, 15000, rows),
+        'Neural Link Stability (%)': rng.normal(85.0, 12.2, rows),
+        # Codes in sorted category order, like LabelEncoder
+        'Player Level_encoded': level_codes,
+        'Player Rank_encoded': rank_codes,
+        'Dark Market Transactions_encoded': dark_codes,
+        'Team Affiliation_encoded': team_codes,
+    })
+
+
+def synthetic_logs(rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """The synthetic logs of ``seed`` as DataFrames of at most ``chunk_rows`` rows."""
+    for start in range(0, rows, chunk_rows):
+        yield synthetic_chunk(start, min(chunk_rows, rows - start), seed)
+
+
+def synthetic_logs_path(data_dir, rows, seed=0, suffix='.csv'):
+    """File name of the synthetic logs of ``rows``/``seed`` in ``data_dir``."""
+    return Path(data_dir) / f"synthetic_logs_{rows}_s{seed}_v{GENERATOR_VERSION}{suffix}"
+
+
+def write_synthetic_logs(path, rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Stream ``rows`` synthetic rows to ``path`` (``.csv`` or ``.parquet``)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.stem}.tmp{path.suffix}")
+    writer = None
+    try:
+        for chunk in synthetic_logs(rows, seed, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if path.suffix == '.parquet':
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema)
+                writer.write_table(table)
+            else:
+                # Categories are written as their values
+                table = table.cast(pa.schema([
+                    pa.field(field.name, pa.string())
+                    if pa.types.is_dictionary(field.type) else field
+                    for field in table.schema]))
+                if writer is None:
+                    writer = pa_csv.CSVWriter(tmp_path, table.schema)
+                writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    tmp_path.replace(path)
+    return path
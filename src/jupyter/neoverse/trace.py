@@ -0,0 +1,228 @@
+"""Stage spans for the analysis pipeline.
+
+Every stage of ``neoverse.pipeline`` runs in a span of its own name and
+wraps each of its steps (loading, feature engineering, encoding, splitting,
+scaling, fitting, predicting, exporting, plotting) in ``tracer.span(name)``.
+A span records:
+
+* its wall and CPU time;
+* the rows it processed, which the block sets on the span;
+* the resident set size before and after it;
+* the peak RSS while it ran.
+
+Spans nest. The parent of a new span is the innermost open span.
+
+``Tracer.save`` writes every span as JSON, which the pipeline puts next to
+the stage's outputs as ``<stage>_trace.json``, along with totals per span
+name, so a slow nightly run shows which step grew. Given the number of input rows, it also reports the peak RSS above
+the process's starting RSS per million rows, which stays comparable across
+input sizes. With ``--profile DIR``, every top-level span also runs under
+``cProfile`` and dumps its stats to ``DIR/<stage>.<nn>.<span>.prof``, for
+``pstats`` or snakeviz. Sampling profilers such as py-spy attach from
+outside the process and need no hooks here.
+
+The peak RSS is exact per span on Linux, where the kernel's high-water mark
+is reset when a span starts. Elsewhere it is the peak of the process so
+far.
+"""
+
+import cProfile
+import json
+import os
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+MB = 2**20
+
+
+def reset_peak_rss():
+    """Reset the kernel's peak RSS of this process; ``False`` where unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, in bytes."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def rss_bytes():
+    """Current resident set size of this process, in bytes, or ``None``
+    where it cannot be read (no ``/proc`` and no psutil)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def add_trace_arguments(parser):
+    """Add ``--profile`` to ``parser``."""
+    parser.add_argument('--profile', metavar='DIR',
+                        help="write a cProfile dump of every stage into DIR")
+
+
+def _mb(value):
+    return None if value is None else value / MB
+
+
+class Span:
+    """An open stage. Blocks set ``rows`` and may add ``fields``."""
+
+    def __init__(self, name, parent, depth, rows=None, fields=None):
+        self.name = name
+        self.parent = parent
+        self.depth = depth
+        self.rows = rows
+        self.fields = dict(fields or {})
+        self.peak = 0
+
+
+class Tracer:
+    """Records the spans of one script run.
+
+    ``records`` holds one dict per span, in the order the spans started;
+    a span's measurements are filled in when it ends.
+    """
+
+    def __init__(self, script, profile_dir=None):
+        self.script = script
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.records = []
+        self.peak_rss_scope = 'span' if reset_peak_rss() else 'process'
+        self._stack = []
+        self._start_rss = rss_bytes()
+        self._started = datetime.now()
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_args(cls, args, script):
+        return cls(script, profile_dir=args.profile)
+
+    @contextmanager
+    def span(self, name, rows=None, **fields):
+        """Measure the block as the stage ``name``."""
+        parent = self._stack[-1] if self._stack else None
+        span = Span(name, parent.name if parent else None, len(self._stack), rows, fields)
+        record = {'name': name, 'parent': span.parent, 'depth': span.depth}
+        self.records.append(record)
+
+        # The parent's peak so far would be lost by the reset
+        if parent is not None:
+            parent.peak = max(parent.peak, peak_rss_bytes())
+        reset_peak_rss()
+        rss_before = rss_bytes()
+        profiler = None
+        if self.profile_dir is not None and parent is None:
+            profiler = cProfile.Profile()
+
+        self._stack.append(span)
+        start = time.perf_counter()
+        cpu = time.process_time()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield span
+        except BaseException as exc:
+            record['error'] = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu
+            self._stack.pop()
+            span.peak = max(span.peak, peak_rss_bytes())
+            if parent is not None:
+                parent.peak = max(parent.peak, span.peak)
+            rss_after = rss_bytes()
+
+            record.update({
+                'start_s': start - self._origin,
+                'wall_s': wall,
+                'cpu_s': cpu,
+                'rows': span.rows,
+                'rss_before_mb': _mb(rss_before),
+                'rss_after_mb': _mb(rss_after),
+                'rss_delta_mb': (None if rss_before is None or rss_after is None
+                                 else _mb(rss_after - rss_before)),
+                'peak_rss_mb': _mb(span.peak),
+            })
+            record.update(span.fields)
+            if profiler is not None:
+                record['profile'] = str(self._dump(profiler, name))
+
+    def _dump(self, profiler, name):
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        index = sum(1 for record in self.records if record['depth'] == 0)
+        path = self.profile_dir / f"{self.script}.{index:02d}.{name}.prof"
+        profiler.dump_stats(path)
+        return path
+
+    def totals(self):
+        """Wall time, CPU time, rows and count per span name."""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['name'], {
+                'count': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0})
+            total['count'] += 1
+            total['wall_s'] += record.get('wall_s', 0.0)
+            total['cpu_s'] += record.get('cpu_s', 0.0)
+            total['rows'] += record.get('rows') or 0
+        return totals
+
+    def _peak_mb(self):
+        if self.peak_rss_scope == 'process':
+            return _mb(peak_rss_bytes())
+        # The resets leave only the spans' own peaks
+        return max((record.get('peak_rss_mb') or 0 for record in self.records), default=None)
+
+    def _peak_mb_per_million_rows(self, rows):
+        peak = self._peak_mb()
+        if not rows or peak is None or self._start_rss is None:
+            return None
+        return (peak - _mb(self._start_rss)) / rows * 1e6
+
+    def save(self, path, rows=None):
+        """Write the trace to ``path`` as JSON; ``rows`` is the number of
+        input rows the run processed."""
+        path = Path(path)
+        trace = {
+            'script': self.script,
+            'started': self._started.isoformat(timespec='seconds'),
+            'wall_s': time.perf_counter() - self._origin,
+            'rows': rows,
+            'start_rss_mb': _mb(self._start_rss),
+            'peak_rss_mb': self._peak_mb(),
+            'peak_rss_mb_per_million_rows': self._peak_mb_per_million_rows(rows),
+            'peak_rss_scope': self.peak_rss_scope,
+            'spans': self.records,
+            'totals': self.totals(),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp.json')
+        tmp_path.write_text(json.dumps(trace, indent=2, default=str))
+        tmp_path.replace(path)
+        return path
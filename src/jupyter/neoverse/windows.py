@@ -0,0 +1,182 @@
+"""Incremental per-player aggregates over time.
+
+Every log row is a snapshot of one player's running totals (hours played,
+money spent, scores) at ``Timestamps``. When the same Player ID shows up
+again in later batches, ``PlayerWindows`` turns consecutive snapshots into
+behavior-over-time features:
+
+* ``window_money_per_hour``: money spent per hour played over the recent
+  window, i.e. the growth of ``Money Spent ($)`` over the growth of
+  ``Hours Played``, with ``money_per_hour``'s +1 in the denominator;
+* ``criminal_score_delta`` and ``quest_exploit_delta``: the change since the
+  player's previous snapshot;
+* ``dark_market_rate``: dark-market snapshots per hour over the recent
+  window;
+* ``window_events``: snapshots in the recent window.
+
+The windows decay exponentially: a snapshot's weight falls by a factor e
+every ``window``. A decayed sum needs only the last timestamp and one running
+total, so each player's state is a fixed handful of numbers. ``update`` folds
+a batch into that state in place and never revisits history. The state lives
+in NumPy arrays with one slot per player and is saved and loaded with
+``save``/``load`` between runs.
+
+A player's first snapshot counts from zero. Its ``window_money_per_hour`` is
+therefore the lifetime ``money_per_hour``, and its deltas are 0. Totals that
+go down count as no growth. A snapshot older than the player's latest one
+adds to the window sums without decay and does not replace the latest
+values.
+"""
+
+import numpy as np
+import pandas as pd
+
+TIME_COLUMN = 'Timestamps'
+KEY_COLUMN = 'Player ID'
+
+FEATURES = ['window_money_per_hour', 'criminal_score_delta', 'quest_exploit_delta',
+            'dark_market_rate', 'window_events']
+
+# Per-player state: the latest snapshot and the decayed window sums
+_STATE = {
+    'last_ts': np.int64, 'seen': np.bool_,
+    'hours': np.float32, 'money': np.float32,
+    'criminal': np.float32, 'quest': np.float32,
+    'money_sum': np.float64, 'hours_sum': np.float64,
+    'dark_sum': np.float64, 'event_sum': np.float64,
+}
+
+
+class PlayerWindows:
+    """Decayed per-player aggregates, updated one batch of events at a time.
+
+    ``window`` is anything ``pd.Timedelta`` accepts, e.g. ``'24h'``.
+    """
+
+    def __init__(self, window='24h'):
+        self.window = pd.Timedelta(window)
+        self._window_s = self.window.total_seconds()
+        self._slots = {}
+        self._state = {name: np.zeros(0, dtype) for name, dtype in _STATE.items()}
+
+    def __len__(self):
+        return len(self._slots)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the state arrays (the Player ID index not included)."""
+        return sum(values.nbytes for values in self._state.values())
+
+    def _reserve(self, size):
+        capacity = len(self._state['seen'])
+        if size <= capacity:
+            return
+        capacity = max(size, 2 * capacity, 1024)
+        for name, values in self._state.items():
+            grown = np.zeros(capacity, values.dtype)
+            grown[:len(values)] = values
+            self._state[name] = grown
+
+    def _slots_of(self, player_ids):
+        codes, uniques = pd.factorize(player_ids)
+        if (codes < 0).any():
+            raise ValueError("events without a Player ID cannot be aggregated")
+        slots = np.fromiter((self._slots.setdefault(key, len(self._slots)) for key in uniques),
+                            dtype=np.int64, count=len(uniques))
+        self._reserve(len(self._slots))
+        return slots[codes]
+
+    def update(self, events):
+        """Fold ``events`` into the state.
+
+        Returns the features of every event, as of that event, in a DataFrame
+        aligned with the rows of ``events``. Several snapshots of one player in
+        the batch are applied in time order.
+        """
+        n = len(events)
+        slots = self._slots_of(events[KEY_COLUMN])
+        ts = events[TIME_COLUMN].to_numpy(dtype='datetime64[s]').astype(np.int64)
+        values = {
+            'hours': events['Hours Played'].to_numpy(dtype=np.float32),
+            'money': events['Money Spent ($)'].to_numpy(dtype=np.float32),
+            'criminal': events['Criminal Score'].to_numpy(dtype=np.float32),
+            'quest': events['Quest Exploit Score'].to_numpy(dtype=np.float32),
+            'dark': (events['Dark Market Transactions'] != 'None').to_numpy(dtype=np.float64),
+        }
+        features = {name: np.zeros(n) for name in FEATURES}
+
+        # A player's k-th snapshot in the batch is applied in round k, so each
+        # round updates distinct slots and is one vectorized step
+        order = np.lexsort((ts, slots))
+        first = np.r_[True, slots[order][1:] != slots[order][:-1]]
+        occurrence = np.arange(n) - np.maximum.accumulate(np.where(first, np.arange(n), 0))
+        rounds = order[np.argsort(occurrence, kind='stable')]
+        for rows in np.split(rounds, np.cumsum(np.bincount(occurrence))[:-1]):
+            self._apply(rows, slots[rows], ts[rows], values, features)
+        return pd.DataFrame(features, index=events.index)
+
+    def _apply(self, rows, slots, ts, values, features):
+        state = self._state
+        seen = state['seen'][slots]
+        last_ts = state['last_ts'][slots]
+        in_order = ~seen | (ts >= last_ts)
+        decay = np.exp(-np.where(seen, np.maximum(ts - last_ts, 0), 0) / self._window_s)
+
+        def growth(name):
+            return np.where(seen, np.maximum(values[name][rows] - state[name][slots], 0),
+                            values[name][rows])
+
+        def change(name):
+            return np.where(seen, values[name][rows] - state[name][slots], 0)
+
+        money_sum = state['money_sum'][slots] * decay + growth('money')
+        hours_sum = state['hours_sum'][slots] * decay + growth('hours')
+        dark_sum = state['dark_sum'][slots] * decay + values['dark'][rows]
+        event_sum = state['event_sum'][slots] * decay + 1
+        features['criminal_score_delta'][rows] = change('criminal')
+        features['quest_exploit_delta'][rows] = change('quest')
+        features['window_money_per_hour'][rows] = money_sum / (hours_sum + 1)
+        features['dark_market_rate'][rows] = dark_sum / (self._window_s / 3600)
+        features['window_events'][rows] = event_sum
+
+        state['money_sum'][slots] = money_sum
+        state['hours_sum'][slots] = hours_sum
+        state['dark_sum'][slots] = dark_sum
+        state['event_sum'][slots] = event_sum
+        state['seen'][slots] = True
+        latest = slots[in_order]
+        state['last_ts'][latest] = ts[in_order]
+        for name in ('hours', 'money', 'criminal', 'quest'):
+            state[name][latest] = values[name][rows][in_order]
+
+    def frame(self, now=None):
+        """Every player's current aggregates, decayed to ``now`` (default: the
+        latest timestamp seen), one row per Player ID."""
+        size = len(self._slots)
+        state = {name: values[:size] for name, values in self._state.items()}
+        last = state['last_ts'].max() if size else 0
+        now = last if now is None else np.datetime64(pd.Timestamp(now), 's').astype(np.int64)
+        decay = np.exp(-np.maximum(now - state['last_ts'], 0) / self._window_s)
+        return pd.DataFrame({
+            KEY_COLUMN: list(self._slots),
+            'last_seen': state['last_ts'].astype('datetime64[s]'),
+            'window_money_per_hour': state['money_sum'] * decay / (state['hours_sum'] * decay + 1),
+            'dark_market_rate': state['dark_sum'] * decay / (self._window_s / 3600),
+            'window_events': state['event_sum'] * decay,
+        })
+
+    def save(self, path):
+        """Write the window and the state of every player to ``path`` (``.npz``)."""
+        size = len(self._slots)
+        np.savez(path, window_s=self._window_s, keys=np.array(list(self._slots), dtype=str),
+                 **{name: values[:size] for name, values in self._state.items()})
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as stored:
+            windows = cls(pd.Timedelta(seconds=float(stored['window_s'])))
+            keys = stored['keys'].tolist()
+            windows._slots = dict(zip(keys, range(len(keys))))
+            windows._state = {name: stored[name].astype(dtype, copy=False)
+                              for name, dtype in _STATE.items()}
+        return windows
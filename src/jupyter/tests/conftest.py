@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The package lives next to the scripts in src/jupyter, without packaging
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
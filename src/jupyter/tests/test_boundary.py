@@ -0,0 +1,60 @@
+"""Closed-form boundary meshes against predict_proba on the same grid."""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from neoverse.boundary import boundary_mesh, mesh_axes
+
+
+@pytest.fixture(scope='module')
+def model():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(500, 2)) * [3.0, 1.5]
+    y = (X @ [1.0, -2.0] + rng.normal(size=500) > 0.5).astype(int)
+    return LogisticRegression(class_weight='balanced', random_state=42).fit(X, y)
+
+
+def grid_proba(model, xs, ys):
+    xx, yy = np.meshgrid(xs, ys)
+    return model.predict_proba(np.c_[xx.ravel(), yy.ravel()])[:, 1].reshape(xx.shape)
+
+
+@pytest.mark.parametrize('max_cells', [250_000, 5_000])
+def test_mesh_equals_predict_proba(model, max_cells):
+    mesh = boundary_mesh(model.coef_, model.intercept_, (-10, 10), (-5, 5),
+                         max_cells=max_cells)
+    assert mesh.Z.dtype == np.float32
+    assert mesh.cells <= max_cells
+    np.testing.assert_allclose(mesh.Z, grid_proba(model, mesh.xs, mesh.ys), atol=1e-6)
+
+
+def test_fixed_step_below_the_cap():
+    xs, ys = mesh_axes((0, 2), (0, 1))
+    np.testing.assert_allclose(np.diff(xs), 0.02)
+    assert (len(xs), len(ys)) == (100, 50)
+
+
+@pytest.mark.parametrize('x_range, y_range', [
+    ((-10, 10), (-5, 5)), ((-10.3, 9.1), (-4.7, 5.2)), ((0, 1000), (0, 0.5))])
+def test_widened_grid_stays_within_the_cap(x_range, y_range):
+    xs, ys = mesh_axes(x_range, y_range, max_cells=10_000)
+    assert len(xs) * len(ys) <= 10_000
+    assert xs[0] == x_range[0] and xs[-1] < x_range[1]
+    assert ys[0] == y_range[0] and ys[-1] < y_range[1]
+
+
+def test_refined_patches_equal_predict_proba(model):
+    mesh = boundary_mesh(model.coef_, model.intercept_, (-10, 10), (-5, 5),
+                         max_cells=20_000, refine=4, tile=8)
+    assert mesh.patches
+    # The coarse grid and the patches each stay within the cap
+    assert mesh.Z.size <= 20_000
+    assert mesh.cells - mesh.Z.size <= 20_000
+    coarse = grid_proba(model, mesh.xs, mesh.ys)
+    kept = ~np.isnan(mesh.Z)
+    np.testing.assert_allclose(mesh.Z[kept], coarse[kept], atol=1e-6)
+    for xs, ys, Z in mesh.patches:
+        np.testing.assert_allclose(Z, grid_proba(model, xs, ys), atol=1e-6)
+        # Every patch straddles the 0.5 contour
+        assert np.nanmin(Z) < 0.5 + 0.05 and np.nanmax(Z) > 0.5 - 0.05
@@ -0,0 +1,100 @@
+"""model_results.parquet read back against the per-row pandas export."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from neoverse.export import write_results
+from neoverse.splits import SplitCache
+from neoverse.sweep import GramSweep, PredictionStore
+
+FEATURES = ['a', 'b', 'c']
+
+
+@pytest.fixture(scope='module')
+def sweep():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 3))
+    y = X @ [2.0, -1.0, 0.5] + rng.normal(size=600)
+    gram_sweep = GramSweep(X, y, FEATURES, max_points=40, split_cache=SplitCache())
+    store = PredictionStore(gram_sweep.splits)
+    results = gram_sweep.run(3, store)
+    keys = sorted(range(len(results)), key=lambda k: results[k]['r2'], reverse=True)
+    return X, results, keys, store
+
+
+def pandas_export(X, all_results, keys, predictions):
+    """The original export: one dict per sampled prediction."""
+    model_df = pd.DataFrame(X, columns=FEATURES)
+    models_data = []
+    for idx, key in enumerate(keys):
+        result = all_results[key]
+        features = result['features']
+        test_size = float(result['train_size'].split('-')[1]) / 100
+        base_record = {
+            'model_id': idx,
+            'features': ','.join(features),
+            'num_features': len(features),
+            'train_size': 1 - test_size,
+            'test_size': test_size,
+            'mse': float(result['mse']),
+            'rmse': float(result['rmse']),
+            'r2': float(result['r2']),
+            'intercept': float(result['intercept'])
+        }
+        for feature, coef in result['coefficients'].items():
+            base_record[f'coef_{feature}'] = float(coef)
+        sample_rows, y_test_sample, y_pred_sample = predictions.get(key)
+        X_test_sample = model_df[features].iloc[sample_rows]
+        for i in range(len(y_test_sample)):
+            record = base_record.copy()
+            record['actual'] = float(y_test_sample[i])
+            record['predicted'] = float(y_pred_sample[i])
+            for feature in features:
+                record[f'value_{feature}'] = float(X_test_sample[feature].iloc[i])
+            models_data.append(record)
+    return pd.DataFrame(models_data)
+
+
+def test_round_trip_matches_pandas_export(sweep, tmp_path):
+    X, results, keys, store = sweep
+    path = tmp_path / 'model_results.parquet'
+    writer = write_results(path, results, keys, store, X, FEATURES, row_group_size=500)
+
+    expected = pandas_export(X, results, keys, store)
+    table = pq.read_table(path)
+    assert writer.rows_written == table.num_rows == len(expected)
+    assert pa.types.is_dictionary(table.schema.field('features').type)
+    written = table.to_pandas()
+    assert isinstance(written['features'].dtype, pd.CategoricalDtype)
+
+    written['features'] = written['features'].astype(str)
+    pd.testing.assert_frame_equal(written[expected.columns], expected, check_dtype=False)
+    # The features a model does not use are null, as in the pandas export
+    assert set(written.columns) == set(expected.columns)
+
+
+@pytest.mark.parametrize('row_group_size', [1, 100, 500, 10**6])
+def test_row_groups_hold_whole_models(sweep, tmp_path, row_group_size):
+    X, results, keys, store = sweep
+    path = tmp_path / 'model_results.parquet'
+    writer = write_results(path, results, keys, store, X, FEATURES,
+                           row_group_size=row_group_size)
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.num_row_groups == writer.row_groups
+    model_rows = max(len(store.get(key)[0]) for key in keys)
+    seen = set()
+    for i in range(parquet.num_row_groups):
+        rows = parquet.metadata.row_group(i).num_rows
+        model_ids = set(parquet.read_row_group(i, columns=['model_id'])['model_id']
+                        .to_pylist())
+        # A group closes once it reaches row_group_size, and never splits a model
+        if i < parquet.num_row_groups - 1:
+            assert rows >= row_group_size
+        assert rows < row_group_size + model_rows
+        assert not seen & model_ids
+        seen |= model_ids
+    assert seen == set(range(len(keys)))
@@ -0,0 +1,110 @@
+"""FeaturePipeline against the column-by-column construction neo.py used."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import LabelEncoder
+
+from neoverse.features import FeaturePipeline
+from neoverse.hacker_model import HACKER_FEATURES
+from neoverse.logs import read_logs
+from neoverse.synthetic import write_synthetic_logs
+
+OUTPUTS = HACKER_FEATURES + ['suspicion_score']
+
+
+def baseline(data, reference=None):
+    """The original feature engineering of ``data``, with the quantiles,
+    maxima and encoder classes of ``reference`` (default: ``data``)."""
+    reference = data if reference is None else reference
+    frames = []
+    for frame in (reference, data):
+        frame = frame.copy()
+        frame['crime_to_play_ratio'] = frame['Criminal Score'] / (frame['Hours Played'] + 1)
+        frame['money_per_hour'] = frame['Money Spent ($)'] / (frame['Hours Played'] + 1)
+        frame['quest_efficiency'] = frame['Quest Exploit Score'] / (frame['Hours Played'] + 1)
+        frame['has_dark_market'] = (frame['Dark Market Transactions'] != 'None').astype(int)
+        frames.append(frame)
+    reference, data = frames
+
+    crime_to_play_ratio_q95 = reference['crime_to_play_ratio'].quantile(0.95)
+    quest_exploit_q95 = reference['Quest Exploit Score'].quantile(0.95)
+    data['suspicious_activity'] = ((data['crime_to_play_ratio'] > crime_to_play_ratio_q95) &
+                                   (data['Quest Exploit Score'] > quest_exploit_q95)).astype(int)
+    le = LabelEncoder().fit(reference['Dark Market Transactions'].astype(str))
+    data['Dark Market Transactions_encoded'] = le.transform(
+        data['Dark Market Transactions'].astype(str))
+    data['suspicion_score'] = (
+        0.3 * (data['Criminal Score'] / reference['Criminal Score'].max()) +
+        0.2 * (data['Quest Exploit Score'] / reference['Quest Exploit Score'].max()) +
+        0.2 * (data['money_per_hour'] / reference['money_per_hour'].max()) +
+        0.3 * data['has_dark_market']
+    )
+    return data[OUTPUTS].to_numpy(dtype=np.float64)
+
+
+@pytest.fixture(scope='module')
+def data(tmp_path_factory):
+    path = tmp_path_factory.mktemp('logs') / 'logs.csv'
+    write_synthetic_logs(path, 20000, seed=3)
+    frame = read_logs(path, cache=False)
+    # Players without dark market transactions carry the literal 'None'
+    rng = np.random.default_rng(3)
+    dark = frame['Dark Market Transactions'].astype(str).to_numpy(dtype=object)
+    dark[rng.random(len(frame)) < 0.7] = 'None'
+    frame['Dark Market Transactions'] = dark
+    return frame
+
+
+def test_fit_transform_matches_baseline(data):
+    pipeline = FeaturePipeline(OUTPUTS)
+    matrix = pipeline.fit_transform(data)
+    assert matrix.dtype == np.float32
+    np.testing.assert_allclose(matrix[:, :len(OUTPUTS)], baseline(data), rtol=1e-6, atol=1e-6)
+
+
+def test_transform_uses_fitted_reductions(data):
+    train, later = data.iloc[:15000], data.iloc[15000:].reset_index(drop=True)
+    pipeline = FeaturePipeline(OUTPUTS).fit(train)
+    np.testing.assert_allclose(pipeline.transform(later)[:, :len(OUTPUTS)],
+                               baseline(later, train), rtol=1e-6, atol=1e-6)
+    np.testing.assert_array_equal(pipeline.transform(train), pipeline.fit_transform(train))
+
+
+def test_unseen_classes_encode_as_minus_one(data):
+    pipeline = FeaturePipeline(['Dark Market Transactions_encoded']).fit(data)
+    events = data.iloc[:3].copy()
+    events['Dark Market Transactions'] = ['None', 'NeverSeenBefore', 'GlitchChip']
+    codes = pipeline.transform(events)[:, 0]
+    classes = sorted(data['Dark Market Transactions'].unique())
+    assert codes.tolist() == [classes.index('None'), -1, classes.index('GlitchChip')]
+
+    empty = FeaturePipeline(['Dark Market Transactions_encoded']).fit(data.iloc[:0])
+    assert empty.transform(events)[:, 0].tolist() == [-1, -1, -1]
+
+
+def test_fit_chunks_matches_single_fit(data):
+    single = FeaturePipeline(OUTPUTS).fit(data)
+    chunked = FeaturePipeline(OUTPUTS).fit_chunks(
+        lambda: (data.iloc[start:start + 3000] for start in range(0, len(data), 3000)))
+    assert chunked.stats.keys() == single.stats.keys()
+
+    crime_to_play_ratio = single.frame(single.transform(data))['crime_to_play_ratio']
+    for reduction, value in single.stats.items():
+        kind, column = reduction[:2]
+        if kind == 'classes':
+            np.testing.assert_array_equal(chunked.stats[reduction], value)
+        elif kind == 'max':
+            assert chunked.stats[reduction] == value
+        else:
+            # A sketched quantile lies within its rank error of the exact one
+            values = crime_to_play_ratio if column == 'crime_to_play_ratio' else data[column]
+            rank = (values.to_numpy() <= chunked.stats[reduction]).mean()
+            assert abs(rank - reduction[2]) <= chunked.errors[reduction] + 1 / len(data)
+
+    # Only suspicious_activity reads the quantiles
+    exact = single.frame(single.transform(data))
+    sketched = chunked.frame(chunked.transform(data))
+    others = [column for column in single.columns if column != 'suspicious_activity']
+    np.testing.assert_array_equal(sketched[others].to_numpy(), exact[others].to_numpy())
+    assert (sketched['suspicious_activity'] != exact['suspicious_activity']).mean() < 0.01
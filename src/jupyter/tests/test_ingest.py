@@ -0,0 +1,171 @@
+"""Event decoding, stream reading and scoring of the asyncio ingestion."""
+
+import asyncio
+import json
+
+import pyarrow as pa
+
+from neoverse.hacker_model import EVENT_FIELDS
+from neoverse.ingest import EventDecoder, FileTail, IngestStats, consume, feed
+from neoverse.ranking import TopK
+
+
+def event(player, hours=100):
+    return {'Player ID': player, 'Hours Played': hours, 'Money Spent ($)': 1500.5,
+            'Criminal Score': 3, 'Quest Exploit Score': 250.0, 'Cash on Hand ($)': 900,
+            'Sync Stability (%)': 90.0, 'Neural Link Stability (%)': 85.5,
+            'Dark Market Transactions': 'None'}
+
+
+def ndjson(*events):
+    return b''.join(json.dumps(e).encode() + b'\n' for e in events)
+
+
+def players(batches):
+    return [player for batch in batches for player in batch.column('Player ID').to_pylist()]
+
+
+def drain(queue):
+    batches = []
+    while not queue.empty():
+        batches.append(queue.get_nowait())
+    return batches
+
+
+def test_decoder_drops_malformed_lines_and_incomplete_events():
+    decoder = EventDecoder()
+    lines = ndjson(event('P1'), event('P2')).splitlines()
+    missing = {k: v for k, v in event('P4').items() if k != 'Criminal Score'}
+    lines[1:1] = [b'{"Player ID": "P3", "Hours Pl', json.dumps(missing).encode(), b'']
+    table, invalid = decoder.decode(lines)
+    assert table.column('Player ID').to_pylist() == ['P1', 'P2']
+    assert invalid == 2
+
+    assert decoder.decode([b'not json', b'']) == (None, 1)
+    assert decoder.decode([]) == (None, 0)
+
+
+def test_csv_decoder_keeps_the_header_across_batches():
+    decoder = EventDecoder('csv')
+    header = ','.join(EVENT_FIELDS).encode()
+    row = ','.join(str(value) for value in event('P1').values()).encode()
+    table, invalid = decoder.decode([header, row])
+    assert (table.num_rows, invalid) == (1, 0)
+    # A short row and a row with an empty required field
+    table, invalid = decoder.decode([row.replace(b'P1', b'P2'), b'P3,not a number',
+                                     row.replace(b',None', b','), row])
+    assert table.column('Player ID').to_pylist() == ['P2', 'P1']
+    assert invalid == 2
+
+
+def test_feed_joins_lines_split_across_reads():
+    data = ndjson(*(event(f'P{i}') for i in range(7))).rstrip(b'\n')
+    # Blocks end mid-line, and the last line has no newline
+    blocks = iter([data[i:i + 13] for i in range(0, len(data), 13)] + [b''])
+
+    async def read():
+        return next(blocks)
+
+    async def run():
+        queue, stats = asyncio.Queue(), IngestStats()
+        await feed(read, EventDecoder(), queue, stats, batch_rows=3)
+        return drain(queue), stats
+
+    batches, stats = asyncio.run(run())
+    assert players(batches) == [f'P{i}' for i in range(7)]
+    assert [batch.num_rows for batch in batches] == [3, 3, 1]
+    assert (stats.events, stats.batches, stats.invalid) == (7, 3, 0)
+
+
+def test_feed_flushes_a_partial_batch_after_max_wait():
+    async def run():
+        queue, stats = asyncio.Queue(), IngestStats()
+        reads = asyncio.Queue()
+        await reads.put(ndjson(event('P1'), event('P2')))
+        task = asyncio.create_task(feed(reads.get, EventDecoder(), queue, stats,
+                                        batch_rows=100, max_wait=0.01))
+        batch = await asyncio.wait_for(queue.get(), 5)
+        await reads.put(b'')
+        await task
+        return batch
+
+    assert asyncio.run(run()).column('Player ID').to_pylist() == ['P1', 'P2']
+
+
+def test_file_tail_follows_appended_events(tmp_path):
+    path = tmp_path / 'events.ndjson'
+    path.write_bytes(ndjson(event('P1')))
+
+    async def run():
+        queue, stats = asyncio.Queue(), IngestStats()
+        tail = FileTail(path, follow=True, poll=0.01)
+        task = asyncio.create_task(tail.stream(EventDecoder(), queue, stats, max_wait=0.01))
+        first = await asyncio.wait_for(queue.get(), 5)
+        with open(path, 'ab') as f:
+            # Half a line first; the event is only read once it is complete
+            data = ndjson(event('P2'), event('P3'))
+            f.write(data[:20])
+            f.flush()
+            await asyncio.sleep(0.05)
+            f.write(data[20:])
+        rest = [await asyncio.wait_for(queue.get(), 5)]
+        while sum(batch.num_rows for batch in rest) < 2:
+            rest.append(await asyncio.wait_for(queue.get(), 5))
+        task.cancel()
+        return [first] + rest, stats
+
+    batches, stats = asyncio.run(run())
+    assert players(batches) == ['P1', 'P2', 'P3']
+    assert stats.invalid == 0
+
+
+def test_file_tail_without_follow_ends_at_the_end_of_the_file(tmp_path):
+    path = tmp_path / 'events.ndjson'
+    path.write_bytes(ndjson(event('P1'), event('P2')) + b'{"Player ID": "P3"')
+
+    async def run():
+        queue, stats = asyncio.Queue(), IngestStats()
+        await FileTail(path, follow=False).stream(EventDecoder(), queue, stats)
+        return drain(queue), stats
+
+    batches, stats = asyncio.run(run())
+    assert players(batches) == ['P1', 'P2']
+    assert stats.invalid == 1
+
+
+class StubModel:
+    @staticmethod
+    def predict_proba(events):
+        return events['Hours Played'].to_numpy() / 1000
+
+    @staticmethod
+    def suspicion_factors(events):
+        return [''] * len(events)
+
+
+def test_consume_stops_after_max_events():
+    async def run():
+        queue, stats, top = asyncio.Queue(), IngestStats(), TopK(3)
+        for start in range(0, 10, 2):
+            table = pa.Table.from_pylist([event(f'P{i}', hours=i)
+                                          for i in range(start, start + 2)])
+            await queue.put(table.to_batches()[0])
+        await consume(queue, StubModel(), top, stats, max_events=5)
+        return queue, stats, top
+
+    queue, stats, top = asyncio.run(run())
+    # Whole batches are scored, so the run ends on the batch that reaches 5
+    assert stats.scored == 6
+    assert queue.qsize() == 2
+    assert top.frame()['Player ID'].tolist() == ['P5', 'P4', 'P3']
+
+
+def test_consume_stops_at_none():
+    async def run():
+        queue, stats = asyncio.Queue(), IngestStats()
+        await queue.put(pa.Table.from_pylist([event('P1')]).to_batches()[0])
+        await queue.put(None)
+        await consume(queue, StubModel(), TopK(3), stats)
+        return stats
+
+    assert asyncio.run(run()).scored == 1
@@ -0,0 +1,28 @@
+"""Typed log loading keeps float32 working frames and exact exported records."""
+
+import numpy as np
+import pandas as pd
+
+from neoverse.logs import iter_logs, read_logs, read_rows
+
+CSV = """Player ID,Timestamps,Money Spent ($),Neural Link Stability (%),Dark Market Transactions
+P0001,2025-02-17 17:37:18,20053.2,86.50304369598491,GlitchChip
+P0002,2025-02-16 22:57:31,20253.6,91.1234567890123,None
+P0003,2025-02-15 08:00:00,0.1,70.00000000000001,ByteBandit
+"""
+
+
+def test_read_rows_keeps_source_precision(tmp_path):
+    path = tmp_path / 'logs.csv'
+    path.write_text(CSV)
+    source = pd.read_csv(path)
+
+    frame = read_logs(path, cache_dir=tmp_path / 'cache')
+    assert frame['Neural Link Stability (%)'].dtype == np.float32
+    assert frame['Dark Market Transactions'].tolist() == ['GlitchChip', 'None', 'ByteBandit']
+    chunk = next(iter_logs(path, cache_dir=tmp_path / 'cache'))
+    assert chunk['Money Spent ($)'].dtype == np.float32
+
+    rows = read_rows(path, [2, 0], cache_dir=tmp_path / 'cache')
+    for column in ('Money Spent ($)', 'Neural Link Stability (%)'):
+        assert rows[column].tolist() == source[column].iloc[[2, 0]].tolist()
@@ -0,0 +1,32 @@
+"""ParallelGramSweep gives the same results as the serial GramSweep."""
+
+import numpy as np
+
+from neoverse.parallel import ParallelGramSweep
+from neoverse.splits import SplitCache
+from neoverse.sweep import GramSweep, PredictionStore, feature_subsets
+
+
+def test_parallel_matches_serial():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(3000, 7)) * rng.uniform(0.1, 50.0, 7)
+    y = X @ rng.normal(size=7) + rng.normal(size=3000)
+    names = [f"f{i}" for i in range(7)]
+
+    serial = GramSweep(X, y, names, split_cache=SplitCache())
+    serial_store = PredictionStore(serial.splits)
+    expected = serial.run(4, serial_store)
+
+    with ParallelGramSweep(X, y, names, workers=2, split_cache=SplitCache()) as parallel:
+        parallel_store = PredictionStore(parallel.splits)
+        # Small chunks so every split's subsets are spread over both workers
+        results = []
+        for size in range(1, 5):
+            subsets = feature_subsets(len(names), size)
+            results.extend(parallel.results(
+                subsets, parallel.evaluate(subsets, chunk_size=8), parallel_store))
+
+    assert results == expected
+    for key in range(len(expected)):
+        for got, want in zip(parallel_store.get(key), serial_store.get(key)):
+            np.testing.assert_array_equal(got, want)
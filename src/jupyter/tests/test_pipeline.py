@@ -0,0 +1,100 @@
+"""Stage keys change with the code of the neoverse modules a stage uses, and
+every stage run leaves a trace next to its outputs."""
+
+import argparse
+import importlib
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1] / 'neoverse'
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    # A copy of the package, so its modules can be edited
+    directory = tmp_path / 'neoverse_copy'
+    shutil.copytree(PACKAGE_DIR, directory, ignore=shutil.ignore_patterns('__pycache__'))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield importlib.import_module('neoverse_copy.pipeline'), directory
+    for name in [name for name in sys.modules if name.split('.')[0] == 'neoverse_copy']:
+        del sys.modules[name]
+
+
+def codes(pipeline):
+    return {stage: pipeline.stage_code(stage) for stage in pipeline.STAGES}
+
+
+def changed(before, after):
+    return {stage for stage in before if before[stage] != after[stage]}
+
+
+def append(path, text):
+    with open(path, 'a') as f:
+        f.write(text)
+
+
+def test_module_edits_change_the_stages_that_import_it(package):
+    pipeline, directory = package
+    before = codes(pipeline)
+
+    append(directory / 'result_cache.py', "\n\ndef unused():\n    return 1\n")
+    assert changed(before, codes(pipeline)) == {'sweep'}
+
+    # Only the export stage imports neoverse.export
+    before = codes(pipeline)
+    append(directory / 'export.py', "\n\ndef unused():\n    return 1\n")
+    assert changed(before, codes(pipeline)) == {'export'}
+
+    # Every stage but evaluate reads the logs
+    before = codes(pipeline)
+    append(directory / 'logs.py', "\n\ndef unused():\n    return 1\n")
+    assert changed(before, codes(pipeline)) == set(pipeline.STAGES) - {'evaluate'}
+
+
+def test_comments_do_not_change_stage_code(package):
+    pipeline, directory = package
+    before = codes(pipeline)
+    append(directory / 'sweep.py', "\n# a comment\n")
+    assert changed(before, codes(pipeline)) == set()
+
+
+def test_keys_carry_code_changes_to_dependent_stages(package, tmp_path):
+    pipeline, directory = package
+    for name in ('hacker.csv', 'spending.csv'):
+        (tmp_path / name).write_text("Player ID\nP0001\n")
+    parser = argparse.ArgumentParser()
+    pipeline.add_hacker_arguments(parser)
+    pipeline.add_spending_arguments(parser)
+    pipeline.add_plots_argument(parser, pipeline.HACKER_FIGURES)
+    runner = pipeline.Pipeline(tmp_path / 'hacker.csv', tmp_path / 'spending.csv',
+                               tmp_path / 'out', parser.parse_args([]))
+    stages = pipeline.required_stages(['hackers', 'refit'])
+    before = runner.keys(stages)
+
+    # Only train imports suspicion; evaluate and hackers depend on train
+    append(directory / 'suspicion.py', "\n\ndef unused():\n    return 1\n")
+    after = runner.keys(stages)
+    assert changed(before, after) == {'train', 'evaluate', 'hackers'}
+
+
+def test_stage_traces_report_memory_per_row(tmp_path):
+    from neoverse.pipeline import ANALYSES, main
+    from neoverse.synthetic import write_synthetic_logs
+
+    write_synthetic_logs(tmp_path / 'hacker.csv', 2000, seed=1)
+    write_synthetic_logs(tmp_path / 'spending.csv', 2000, seed=2)
+    main(['--input-dir', str(tmp_path), '--hacker-logs', 'hacker.csv',
+          '--spending-logs', 'spending.csv', '--output-dir', str(tmp_path / 'out'),
+          '--jobs', '1', '--plots', 'none', '--max-features', '2'])
+
+    for stage, analysis in ANALYSES.items():
+        trace = json.loads((tmp_path / 'out' / analysis / f"{stage}_trace.json").read_text())
+        assert trace['rows'] > 0, stage
+        assert trace['peak_rss_mb_per_million_rows'] is not None, stage
+        # The stage span and one span per step
+        assert [span['name'] for span in trace['spans']][0] == stage
+        assert len(trace['spans']) > 1, stage
@@ -0,0 +1,80 @@
+"""Sampled and incremental projections against the exact PCA."""
+
+import numpy as np
+import pytest
+
+from neoverse import projection
+from neoverse.projection import cached_projection, fit_projection, project
+
+
+@pytest.fixture(scope='module')
+def X():
+    # Well separated variances, so the leading components are well defined
+    rng = np.random.default_rng(0)
+    rotation, _ = np.linalg.qr(rng.normal(size=(6, 6)))
+    return (rng.normal(size=(20000, 6)) * [5.0, 2.0, 0.5, 0.3, 0.2, 0.1]) @ rotation + 3.0
+
+
+def aligned(components, reference):
+    """``components`` with each row's sign flipped to match ``reference``."""
+    signs = np.sign(np.sum(components * reference, axis=1))
+    return components * signs[:, None], signs
+
+
+# The randomized fit sees a sample of a quarter of the rows; the incremental
+# one sees every row
+@pytest.mark.parametrize('method, kwargs, tolerance', [
+    ('randomized', {'sample_rows': 5000}, 0.05),
+    ('incremental', {'chunk_rows': 1000}, 1e-3)])
+def test_matches_exact_pca(X, method, kwargs, tolerance):
+    exact = fit_projection(X, method='exact')
+    approximate = fit_projection(X, method=method, **kwargs)
+    components, signs = aligned(approximate.components_, exact.components_)
+    np.testing.assert_allclose(components, exact.components_, atol=0.02)
+    np.testing.assert_allclose(approximate.explained_variance_ratio_,
+                               exact.explained_variance_ratio_, rtol=0.02)
+
+    coordinates = project(approximate, X)
+    assert coordinates.dtype == np.float32
+    coordinates = coordinates * signs
+    expected = exact.transform(X)
+    # RMS error relative to the spread of each coordinate
+    error = np.sqrt(((coordinates - expected) ** 2).mean(axis=0)) / expected.std(axis=0)
+    assert (error < tolerance).all()
+
+
+def test_auto_is_exact_for_small_inputs(X):
+    small = X[:1000]
+    np.testing.assert_allclose(project(fit_projection(small), small),
+                               fit_projection(small, method='exact').transform(small),
+                               rtol=1e-5, atol=1e-5)
+
+
+def test_cache_is_invalidated_when_the_input_changes(X, tmp_path, monkeypatch):
+    path = tmp_path / 'model.projection.npz'
+    labels = np.arange(1000) % 2
+    first = cached_projection(path, X[:1000], extras={'labels': labels})
+    with np.load(path) as stored:
+        np.testing.assert_array_equal(stored['coordinates'], first)
+        np.testing.assert_array_equal(stored['labels'], labels)
+
+    fits = []
+    fit = projection.fit_projection
+    monkeypatch.setattr(projection, 'fit_projection',
+                        lambda *args, **kwargs: fits.append(1) or fit(*args, **kwargs))
+
+    # Unchanged input: read back from the file
+    np.testing.assert_array_equal(cached_projection(path, X[:1000].copy()), first)
+    assert not fits
+
+    # One changed value, more rows or another method refit and rewrite it
+    changed = X[:1000].copy()
+    changed[10, 3] += 1.0
+    second = cached_projection(path, changed)
+    assert len(fits) == 1
+    assert not np.array_equal(second, first)
+    with np.load(path) as stored:
+        np.testing.assert_array_equal(stored['coordinates'], second)
+    cached_projection(path, changed[:999])
+    cached_projection(path, changed[:999], method='incremental')
+    assert len(fits) == 3
@@ -0,0 +1,94 @@
+"""top_k and TopK against a full sort."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neoverse.ranking import TopK, top_k
+
+
+def brute_top_k(scores, k, keys):
+    order = sorted(range(len(scores)), key=lambda i: (-scores[i], keys[i]))
+    return np.array(order[:k], dtype=np.intp)
+
+
+def brute_distinct(scores, keys, k):
+    """Best score of each key, the ``k`` best keys, ties to the smaller key."""
+    best = {}
+    for score, key in zip(scores, keys):
+        if key not in best or score > best[key]:
+            best[key] = score
+    ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:k]
+    return [key for key, _ in ranked], [score for _, score in ranked]
+
+
+def random_case(rng):
+    n = int(rng.integers(0, 400))
+    # Few distinct scores and keys, so ties and repeats are common
+    scores = rng.integers(0, 20, n) / 4
+    keys = np.array([f"P{i:04d}" for i in rng.integers(0, 60, n)], dtype=object)
+    return scores, keys, int(rng.integers(1, 30))
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_top_k_matches_sort(seed):
+    rng = np.random.default_rng(seed)
+    scores, keys, k = random_case(rng)
+    np.testing.assert_array_equal(top_k(scores, k), brute_top_k(scores, k, np.arange(len(scores))))
+    np.testing.assert_array_equal(top_k(scores, k, keys), brute_top_k(scores, k, keys))
+
+
+def test_ties_go_to_the_smaller_key():
+    scores = np.array([1.0, 2.0, 2.0, 2.0, 0.5])
+    assert list(top_k(scores, 2)) == [1, 2]
+    assert list(top_k(scores, 2, keys=np.array(['d', 'c', 'b', 'a', 'e']))) == [3, 2]
+    assert len(top_k(scores, 0)) == 0
+    assert list(top_k(scores, 10)) == [1, 2, 3, 0, 4]
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_streaming_matches_one_pass(seed):
+    rng = np.random.default_rng(seed)
+    scores, keys, k = random_case(rng)
+    expected_keys, expected_scores = brute_distinct(scores, keys, k)
+
+    top = TopK(k)
+    bounds = np.sort(rng.integers(0, len(scores) + 1, int(rng.integers(0, 6))))
+    for chunk in np.split(np.arange(len(scores)), bounds):
+        top.update(scores[chunk], keys[chunk])
+    assert list(top.keys) == expected_keys
+    assert list(top.scores) == expected_scores
+
+
+@pytest.mark.parametrize('seed', range(100))
+def test_merge_order_does_not_matter(seed):
+    rng = np.random.default_rng(seed)
+    scores, keys, k = random_case(rng)
+    expected_keys, _ = brute_distinct(scores, keys, k)
+
+    shards = []
+    for shard in np.array_split(rng.permutation(len(scores)), 4):
+        shards.append(TopK(k))
+        shards[-1].update(scores[shard], keys[shard])
+    for order in ([0, 1, 2, 3], [3, 1, 0, 2]):
+        merged = TopK(k)
+        for i in order:
+            merged.merge(shards[i])
+        assert list(merged.keys) == expected_keys
+
+
+def test_rows_follow_their_scores():
+    scores = np.array([0.2, 0.9, 0.5, 0.9, 0.7])
+    keys = np.array(['a', 'b', 'c', 'b', 'd'], dtype=object)
+    rows = pd.DataFrame({'Player ID': keys, 'Hacker_Probability': scores,
+                         'row': range(5)})
+    top = TopK(3)
+    top.update(scores[:3], keys[:3], rows.iloc[:3])
+    top.update(scores[3:], keys[3:], rows.iloc[3:])
+
+    frame = top.frame()
+    assert list(frame['Player ID']) == ['b', 'd', 'c']
+    assert list(frame['row']) == [1, 4, 2]
+    assert list(frame['Hacker_Rank']) == [1, 2, 3]
+    assert top.threshold == 0.5
+    assert TopK(3).threshold == -np.inf
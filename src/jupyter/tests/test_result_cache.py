@@ -0,0 +1,126 @@
+"""ResultCache hits against cold GramSweep runs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neoverse.result_cache import ResultCache, evaluate_cached
+from neoverse.splits import SplitCache
+from neoverse.sweep import DEFAULT_TEST_SIZES, GramSweep, feature_subsets
+
+TARGET = 'y'
+MAX_POINTS = 50
+SPLITS = len(DEFAULT_TEST_SIZES)
+
+
+@pytest.fixture
+def df():
+    rng = np.random.default_rng(0)
+    n = 1000
+    frame = pd.DataFrame(rng.normal(size=(n, 4)), columns=['a', 'b', 'c', 'd'])
+    frame[TARGET] = frame[['a', 'b', 'c', 'd']].to_numpy() @ [3.0, -1.0, 0.5, 2.0] \
+        + rng.normal(size=n)
+    return frame
+
+
+class CountingSweep(GramSweep):
+    """A GramSweep that records the subsets it solves."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.solved = []
+
+    def evaluate(self, subsets, chunk_size=4096):
+        self.solved.extend(tuple(subset) for subset in subsets)
+        return super().evaluate(subsets, chunk_size)
+
+
+def cached_run(df, features, cache_dir, max_features=2, **kwargs):
+    """Sweep ``features`` through a ResultCache in ``cache_dir``; returns the
+    results, the cache and the feature subsets solved."""
+    sweep = CountingSweep(df[features], df[TARGET], features, max_points=MAX_POINTS,
+                          split_cache=SplitCache())
+    cache = ResultCache(cache_dir, df, features, TARGET, max_points=MAX_POINTS, **kwargs)
+    results = []
+    for size in range(1, max_features + 1):
+        subsets = feature_subsets(len(features), size)
+        results.extend(sweep.results(subsets, evaluate_cached(sweep, subsets, cache)))
+    cache.save()
+    solved = {tuple(features[i] for i in subset) for subset in sweep.solved}
+    return results, cache, solved
+
+
+def models(max_features, features):
+    return sum(len(feature_subsets(len(features), size))
+               for size in range(1, max_features + 1))
+
+
+def test_second_run_is_all_hits(df, tmp_path):
+    features = ['a', 'b', 'c']
+    _, first, _ = cached_run(df, features, tmp_path)
+    assert first.hits == 0
+
+    _, second, solved = cached_run(df, features, tmp_path)
+    assert second.misses == 0
+    assert second.hits == models(2, features) * SPLITS
+    assert solved == set()
+
+
+def test_new_feature_solves_only_its_subsets(df, tmp_path):
+    cached_run(df, ['a', 'b', 'c'], tmp_path)
+    _, cache, solved = cached_run(df, ['a', 'b', 'c', 'd'], tmp_path)
+    assert solved == {('d',), ('a', 'd'), ('b', 'd'), ('c', 'd')}
+    assert cache.hits == models(2, ['a', 'b', 'c']) * SPLITS
+
+
+def test_changed_column_invalidates_only_its_models(df, tmp_path):
+    features = ['a', 'b', 'c']
+    cached_run(df, features, tmp_path)
+    changed = df.copy()
+    changed['b'] = changed['b'] * 2.0 + 1.0
+    _, _, solved = cached_run(changed, features, tmp_path)
+    assert solved == {('b',), ('a', 'b'), ('b', 'c')}
+
+
+def test_save_keeps_models_this_run_did_not_use(df, tmp_path):
+    cached_run(df, ['a', 'b', 'c', 'd'], tmp_path)
+    cached_run(df, ['a', 'b'], tmp_path)
+    _, cache, solved = cached_run(df, ['a', 'b', 'c', 'd'], tmp_path)
+    assert solved == set()
+    assert cache.misses == 0
+
+
+def test_max_entries_keeps_this_runs_models(df, tmp_path):
+    cached_run(df, ['c', 'd'], tmp_path, max_features=1)
+    limit = models(2, ['a', 'b']) * SPLITS
+    cached_run(df, ['a', 'b'], tmp_path, max_entries=limit)
+    _, cache, _ = cached_run(df, ['a', 'b'], tmp_path)
+    assert cache.misses == 0
+    _, cache, _ = cached_run(df, ['c', 'd'], tmp_path, max_features=1)
+    assert cache.hits == 0
+
+
+def test_hits_equal_a_cold_run(df, tmp_path):
+    features = ['a', 'b', 'c', 'd']
+    cold_sweep = GramSweep(df[features], df[TARGET], features, max_points=MAX_POINTS,
+                           split_cache=SplitCache())
+    cold = cold_sweep.run(3)
+    cached_run(df, features, tmp_path, max_features=3)
+    warm, cache, _ = cached_run(df, features, tmp_path, max_features=3)
+    assert cache.misses == 0
+
+    assert len(warm) == len(cold)
+    for hit, result in zip(warm, cold):
+        assert hit['features'] == result['features']
+        assert hit['train_size'] == result['train_size']
+        assert hit['r2'] == result['r2']
+        assert hit['rmse'] == result['rmse']
+        assert hit['intercept'] == result['intercept']
+        assert hit['coefficients'] == result['coefficients']
+
+    # The sampled predictions, as the export stage reads them
+    subsets = feature_subsets(len(features), 2)
+    per_split = evaluate_cached(cold_sweep, subsets, ResultCache(
+        tmp_path, df, features, TARGET, max_points=MAX_POINTS))
+    for hit, solved in zip(per_split, cold_sweep.evaluate(subsets)):
+        np.testing.assert_array_equal(hit['predicted'], solved['predicted'])
@@ -0,0 +1,62 @@
+"""A bad request fails alone, not with the batch it was coalesced into."""
+
+import pandas as pd
+import pytest
+
+from neoverse.hacker_model import EVENT_FIELDS, check_events
+from neoverse.scoring_service import HackerScoringService, MicroBatcher
+
+
+def event(player, **fields):
+    return {'Player ID': player, **{field: 1.0 for field in EVENT_FIELDS[1:]}, **fields}
+
+
+def score_batch(events):
+    # Like the model: missing fields and any NaN input fail the whole call
+    check_events(events)
+    if events.isna().any().any():
+        raise ValueError("Input X contains NaN")
+    return pd.DataFrame({'Player ID': events['Player ID'],
+                         'Hacker_Probability': events['Hours Played'] / 10})
+
+
+class StubModel:
+    score = staticmethod(score_batch)
+
+
+def test_failed_batch_is_rescored_per_request():
+    calls = []
+
+    def recording(events):
+        calls.append(len(events))
+        return score_batch(events)
+
+    # A long wait so the three requests are coalesced into one batch
+    batcher = MicroBatcher(recording, max_wait=0.5)
+    try:
+        good = batcher.submit([event('P1'), event('P2', **{'Hours Played': 5.0})])
+        bad = batcher.submit([{'Player ID': 'P3'}])
+        other = batcher.submit([event('P4')])
+        assert good.result(5)['Hacker_Probability'].tolist() == [0.1, 0.5]
+        assert other.result(5)['Player ID'].tolist() == ['P4']
+        with pytest.raises(ValueError, match="missing required fields"):
+            bad.result(5)
+    finally:
+        batcher.close()
+    assert calls == [4, 2, 1, 1]
+    assert batcher.latency.count == 2
+
+
+def test_service_rejects_incomplete_events_before_queueing():
+    service = HackerScoringService(StubModel(), max_wait=0.001)
+    try:
+        with pytest.raises(ValueError, match="event 1 is missing required fields"):
+            service.score([event('P1'), event('P2', **{'Criminal Score': None})])
+        with pytest.raises(ValueError, match="'Hours Played'"):
+            service.score([{k: v for k, v in event('P3').items() if k != 'Hours Played'}])
+        with pytest.raises(ValueError, match="not an object"):
+            service.score(['P4'])
+        assert service.score([event('P5')])['Player ID'].tolist() == ['P5']
+    finally:
+        service.close()
+    assert service.stats()['requests'] == 1
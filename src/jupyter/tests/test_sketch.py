@@ -0,0 +1,76 @@
+"""QuantileSketch estimates stay within their reported rank error."""
+
+import numpy as np
+import pytest
+
+from neoverse.sketch import QuantileSketch
+
+QUANTILES = [0.001, 0.01, 0.25, 0.5, 0.75, 0.99, 0.998, 0.999]
+
+
+def distributions():
+    rng = np.random.default_rng(2)
+    return {
+        'normal': rng.normal(size=200_000),
+        'exponential': rng.exponential(size=200_000),
+        'ties': rng.integers(0, 50, 200_000).astype(float),
+        'sorted': np.sort(rng.uniform(size=200_000)),
+    }
+
+
+def true_rank(values, estimate):
+    """Range of fractional ranks ``estimate`` can stand for in ``values``."""
+    values = np.sort(values)
+    low = np.searchsorted(values, estimate, side='left')
+    high = np.searchsorted(values, estimate, side='right')
+    return low / len(values), high / len(values)
+
+
+def sketch_of(values, chunks):
+    sketch = QuantileSketch()
+    for chunk in np.array_split(values, chunks):
+        sketch.update(chunk)
+    return sketch
+
+
+@pytest.mark.parametrize('name, values', distributions().items())
+def test_rank_error_bounds_streamed_estimates(name, values):
+    sketch = sketch_of(values, 40)
+    assert sketch.count == len(values)
+    assert (sketch.min, sketch.max) == (values.min(), values.max())
+    for q in QUANTILES:
+        low, high = true_rank(values, sketch.quantile(q))
+        error = sketch.rank_error(q) + 1 / len(values)
+        assert low - error <= q <= high + error, (name, q)
+    # The arcsine scale keeps the tails tighter than the median
+    for q in (0.001, 0.999):
+        assert sketch.rank_error(q) < sketch.rank_error(0.5) / 4, (name, q)
+
+
+def test_merged_sketches_bound_estimates():
+    values = distributions()['normal']
+    merged = QuantileSketch()
+    for shard in np.array_split(values, 8):
+        merged.merge(sketch_of(shard, 5))
+    assert merged.count == len(values)
+    for q in QUANTILES:
+        low, high = true_rank(values, merged.quantile(q))
+        # An estimate after merging, so allow twice the reported bound
+        error = 2 * merged.rank_error(q) + 1 / len(values)
+        assert low - error <= q <= high + error, q
+
+
+def test_small_streams_are_exact():
+    # Few enough values that every centroid holds a single one
+    values = np.random.default_rng(3).normal(size=50)
+    sketch = QuantileSketch().update(values)
+    for q in QUANTILES:
+        assert sketch.quantile(q) == pytest.approx(np.quantile(values, q))
+
+
+def test_nans_are_skipped_and_empty_sketches_are_nan():
+    assert np.isnan(QuantileSketch().quantile(0.5))
+    assert np.isnan(QuantileSketch().rank_error(0.5))
+    sketch = QuantileSketch().update([1.0, np.nan, 3.0])
+    assert sketch.count == 2
+    assert sketch.quantile(0.5) == pytest.approx(2.0)
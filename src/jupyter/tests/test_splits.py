@@ -0,0 +1,52 @@
+"""SplitCache indices against train_test_split and its on-disk keys."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.model_selection import train_test_split
+
+from neoverse.splits import SplitCache, dataset_fingerprint
+
+
+@pytest.mark.parametrize('n_rows, test_size, seed', [
+    (1000, 0.2, 42), (1001, 0.3, 42), (57, 0.1, 7), (25000, 0.4, 0)])
+def test_indices_equal_train_test_split(tmp_path, n_rows, test_size, seed):
+    expected = train_test_split(np.arange(n_rows), test_size=test_size, random_state=seed)
+    for cache in (SplitCache(), SplitCache(tmp_path)):
+        for _ in range(2):
+            train_idx, test_idx = cache.get(n_rows, test_size, seed)
+            np.testing.assert_array_equal(train_idx, expected[0])
+            np.testing.assert_array_equal(test_idx, expected[1])
+
+    # Read back from the .npz by a fresh cache
+    train_idx, test_idx = SplitCache(tmp_path).get(n_rows, test_size, seed)
+    np.testing.assert_array_equal(train_idx, expected[0])
+    np.testing.assert_array_equal(test_idx, expected[1])
+
+
+def test_cached_indices_are_read_only():
+    train_idx, _ = SplitCache().get(100, 0.2)
+    with pytest.raises(ValueError):
+        train_idx[0] = 1
+
+
+def test_npz_is_reused_only_for_its_key(tmp_path):
+    df = pd.DataFrame({'a': np.arange(100.0)})
+    fingerprint = dataset_fingerprint(df)
+    SplitCache(tmp_path, fingerprint).get(100, 0.2)
+    [path] = tmp_path.glob('*.npz')
+
+    # A stored split is what a fresh cache with the same key returns
+    np.savez(path, train=np.arange(80)[::-1], test=np.arange(80, 100))
+    train_idx, _ = SplitCache(tmp_path, fingerprint).get(100, 0.2)
+    np.testing.assert_array_equal(train_idx, np.arange(80)[::-1])
+
+    # Any change to the key (rows, test size, seed or data) builds a new file
+    expected = train_test_split(np.arange(100), test_size=0.2, random_state=42)
+    changed = df.assign(a=df['a'] + 1)
+    train_idx, _ = SplitCache(tmp_path, dataset_fingerprint(changed)).get(100, 0.2)
+    np.testing.assert_array_equal(train_idx, expected[0])
+    SplitCache(tmp_path, fingerprint).get(101, 0.2)
+    SplitCache(tmp_path, fingerprint).get(100, 0.3)
+    SplitCache(tmp_path, fingerprint).get(100, 0.2, random_state=0)
+    assert len(list(tmp_path.glob('*.npz'))) == 5
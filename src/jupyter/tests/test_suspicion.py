@@ -0,0 +1,90 @@
+"""FactorEngine against the row-by-row Suspicion_Factors loop it replaced."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neoverse.logs import read_logs
+from neoverse.suspicion import DEFAULT_RULES, FactorEngine, QuantileRule
+
+
+def row_factors(data, players):
+    """The original loop: one row at a time, quantiles of ``data``."""
+    factors = []
+    for _, row in players.iterrows():
+        row_factors = []
+        if row['Criminal Score'] > data['Criminal Score'].quantile(0.9):
+            row_factors.append("High criminal score")
+        if row['Quest Exploit Score'] > data['Quest Exploit Score'].quantile(0.9):
+            row_factors.append("Unusual quest patterns")
+        if row['Dark Market Transactions'] != 'None':
+            row_factors.append("Dark market activity")
+        if row['Money Spent ($)'] > data['Money Spent ($)'].quantile(0.95):
+            row_factors.append("Excessive spending")
+        if row['Hours Played'] > data['Hours Played'].quantile(0.95):
+            row_factors.append("Excessive playtime")
+        factors.append(", ".join(row_factors))
+    return factors
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    n = 1000
+    return pd.DataFrame({
+        # Integer scores put many players exactly on their quantile
+        'Criminal Score': rng.integers(0, 10, n),
+        'Quest Exploit Score': np.round(rng.uniform(80.0, 800.0, n), 1),
+        'Dark Market Transactions': rng.choice(['None', 'GlitchChip', 'ByteBandit'], n),
+        'Money Spent ($)': np.round(rng.gamma(2.0, 5000.0, n), 2),
+        'Hours Played': rng.integers(50, 301, n),
+    })
+
+
+def test_matches_row_by_row_loop(data):
+    engine = FactorEngine().fit(data)
+    assert (data['Criminal Score'] == engine.thresholds["High criminal score"]).any()
+    np.testing.assert_array_equal(engine.factors(data), row_factors(data, data))
+
+
+def test_quantile_edges(data):
+    engine = FactorEngine().fit(data)
+    thresholds = engine.thresholds
+    # Players exactly on and just above every threshold
+    edges = pd.DataFrame({
+        'Criminal Score': [thresholds["High criminal score"]] * 2,
+        'Quest Exploit Score': [thresholds["Unusual quest patterns"]] * 2,
+        'Dark Market Transactions': ['None', 'NeonShifter'],
+        'Money Spent ($)': [thresholds["Excessive spending"]] * 2,
+        'Hours Played': [thresholds["Excessive playtime"]] * 2,
+    })
+    edges.iloc[1, [0, 1, 3, 4]] = np.nextafter(edges.iloc[1, [0, 1, 3, 4]].to_numpy(float),
+                                               np.inf)
+    factors = engine.factors(edges)
+    assert factors.tolist() == row_factors(data, edges)
+    assert factors[0] == ''
+    assert factors[1] == ", ".join(rule.label for rule in DEFAULT_RULES)
+
+
+def test_literal_none_from_the_logs(tmp_path):
+    path = tmp_path / 'logs.csv'
+    path.write_text(
+        "Player ID,Criminal Score,Quest Exploit Score,Dark Market Transactions,"
+        "Money Spent ($),Hours Played\n"
+        "P0001,1,100.0,None,10.0,50\n"
+        "P0002,9,700.5,GlitchChip,9000.0,300\n"
+        "P0003,5,400.0,None,500.0,120\n")
+    logs = read_logs(path, cache_dir=tmp_path / 'cache')
+    engine = FactorEngine()
+    engine.fit(logs[engine.columns])
+    assert engine.factors(logs).tolist() == row_factors(logs, logs)
+    assert engine.factors(logs)[0] == ''
+
+
+def test_extra_rules_extend_the_factors(data):
+    rules = DEFAULT_RULES + [QuantileRule("Long sessions", 'Hours Played', 0.5)]
+    engine = FactorEngine(rules).fit(data)
+    median = data['Hours Played'].quantile(0.5)
+    expected = [", ".join(filter(None, [factors, "Long sessions" if hours > median else '']))
+                for factors, hours in zip(row_factors(data, data), data['Hours Played'])]
+    assert engine.factors(data).tolist() == expected
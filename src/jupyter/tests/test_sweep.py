@@ -0,0 +1,80 @@
+"""GramSweep against one scikit-learn fit per feature combination."""
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+from neoverse.splits import SplitCache
+from neoverse.sweep import GramSweep, PredictionStore, feature_subsets
+
+FEATURES = ['a', 'b', 'c', 'd', 'constant', 'copy_of_a']
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    n = 2000
+    X = rng.normal(size=(n, 4)) * [1.0, 10.0, 0.1, 3.0] + [0.0, 5.0, -2.0, 100.0]
+    # A constant column and an exact copy exercise the singular solves
+    X = np.column_stack([X, np.full(n, 7.0), X[:, 0]])
+    y = X[:, :4] @ [3.0, -0.5, 20.0, 0.1] + rng.normal(scale=2.0, size=n)
+    return X, y
+
+
+def sklearn_fit(X, y, features, test_size):
+    X_train, X_test, y_train, y_test = train_test_split(
+        X[:, features], y, test_size=test_size, random_state=42)
+    scaler = StandardScaler()
+    model = LinearRegression().fit(scaler.fit_transform(X_train), y_train)
+    predicted = model.predict(scaler.transform(X_test))
+    return model, scaler, {
+        'mse': mean_squared_error(y_test, predicted),
+        'r2': r2_score(y_test, predicted),
+    }
+
+
+@pytest.mark.parametrize('size', [1, 2, 3])
+def test_matches_sklearn(data, size):
+    X, y = data
+    sweep = GramSweep(X, y, FEATURES, max_points=50, split_cache=SplitCache())
+    store = PredictionStore(sweep.splits)
+    subsets = feature_subsets(len(FEATURES), size)
+    results = sweep.results(subsets, sweep.evaluate(subsets), store)
+    assert len(results) == len(subsets) * len(sweep.splits)
+
+    for key, result in enumerate(results):
+        subset = subsets[key // len(sweep.splits)]
+        split = sweep.splits[key % len(sweep.splits)]
+        assert result['features'] == [FEATURES[i] for i in subset]
+        assert result['train_size'] == split.label
+
+        model, scaler, metrics = sklearn_fit(X, y, subset, split.test_size)
+        assert result['mse'] == pytest.approx(metrics['mse'], rel=1e-9)
+        assert result['rmse'] == pytest.approx(np.sqrt(metrics['mse']), rel=1e-9)
+        assert result['r2'] == pytest.approx(metrics['r2'], rel=1e-9, abs=1e-9)
+        assert result['intercept'] == pytest.approx(model.intercept_, rel=1e-9)
+        np.testing.assert_allclose(list(result['coefficients'].values()), model.coef_,
+                                   rtol=1e-7, atol=1e-7)
+
+        rows, actual, predicted = store.get(key)
+        assert len(rows) == 50
+        np.testing.assert_array_equal(actual, y[rows])
+        np.testing.assert_allclose(
+            predicted, model.predict(scaler.transform(X[rows][:, subset])), rtol=1e-5)
+
+
+def test_run_covers_every_combination(data):
+    X, y = data
+    sweep = GramSweep(X, y, FEATURES, split_cache=SplitCache())
+    results = sweep.run(2)
+    combinations = len(FEATURES) + len(FEATURES) * (len(FEATURES) - 1) // 2
+    assert len(results) == combinations * len(sweep.splits)
+
+
+def test_split_labels():
+    sweep = GramSweep(np.arange(20.0)[:, None], np.arange(20.0), ['x'],
+                      split_cache=SplitCache())
+    assert [split.label for split in sweep.splits] == ['60-40', '70-30', '80-20', '90-10']
@@ -0,0 +1,115 @@
+"""PlayerWindows updated in batches against a per-event recompute."""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from neoverse.windows import FEATURES, PlayerWindows
+
+WINDOW = pd.Timedelta('6h')
+
+
+def events(seed, n=600, players=25):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Player ID': [f"P{i}" for i in rng.integers(0, players, n)],
+        'Timestamps': (pd.Timestamp('2025-02-15')
+                       + pd.to_timedelta(rng.integers(0, 3 * 24 * 3600, n), unit='s')),
+        'Hours Played': rng.integers(0, 300, n),
+        'Money Spent ($)': rng.uniform(0, 30_000, n).round(2),
+        'Criminal Score': rng.integers(0, 10, n),
+        'Quest Exploit Score': rng.uniform(0, 800, n).round(1),
+        'Dark Market Transactions': np.where(rng.random(n) < 0.3, 'GlitchChip', 'None'),
+    })
+
+
+def split(frame, n):
+    return [frame.iloc[rows] for rows in np.array_split(np.arange(len(frame)), n)]
+
+
+def recompute(batches, window=WINDOW):
+    """Features of every event, one event at a time, from the definitions."""
+    window_s = window.total_seconds()
+    state = {}
+    features = []
+    for batch in batches:
+        out = pd.DataFrame(0.0, index=batch.index, columns=FEATURES)
+        # Each player's snapshots in a batch are applied in time order
+        for index in batch.sort_values('Timestamps', kind='stable').index:
+            row = batch.loc[index]
+            ts = int(row['Timestamps'].timestamp())
+            values = {'hours': np.float32(row['Hours Played']),
+                      'money': np.float32(row['Money Spent ($)']),
+                      'criminal': np.float32(row['Criminal Score']),
+                      'quest': np.float32(row['Quest Exploit Score'])}
+            dark = float(row['Dark Market Transactions'] != 'None')
+            player = state.get(row['Player ID'])
+            if player is None:
+                player = state[row['Player ID']] = {
+                    'ts': ts, **values, 'money_sum': float(values['money']),
+                    'hours_sum': float(values['hours']), 'dark_sum': dark, 'events': 1.0}
+                deltas = (0.0, 0.0)
+            else:
+                decay = math.exp(-max(ts - player['ts'], 0) / window_s)
+                for name, total in (('money', 'money_sum'), ('hours', 'hours_sum')):
+                    growth = max(values[name] - player[name], np.float32(0))
+                    player[total] = player[total] * decay + float(growth)
+                player['dark_sum'] = player['dark_sum'] * decay + dark
+                player['events'] = player['events'] * decay + 1
+                deltas = (float(values['criminal'] - player['criminal']),
+                          float(values['quest'] - player['quest']))
+                if ts >= player['ts']:
+                    player.update(ts=ts, **values)
+            out.loc[index] = [player['money_sum'] / (player['hours_sum'] + 1), *deltas,
+                              player['dark_sum'] / (window_s / 3600), player['events']]
+        features.append(out)
+    return pd.concat(features), state
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('n_batches', [1, 4, 30])
+def test_batches_match_recompute(seed, n_batches):
+    # Batches in arrival order, so later batches also hold older snapshots
+    batches = split(events(seed), n_batches)
+    windows = PlayerWindows(WINDOW)
+    got = pd.concat([windows.update(batch) for batch in batches])
+    expected, state = recompute(batches)
+    pd.testing.assert_frame_equal(got, expected, rtol=1e-9)
+
+    frame = windows.frame().set_index('Player ID')
+    for player, values in state.items():
+        assert frame.loc[player, 'last_seen'] == pd.Timestamp(values['ts'], unit='s')
+
+
+def test_time_ordered_batches_match_one_update():
+    stream = events(7).sort_values('Timestamps', kind='stable')
+    one = PlayerWindows(WINDOW)
+    one.update(stream)
+    batched = PlayerWindows(WINDOW)
+    for batch in split(stream, 12):
+        batched.update(batch)
+    pd.testing.assert_frame_equal(batched.frame(), one.frame(), rtol=1e-12)
+
+
+def test_frame_decays_to_now():
+    stream = events(8)
+    windows = PlayerWindows(WINDOW)
+    windows.update(stream)
+    # frame() is as of the latest snapshot; one window later, sums fall by e
+    latest = windows.frame()
+    later = windows.frame(stream['Timestamps'].max() + WINDOW)
+    for column in ('window_events', 'dark_market_rate'):
+        np.testing.assert_allclose(later[column], latest[column] * np.exp(-1), rtol=1e-12)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    first, second = split(events(9), 2)
+    windows = PlayerWindows(WINDOW)
+    windows.update(first)
+    windows.save(tmp_path / 'windows.npz')
+    loaded = PlayerWindows.load(tmp_path / 'windows.npz')
+    assert loaded.window == WINDOW and len(loaded) == len(windows)
+    pd.testing.assert_frame_equal(loaded.update(second), windows.update(second))
+    pd.testing.assert_frame_equal(loaded.frame(), windows.frame())